@@ -1,7 +1,32 @@
-from csp.games import Sudoku
-from csp.processing import SearchStrategy
-from csp.processing.strategies import DepthFirstSearch
-from csp.processing.propagators import NullPropagator, SimplePropagator, AC3
+from csp.delta import DeltaRecord, CompactDeltaRecord
+from csp.games import Sudoku, SudokuPropagator
+from csp.state import State, Variable, Domain
+from csp.model import CSP, Constraint
+from csp.processing import CancellationToken, Propagator, SearchStrategy
+from csp.processing.strategies import (
+    DepthFirstSearch,
+    Restarts,
+    ConflictDirectedBackjumping,
+    NogoodLearning,
+    ParallelSearch,
+    Portfolio,
+    DancingLinks,
+    SatSearch,
+)
+from csp.processing.propagators import (
+    NullPropagator,
+    SimplePropagator,
+    AC3,
+    AC3RM,
+    AllDifferentGAC,
+    ForwardChecking,
+    PropagationEngine,
+)
+from typing import Awaitable, Callable, Optional
+import argparse
+import asyncio
+import math
+import time
 
 # === Define Benchmark Puzzles ===
 puzzles = [
@@ -67,6 +92,135 @@ puzzles = [
     ),
 ]
 
+# === Define Hard 9x9 Puzzles ===
+hard_puzzles = [
+    (
+        "9x9-ai-escargot",
+        Sudoku.from_str(
+            """
+            1 . . . . 7 . 9 .
+            . 3 . . 2 . . . 8
+            . . 9 6 . . 5 . .
+            . . 5 3 . . 9 . .
+            . 1 . . 8 . . . 2
+            6 . . . . 4 . . .
+            3 . . . . . . 1 .
+            . 4 . . . . . . 7
+            . . 7 . . . 3 . .
+            """
+        ),
+    ),
+    (
+        "9x9-inkala-2012",
+        Sudoku.from_str(
+            """
+            8 . . . . . . . .
+            . . 3 6 . . . . .
+            . 7 . . 9 . 2 . .
+            . 5 . . . 7 . . .
+            . . . . 4 5 7 . .
+            . . . 1 . . . 3 .
+            . . 1 . . . . 6 8
+            . . 8 5 . . . 1 .
+            . 9 . . . . 4 . .
+            """
+        ),
+    ),
+    (
+        "9x9-golden-nugget",
+        Sudoku.from_str(
+            """
+            . . . . . . . 3 9
+            . . . . . 1 . . 5
+            . . 3 . 5 . 8 . .
+            . . 8 . 9 . . . 6
+            . 7 . . . 2 . . .
+            1 . . 4 . . . . .
+            . . 9 . 8 . . 5 .
+            . 2 . . . . 6 . .
+            4 . . 7 . . . . .
+            """
+        ),
+    ),
+    (
+        "9x9-easter-monster",
+        Sudoku.from_str(
+            """
+            1 . . . . . . . 2
+            . 9 . 4 . . . 5 .
+            . . 6 . . . 7 . .
+            . 5 . 9 . 3 . . .
+            . . . . 7 . . . .
+            . . . 8 5 . . 4 .
+            7 . . . . . 6 . .
+            . 3 . . . 9 . 8 .
+            . . 2 . . . . . 1
+            """
+        ),
+    ),
+]
+
+
+def pattern_sudoku(size: int, holes: int) -> Sudoku:
+    """A solved size x size board with roughly one in holes cells cleared."""
+    square_size = math.isqrt(size)
+    return Sudoku(
+        size,
+        {
+            (row, col): (square_size * (row % square_size) + row // square_size + col)
+            % size
+            + 1
+            for row in range(size)
+            for col in range(size)
+            if (row * 7 + col * 3) % holes
+        },
+    )
+
+
+class Precedes(Constraint[int]):
+    """before + gap <= after."""
+
+    def __init__(self, before: str, after: str, gap: int) -> None:
+        super().__init__({before, after})
+        self._before = before
+        self._after = after
+        self._gap = gap
+
+    def is_satisfied(self, state: State[int]) -> bool:
+        before, after = state[self._before].value(), state[self._after].value()
+        return before is None or after is None or before + self._gap <= after
+
+    def is_compatible(
+        self, state: State[int], var1: int, value1: int, var2: int, value2: int
+    ) -> bool:
+        if state.variable(var1).name == self._before:
+            return value1 + self._gap <= value2
+        return value2 + self._gap <= value1
+
+
+def precedence_chain(length: int, size: int, gap: int) -> tuple[CSP[int], State[int]]:
+    """length variables over 0..size-1, each at least gap below the next. The
+    support of a value is far into the neighbor's domain, which AC3 scans from
+    the start on every revision."""
+    delta_record = DeltaRecord()
+    names = [f"x{i}" for i in range(length)]
+    state = State[int](
+        delta_record,
+        [
+            Variable[int](
+                delta_record, name, Domain[int](delta_record, set(range(size)))
+            )
+            for name in names
+        ],
+    )
+    return (
+        CSP[int](
+            [Precedes(before, after, gap) for before, after in zip(names, names[1:])]
+        ),
+        state,
+    )
+
+
 # === Define Search Strategies ===
 strategies: list[tuple[str, SearchStrategy[int]]] = [
     (
@@ -81,12 +235,53 @@ strategies: list[tuple[str, SearchStrategy[int]]] = [
             SimplePropagator(),
         ),
     ),
-(
-    "DFS + AC3",
-    DepthFirstSearch(
-        AC3(),
+    (
+        "DFS + ForwardChecking",
+        DepthFirstSearch(
+            ForwardChecking(),
+        ),
+    ),
+    (
+        "DFS + AC3",
+        DepthFirstSearch(
+            AC3(),
+        ),
+    ),
+    (
+        "DFS + AC3RM",
+        DepthFirstSearch(
+            AC3RM(),
+        ),
+    ),
+    (
+        "DFS + AllDifferentGAC",
+        DepthFirstSearch(
+            AllDifferentGAC(),
+        ),
+    ),
+    (
+        "DFS + SudokuPropagator",
+        DepthFirstSearch(
+            SudokuPropagator(),
+        ),
+    ),
+    (
+        "DFS + FC/GAC engine",
+        DepthFirstSearch(
+            PropagationEngine(
+                [
+                    (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+                    (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+                ]
+            ),
+        ),
     ),
-),
+]
+
+# === Define Trails ===
+trails: list[tuple[str, Callable[[], DeltaRecord]]] = [
+    ("DeltaRecord", DeltaRecord),
+    ("CompactDeltaRecord", CompactDeltaRecord),
 ]
 
 
@@ -110,5 +305,460 @@ def run_benchmark():
         print(f"\n>>> TOTAL for strategy '{strategy_name}':\n{total_stats}")
 
 
+def run_trail_benchmark():
+    print("\n=== Trail: prune and revert 9x9 domains ===")
+    for trail_name, trail in trails:
+        delta_record = trail()
+        state = State[int](
+            delta_record,
+            [
+                Variable[int](
+                    delta_record, str(i), Domain[int](delta_record, set(range(1, 10)))
+                )
+                for i in range(81)
+            ],
+        )
+        start = time.perf_counter()
+        for _ in range(200):
+            checkpoint = state.checkpoint()
+            for variable in state.variables():
+                for value in range(2, 10):
+                    variable.remove_value_from_domain(value)
+                variable.assign(1)
+            state.revert_to(checkpoint)
+        print(f"{trail_name}: {time.perf_counter() - start:.3f}s")
+
+    print("\n=== Trail: DFS + SimplePropagator on all puzzles ===")
+    for trail_name, trail in trails:
+        total_stats = SearchStrategy.Stats()
+        for _, puzzle in puzzles:
+            csp, state = puzzle.to_state(trail())
+            total_stats += (
+                DepthFirstSearch(SimplePropagator[int]()).solve(csp, state).stats
+            )
+        print(f"{trail_name}: {total_stats.elapsed_time:.3f}s")
+
+
+def run_bookkeeping_benchmark():
+    print("\n=== Bookkeeping: per-node checks, full scan vs incremental ===")
+    for size in (9, 16, 25):
+        _, state = pattern_sudoku(size, 3).to_state()
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            all(v.domain_size() > 0 for v in state.variables())
+            all(v.is_assigned() for v in state.variables())
+            min(state.unassigned_variables(), key=lambda v: v.domain_size())
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            state.is_valid()
+            state.is_complete()
+            state.smallest_unassigned_variable()
+        incremental = time.perf_counter() - start
+
+        print(f"{size}x{size}: scan {scan:.3f}s incremental {incremental:.3f}s")
+
+
+def run_gac_benchmark():
+    print("\n=== GAC: AC3 vs AllDifferentGAC node counts ===")
+    gac_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("DFS + AC3", DepthFirstSearch(AC3())),
+        ("DFS + AllDifferentGAC", DepthFirstSearch(AllDifferentGAC())),
+        (
+            "DFS + FC/GAC engine",
+            DepthFirstSearch(
+                PropagationEngine(
+                    [
+                        (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+                        (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+                    ]
+                )
+            ),
+        ),
+        ("DFS + SudokuPropagator", DepthFirstSearch(SudokuPropagator())),
+    ]
+    for puzzle_name, puzzle in puzzles + hard_puzzles:
+        for strategy_name, strategy in gac_strategies:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.propagator_stats.domain_prunes} prunes, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+            for name, propagator_stats in stats.propagator_stats.by_propagator.items():
+                print(
+                    f"    {name}: {propagator_stats.domain_prunes} prunes, "
+                    f"{propagator_stats.elapsed_time:.3f}s"
+                )
+            for rule, prunes in stats.propagator_stats.by_rule.items():
+                print(f"    {rule}: {prunes} prunes")
+
+
+def run_residues_benchmark():
+    print("\n=== Residues: AC3 vs AC3RM on a precedence chain, first 200 solutions ===")
+    for propagator_name, propagator in [("AC3", AC3[int]()), ("AC3RM", AC3RM[int]())]:
+        csp, state = precedence_chain(12, 120, 5)
+        stats = SearchStrategy.Stats()
+        DepthFirstSearch(propagator, least_constraining_values=False).count(
+            csp, state, 200, stats
+        )
+        print(
+            f"{propagator_name}: {stats.state_visits} nodes, "
+            f"{stats.propagator_stats.constraint_checks} checks, "
+            f"{stats.elapsed_time:.3f}s"
+        )
+
+
+def run_large_benchmark():
+    print("\n=== Large boards: ForwardChecking vs AC3 vs AllDifferentGAC ===")
+    large_puzzles = [
+        ("16x16-pattern", pattern_sudoku(16, 3)),
+        ("16x16-empty", Sudoku(16, {})),
+        ("25x25-pattern", pattern_sudoku(25, 3)),
+    ]
+    large_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("DFS + ForwardChecking", DepthFirstSearch(ForwardChecking())),
+        ("DFS + AC3", DepthFirstSearch(AC3())),
+        ("DFS + AllDifferentGAC", DepthFirstSearch(AllDifferentGAC())),
+    ]
+    for puzzle_name, puzzle in large_puzzles:
+        for strategy_name, strategy in large_strategies:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+
+
+def run_dfs_benchmark():
+    print("\n=== DFS: per-node overhead and depth ===")
+    dfs_runs: list[tuple[str, list[tuple[str, Sudoku]], Propagator[int]]] = [
+        ("puzzles / NullPropagator", puzzles, NullPropagator()),
+        (
+            "49x49-pattern / ForwardChecking",
+            [("49x49-pattern", pattern_sudoku(49, 2))],
+            ForwardChecking(),
+        ),
+    ]
+    for run_name, run_puzzles, propagator in dfs_runs:
+        nodes = 0
+        elapsed = 0.0
+        depth = 0
+        for _, puzzle in run_puzzles:
+            _, stats = puzzle.solve(
+                DepthFirstSearch(propagator, least_constraining_values=False)
+            )
+            nodes += stats.state_visits
+            elapsed += stats.elapsed_time
+            depth = max(depth, stats.max_depth)
+        print(
+            f"{run_name}: {nodes} nodes, max depth {depth}, "
+            f"{elapsed / nodes * 1e6:.1f}us per node"
+        )
+
+
+def run_lcv_benchmark():
+    print("\n=== LCV: off vs on vs fast ===")
+    lcv_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("lcv off", DepthFirstSearch(least_constraining_values=False)),
+        ("lcv on", DepthFirstSearch()),
+        ("lcv fast", DepthFirstSearch(fast_least_constraining_values=True)),
+    ]
+    for puzzle_name, puzzle in puzzles + hard_puzzles:
+        for strategy_name, strategy in lcv_strategies:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+
+
+def run_wdeg_benchmark():
+    print("\n=== Variable ordering: MRV vs dom/wdeg ===")
+    wdeg_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("FC + MRV", DepthFirstSearch()),
+        ("FC + dom/wdeg", DepthFirstSearch(weighted_degree=True)),
+        ("GAC + MRV", DepthFirstSearch(AllDifferentGAC())),
+        ("GAC + dom/wdeg", DepthFirstSearch(AllDifferentGAC(), weighted_degree=True)),
+    ]
+    for puzzle_name, puzzle in hard_puzzles:
+        for strategy_name, strategy in wdeg_strategies:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.conflicts} conflicts, "
+                f"max weight {max(stats.constraint_weights.values(), default=1)}, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+
+
+def run_restarts_benchmark():
+    print("\n=== Restarts: single run vs Luby restarts over seeds ===")
+    restart_puzzles = hard_puzzles + [("16x16-pattern", pattern_sudoku(16, 2))]
+    for puzzle_name, puzzle in restart_puzzles:
+        _, stats = puzzle.solve(
+            DepthFirstSearch(AllDifferentGAC(), weighted_degree=True)
+        )
+        print(
+            f"{puzzle_name} / GAC + dom/wdeg: {stats.state_visits} nodes, "
+            f"{stats.elapsed_time:.3f}s"
+        )
+        for seed in range(3):
+            _, stats = puzzle.solve(
+                Restarts(
+                    DepthFirstSearch(AllDifferentGAC(), weighted_degree=True),
+                    scale=4,
+                    seed=seed,
+                )
+            )
+            print(
+                f"{puzzle_name} / GAC + dom/wdeg + restarts seed {seed}: "
+                f"{stats.state_visits} nodes, {stats.restarts} restarts, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+
+
+def run_cbj_benchmark():
+    print("\n=== Backjumping: DFS vs ConflictDirectedBackjumping ===")
+    cbj_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("FC + DFS", DepthFirstSearch()),
+        ("FC + CBJ", ConflictDirectedBackjumping()),
+        ("GAC + DFS", DepthFirstSearch(AllDifferentGAC())),
+        ("GAC + CBJ", ConflictDirectedBackjumping(AllDifferentGAC())),
+    ]
+    for puzzle_name, puzzle in hard_puzzles:
+        for strategy_name, strategy in cbj_strategies:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.backjumped_levels} levels backjumped, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+
+
+def run_nogoods_benchmark():
+    print("\n=== Nogoods: ConflictDirectedBackjumping vs NogoodLearning ===")
+    nogood_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("FC + CBJ", ConflictDirectedBackjumping()),
+        ("FC + nogoods", NogoodLearning()),
+        ("FC + nogoods (capacity 100)", NogoodLearning(capacity=100)),
+        ("GAC + CBJ", ConflictDirectedBackjumping(AllDifferentGAC())),
+        ("GAC + nogoods", NogoodLearning(AllDifferentGAC())),
+    ]
+    for puzzle_name, puzzle in hard_puzzles:
+        for strategy_name, strategy in nogood_strategies:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.nogoods_learned} learned, {stats.nogood_prunes} prunes, "
+                f"{stats.nogood_evictions} evicted, {stats.elapsed_time:.3f}s"
+            )
+
+
+def run_parallel_benchmark():
+    print("\n=== Parallel: DepthFirstSearch vs ParallelSearch ===")
+    parallel_puzzles = hard_puzzles + [("16x16-pattern", pattern_sudoku(16, 2))]
+    for puzzle_name, puzzle in parallel_puzzles:
+        for strategy_name, strategy in [
+            ("GAC + DFS", DepthFirstSearch(AllDifferentGAC())),
+            ("GAC + parallel", ParallelSearch(DepthFirstSearch(AllDifferentGAC()))),
+        ]:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+
+
+def run_portfolio_benchmark():
+    print("\n=== Portfolio: racing DepthFirstSearch configurations ===")
+    portfolio = Portfolio[int](
+        {
+            "FC": DepthFirstSearch(),
+            "FC + dom/wdeg": DepthFirstSearch(weighted_degree=True),
+            "GAC": DepthFirstSearch(AllDifferentGAC()),
+            "GAC + dom/wdeg": DepthFirstSearch(AllDifferentGAC(), weighted_degree=True),
+        }
+    )
+    wins = dict[Optional[str], int]()
+    for puzzle_name, puzzle in hard_puzzles + [
+        ("16x16-pattern", pattern_sudoku(16, 2))
+    ]:
+        result = portfolio.solve(*puzzle.to_state())
+        wins[result.winner] = wins.get(result.winner, 0) + 1
+        print(
+            f"{puzzle_name} / portfolio: won by {result.winner}, "
+            f"{result.stats.state_visits} nodes, {result.stats.elapsed_time:.3f}s"
+        )
+    print(f"wins: {wins}")
+
+
+def run_unique_benchmark():
+    print("\n=== Uniqueness: first solution vs is_unique ===")
+    for puzzle_name, puzzle in hard_puzzles:
+        strategy = DepthFirstSearch[int](AllDifferentGAC())
+        _, stats = puzzle.solve(strategy)
+        print(
+            f"{puzzle_name} / GAC solve: {stats.state_visits} nodes, "
+            f"{stats.elapsed_time:.3f}s"
+        )
+        stats = SearchStrategy.Stats()
+        unique = strategy.is_unique(*puzzle.to_state(), stats=stats)
+        print(
+            f"{puzzle_name} / GAC is_unique: {unique}, {stats.state_visits} nodes, "
+            f"{stats.elapsed_time:.3f}s"
+        )
+
+
+def run_limits_benchmark():
+    print("\n=== Limits: per-node overhead of budget checks ===")
+    generous = SearchStrategy.Limits(
+        nodes=10**9,
+        propagations=10**9,
+        time=3600,
+        trail=10**9,
+        cancellation=CancellationToken(),
+    )
+    for limits_name, limits in [("no limits", None), ("every limit", generous)]:
+        nodes = 0
+        elapsed = 0.0
+        for _, puzzle in puzzles:
+            _, stats = puzzle.solve(
+                DepthFirstSearch(NullPropagator(), least_constraining_values=False),
+                limits,
+            )
+            nodes += stats.state_visits
+            elapsed += stats.elapsed_time
+        print(
+            f"puzzles / NullPropagator, {limits_name}: {nodes} nodes, "
+            f"{elapsed / nodes * 1e6:.1f}us per node"
+        )
+
+
+def run_async_benchmark():
+    print("\n=== Async: event loop latency while solving ===")
+    _, puzzle = hard_puzzles[1]
+
+    async def measure(solve: Callable[[], Awaitable[object]]) -> list[float]:
+        delays = list[float]()
+        done = False
+
+        async def tick() -> None:
+            while not done:
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                delays.append(time.perf_counter() - start - 0.001)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        await solve()
+        done = True
+        await ticker
+        return sorted(delays)
+
+    async def blocking() -> None:
+        puzzle.solve(DepthFirstSearch())
+
+    async def step_wise() -> None:
+        await puzzle.solve_async(DepthFirstSearch())
+
+    async def threaded() -> None:
+        await puzzle.solve_async(Restarts(DepthFirstSearch(), scale=10**9))
+
+    for solve_name, solve in [
+        ("blocking solve", blocking),
+        ("DFS solve_async", step_wise),
+        ("thread solve_async", threaded),
+    ]:
+        delays = asyncio.run(measure(solve))
+        print(
+            f"{solve_name}: {len(delays)} ticks, "
+            f"p99 delay {delays[int(len(delays) * 0.99)] * 1e3:.1f}ms, "
+            f"max delay {delays[-1] * 1e3:.1f}ms"
+        )
+
+
+def run_dlx_benchmark():
+    print("\n=== DLX: dancing links vs DFS ===")
+    dlx_puzzles = (
+        [("4x4-empty", Sudoku(4, {}))]
+        + hard_puzzles
+        + [
+            ("9x9-empty", Sudoku(9, {})),
+            ("16x16-pattern", pattern_sudoku(16, 2)),
+            ("16x16-empty", Sudoku(16, {})),
+            ("25x25-pattern", pattern_sudoku(25, 2)),
+            ("25x25-empty", Sudoku(25, {})),
+        ]
+    )
+    dlx_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("DFS + ForwardChecking", DepthFirstSearch(ForwardChecking())),
+        ("DFS + AllDifferentGAC", DepthFirstSearch(AllDifferentGAC())),
+        ("DancingLinks", DancingLinks()),
+    ]
+    limits = SearchStrategy.Limits(time=60)
+    for puzzle_name, puzzle in dlx_puzzles:
+        for strategy_name, strategy in dlx_strategies:
+            try:
+                _, stats = puzzle.solve(strategy, limits)
+            except Sudoku.Error as e:
+                print(f"{puzzle_name} / {strategy_name}: {e}")
+                continue
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.state_visits} nodes, "
+                f"{stats.elapsed_time:.3f}s"
+            )
+
+
+def run_sat_benchmark():
+    print("\n=== SAT: CDCL on a CNF encoding vs DFS ===")
+    sat_puzzles = hard_puzzles + [
+        ("16x16-pattern", pattern_sudoku(16, 2)),
+        ("16x16-empty", Sudoku(16, {})),
+        ("25x25-pattern", pattern_sudoku(25, 2)),
+    ]
+    sat_strategies: list[tuple[str, SearchStrategy[int]]] = [
+        ("DFS + ForwardChecking", DepthFirstSearch(ForwardChecking())),
+        ("DFS + AllDifferentGAC", DepthFirstSearch(AllDifferentGAC())),
+        ("SAT pairwise", SatSearch(SatSearch.Encoding.PAIRWISE)),
+        ("SAT sequential", SatSearch(SatSearch.Encoding.SEQUENTIAL)),
+    ]
+    for puzzle_name, puzzle in sat_puzzles:
+        for strategy_name, strategy in sat_strategies:
+            _, stats = puzzle.solve(strategy)
+            print(
+                f"{puzzle_name} / {strategy_name}: {stats.assignments} decisions, "
+                f"{stats.failures} failures, {stats.elapsed_time:.3f}s"
+            )
+
+
+benchmarks: dict[str, Callable[[], None]] = {
+    "search": run_benchmark,
+    "trail": run_trail_benchmark,
+    "bookkeeping": run_bookkeeping_benchmark,
+    "gac": run_gac_benchmark,
+    "residues": run_residues_benchmark,
+    "large": run_large_benchmark,
+    "dfs": run_dfs_benchmark,
+    "lcv": run_lcv_benchmark,
+    "wdeg": run_wdeg_benchmark,
+    "restarts": run_restarts_benchmark,
+    "cbj": run_cbj_benchmark,
+    "nogoods": run_nogoods_benchmark,
+    "parallel": run_parallel_benchmark,
+    "portfolio": run_portfolio_benchmark,
+    "unique": run_unique_benchmark,
+    "limits": run_limits_benchmark,
+    "async": run_async_benchmark,
+    "dlx": run_dlx_benchmark,
+    "sat": run_sat_benchmark,
+}
+
+
 if __name__ == "__main__":
-    run_benchmark()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("benchmarks", nargs="*", choices=list(benchmarks))
+    for name in parser.parse_args().benchmarks or benchmarks:
+        benchmarks[name]()
@@ -1,4 +1,6 @@
 from .delta_object import DeltaObject as DeltaObject
 from .delta_record import DeltaRecord as DeltaRecord
+from .compact_delta_record import CompactDeltaRecord as CompactDeltaRecord
 from .delta import Delta as Delta
+from .change import Change as Change
 from .noop import Noop as Noop
@@ -0,0 +1,23 @@
+from csp.delta.delta import Delta
+from typing import override
+
+
+class Change(Delta["delta_object.DeltaObject"]):
+    def __init__(
+        self, obj: "delta_object.DeltaObject", opcode: int, value: object
+    ) -> None:
+        super().__init__(obj)
+        self._opcode = opcode
+        self._value = value
+        self._payload: object = None
+
+    @override
+    def apply(self) -> None:
+        self._payload = self._object._apply_change(self._opcode, self._value)
+
+    @override
+    def revert(self) -> None:
+        self._object._revert_change(self._opcode, self._payload)
+
+
+from . import delta_object
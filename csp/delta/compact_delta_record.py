@@ -0,0 +1,111 @@
+from csp.delta.abstract_delta import AbstractDelta
+from csp.delta.change import Change
+from csp.delta.delta_record import DeltaRecord
+from array import array
+from typing import cast, override, Iterator
+
+
+class CompactDeltaRecord(DeltaRecord):
+    """A trail that stores changes as opcode/target/payload rows.
+
+    Changes made through DeltaObject._change don't allocate a delta object: the
+    opcode and the undo payload returned by the target go into two typed arrays
+    and the target itself into a parallel list, so the trail only keeps objects
+    alive while they have changes on it. revert_to undoes a whole checkpoint
+    range in a single loop. Payloads that don't fit in a signed 64-bit int, as
+    well as arbitrary deltas passed to apply, are boxed in a side stack and
+    flagged in the opcode.
+    """
+
+    _BOXED = 0x80
+    _DELTA = 0x7F
+    _MIN_PAYLOAD = -(2**63)
+    _MAX_PAYLOAD = 2**63 - 1
+
+    def __init__(self) -> None:
+        # Every DeltaRecord method that would touch the list of deltas is
+        # overridden, so there's no super().__init__() to call.
+        self._opcodes = array("B")
+        self._targets = list["delta_object.DeltaObject | None"]()
+        self._payloads = array("q")
+        self._boxed = list[object]()
+
+    @override
+    def __len__(self) -> int:
+        return len(self._opcodes)
+
+    @override
+    def __iter__(self) -> Iterator[AbstractDelta]:
+        boxed = iter(self._boxed)
+        for opcode, target, payload in zip(
+            self._opcodes, self._targets, self._payloads
+        ):
+            value: object = payload
+            if opcode & self._BOXED:
+                value = next(boxed)
+                opcode &= ~self._BOXED
+            if target is None:
+                assert isinstance(value, AbstractDelta)
+                yield value
+            else:
+                change = Change(target, opcode, None)
+                change._payload = value
+                yield change
+
+    @override
+    def apply(self, delta: AbstractDelta) -> None:
+        delta.apply()
+        self._boxed.append(delta)
+        self._opcodes.append(self._DELTA | self._BOXED)
+        self._targets.append(None)
+        self._payloads.append(0)
+
+    @override
+    def change(
+        self, obj: "delta_object.DeltaObject", opcode: int, value: object
+    ) -> None:
+        if not 0 <= opcode < self._DELTA:
+            raise self.Error(f"Opcode {opcode} is reserved")
+        payload = obj._apply_change(opcode, value)
+        if type(payload) is int and self._MIN_PAYLOAD <= payload <= self._MAX_PAYLOAD:
+            self._payloads.append(payload)
+        else:
+            self._boxed.append(payload)
+            self._payloads.append(0)
+            opcode |= self._BOXED
+        self._opcodes.append(opcode)
+        self._targets.append(obj)
+
+    @override
+    def revert(self) -> None:
+        if not self._opcodes:
+            raise self.Error("No deltas to revert")
+        self.revert_to(len(self._opcodes) - 1)
+
+    @override
+    def checkpoint(self) -> int:
+        return len(self._opcodes)
+
+    @override
+    def revert_to(self, checkpoint: int) -> None:
+        # Searches mostly undo one or two rows at a time, where popping beats
+        # slicing the arrays.
+        opcodes = self._opcodes
+        targets = self._targets
+        payloads = self._payloads
+        boxed = self._boxed
+        boxed_flag = self._BOXED
+        while len(opcodes) > checkpoint:
+            opcode = opcodes.pop()
+            target = targets.pop()
+            payload: object = payloads.pop()
+            if opcode & boxed_flag:
+                payload = boxed.pop()
+                if target is None:
+                    cast(AbstractDelta, payload).revert()
+                    continue
+                opcode &= ~boxed_flag
+            target._revert_change(opcode, payload)  # type: ignore[union-attr]
+
+
+from . import delta_object
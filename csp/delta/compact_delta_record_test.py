@@ -0,0 +1,109 @@
+from csp.delta import CompactDeltaRecord, DeltaObject, DeltaRecord, Noop
+from csp.state import State, Variable, Domain
+import gc
+import pytest
+import weakref
+
+
+def test_change_and_revert():
+    delta_record = CompactDeltaRecord()
+    domain = Domain(delta_record, {1, 2, 3})
+    domain.remove_value(2)
+    assert set(domain) == {1, 3}
+    assert len(delta_record) == 1
+    domain.revert()
+    assert set(domain) == {1, 2, 3}
+    assert len(delta_record) == 0
+
+
+def test_revert_to_checkpoint():
+    delta_record = CompactDeltaRecord()
+    a = Variable(delta_record, "a", Domain(delta_record, {1, 2, 3}))
+    b = Variable(delta_record, "b", Domain(delta_record, {1, 2, 3}))
+    state = State(delta_record, [a, b])
+    a.assign(1)
+    checkpoint = state.checkpoint()
+    b.remove_value_from_domain(1)
+    b.remove_value_from_domain(2)
+    b.assign(3)
+    a.unassign()
+    assert len(delta_record) == checkpoint + 4
+    state.revert_to(checkpoint)
+    assert a.value() == 1
+    assert b.value() is None
+    assert b.domain_values() == {1, 2, 3}
+
+
+def test_maintain_state():
+    delta_record = CompactDeltaRecord()
+    variable = Variable(delta_record, "a", Domain(delta_record, {1, 2}))
+    with delta_record.maintain_state():
+        variable.assign(1)
+        with delta_record.maintain_state():
+            variable.assign(2)
+            variable.remove_value_from_domain(1)
+            assert variable.value() == 2
+        assert variable.value() == 1
+        assert variable.domain_values() == {1, 2}
+    assert variable.value() is None
+
+
+def test_boxed_payloads():
+    delta_record = CompactDeltaRecord()
+    variable = Variable(delta_record, "a", Domain(delta_record, {"x", "y", 2**70}))
+    with delta_record.maintain_state():
+        variable.assign("x")
+        variable.assign(2**70)
+        variable.remove_value_from_domain("y")
+        assert variable.value() == 2**70
+        variable.revert()
+        assert variable.domain_values() == {"x", "y", 2**70}
+    assert variable.value() is None
+
+
+def test_generic_delta():
+    delta_record = CompactDeltaRecord()
+    domain = Domain(delta_record, {1})
+    domain.add_value(1)
+    domain.remove_value(1)
+    assert [type(delta).__name__ for delta in delta_record] == ["Noop", "Change"]
+    delta_record.revert_to(0)
+    assert set(domain) == {1}
+
+
+def test_reserved_opcode():
+    delta_record = CompactDeltaRecord()
+    domain = Domain(delta_record, {1})
+    with pytest.raises(CompactDeltaRecord.Error):
+        delta_record.change(domain, CompactDeltaRecord._DELTA, 1)
+    with pytest.raises(CompactDeltaRecord.Error):
+        delta_record.change(domain, -1, 1)
+    delta_record.apply(Noop())
+    assert len(delta_record) == 1
+
+
+@pytest.mark.parametrize(
+    "delta_record", [DeltaRecord(), CompactDeltaRecord()], ids=type
+)
+def test_unknown_opcode(delta_record: DeltaRecord):
+    with pytest.raises(DeltaObject.OpcodeError):
+        delta_record.change(DeltaObject(delta_record), 1, None)
+
+
+@pytest.mark.parametrize("delta_record_type", [DeltaRecord, CompactDeltaRecord])
+def test_releases_reverted_objects(delta_record_type: type[DeltaRecord]):
+    delta_record = delta_record_type()
+    domain = Domain(delta_record, {1, 2})
+    domain.remove_value(1)
+    reference = weakref.ref(domain)
+    del domain
+    gc.collect()
+    assert reference() is not None
+    delta_record.revert_to(0)
+    gc.collect()
+    assert reference() is None
+
+
+def test_underflow():
+    with pytest.raises(CompactDeltaRecord.Error):
+        CompactDeltaRecord().revert()
@@ -5,12 +5,25 @@ from typing import Iterator
 
 
 class DeltaObject:
+    class Error(Exception): ...
+
+    class OpcodeError(Error): ...
+
     def __init__(self, delta_record: DeltaRecord) -> None:
         self._delta_record = delta_record
 
     def apply(self, delta: AbstractDelta) -> None:
         self._delta_record.apply(delta)
 
+    def _change(self, opcode: int, value: object) -> None:
+        self._delta_record.change(self, opcode, value)
+
+    def _apply_change(self, opcode: int, value: object) -> object:
+        raise self.OpcodeError(f"{type(self).__name__} has no opcode {opcode}")
+
+    def _revert_change(self, opcode: int, payload: object) -> None:
+        raise self.OpcodeError(f"{type(self).__name__} has no opcode {opcode}")
+
     def revert(self) -> None:
         self._delta_record.revert()
 
@@ -21,6 +21,11 @@ class DeltaRecord(Sized, Iterable[AbstractDelta]):
         delta.apply()
         self._deltas.append(delta)
 
+    def change(
+        self, obj: "delta_object.DeltaObject", opcode: int, value: object
+    ) -> None:
+        self.apply(Change(obj, opcode, value))
+
     def revert(self) -> None:
         if not self._deltas:
             raise self.Error("No deltas to revert")
@@ -41,3 +46,7 @@ class DeltaRecord(Sized, Iterable[AbstractDelta]):
             yield
         finally:
             self.revert_to(checkpoint)
+
+
+from . import delta_object
+from .change import Change
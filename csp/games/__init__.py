@@ -1,2 +1,3 @@
-from .game import Game as Game
+from .game import Game as Game, solve_batch as solve_batch
 from .sudoku import Sudoku as Sudoku
+from .sudoku_propagator import SudokuPropagator as SudokuPropagator
@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
 from csp.model import CSP
 from csp.state import State
-from csp.processing import SearchStrategy
-from typing import Self
+from csp.processing import CancellationToken, SearchStrategy
+from concurrent.futures import Executor
+from typing import Any, Iterable, Optional, Self
+import asyncio
+import copy
+import dataclasses
 
 
 class Game[T](ABC):
@@ -15,9 +19,29 @@ class Game[T](ABC):
     @abstractmethod
     def from_state(cls, csp: CSP[T], state: State[T]) -> Self: ...
 
-    def solve(self, strategy: SearchStrategy[T]) -> tuple[Self, SearchStrategy.Stats]:
+    def solve(
+        self,
+        strategy: SearchStrategy[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> tuple[Self, SearchStrategy.Stats]:
         csp, state = self.to_state()
-        result = strategy.solve(csp, state)
+        result = strategy.solve(csp, state, limits)
+        return self._solution(csp, state, result)
+
+    async def solve_async(
+        self,
+        strategy: SearchStrategy[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> tuple[Self, SearchStrategy.Stats]:
+        csp, state = self.to_state()
+        result = await strategy.solve_async(csp, state, limits)
+        return self._solution(csp, state, result)
+
+    def _solution(
+        self, csp: CSP[T], state: State[T], result: SearchStrategy.Result
+    ) -> tuple[Self, SearchStrategy.Stats]:
+        if result.limit_reached:
+            raise self.Error("Search limit reached")
         if not result.success:
             raise self.Error("No solution found")
         if not state.is_valid():
@@ -25,3 +49,47 @@ class Game[T](ABC):
         if not csp.is_satisfied(state):
             raise self.Error("CSP is not satisfied")
         return (self.from_state(csp, state), result.stats)
+
+
+async def solve_batch[
+    G: Game[Any]
+](
+    games: Iterable[G],
+    strategy: SearchStrategy[Any],
+    limits: Optional[SearchStrategy.Limits] = None,
+    executor: Optional[Executor] = None,
+) -> list[tuple[G, SearchStrategy.Stats]]:
+    """Solve games on executor, or the event loop's default one, each with its
+    own copy of strategy, without blocking the loop. A ProcessPoolExecutor
+    solves them in parallel. Cancelling cancels the solves that haven't
+    started and, through a CancellationToken per game, stops running ones
+    before raising CancelledError. The tokens can't reach another process, so
+    on a ProcessPoolExecutor running solves are left to finish."""
+    if limits is None:
+        limits = SearchStrategy.Limits()
+    loop = asyncio.get_running_loop()
+    cancellations = list[CancellationToken]()
+    futures = list[asyncio.Future[tuple[G, SearchStrategy.Stats]]]()
+    for game in games:
+        cancellation = CancellationToken(limits.cancellation)
+        cancellations.append(cancellation)
+        futures.append(
+            loop.run_in_executor(
+                executor,
+                game.solve,
+                copy.deepcopy(strategy),
+                dataclasses.replace(limits, cancellation=cancellation),
+            )
+        )
+    batch = asyncio.gather(*futures)
+    try:
+        return await asyncio.shield(batch)
+    except asyncio.CancelledError:
+        for cancellation in cancellations:
+            cancellation.cancel()
+        if futures:
+            await asyncio.wait(futures)
+        # The stopped solves fail with Game.Error, which nobody is waiting for.
+        if not batch.cancelled():
+            batch.exception()
+        raise
@@ -3,7 +3,7 @@ from csp.model import CSP, Constraint
 from csp.model.constraints import AllDifferent
 from csp.state import State, Variable, Domain
 from csp.delta import DeltaRecord
-from typing import override, Iterable, Iterator
+from typing import override, Iterable, Iterator, Optional
 import math
 from collections.abc import MutableMapping, Mapping
 
@@ -17,7 +17,7 @@ class Sudoku(Game[int], MutableMapping[tuple[int, int], int]):
 
     @staticmethod
     def _var_to_key(var: str) -> tuple[int, int]:
-        return (ord(var[0]) - ord("A"), int(var[1]) - 1)
+        return (ord(var[0]) - ord("A"), int(var[1:]) - 1)
 
     @classmethod
     def _make_csp(cls, size: int) -> CSP[int]:
@@ -104,8 +104,12 @@ class Sudoku(Game[int], MutableMapping[tuple[int, int], int]):
         return self.size**2
 
     @override
-    def to_state(self) -> tuple[CSP[int], State[int]]:
-        delta_record = DeltaRecord()
+    def to_state(
+        self,
+        delta_record: Optional[DeltaRecord] = None,
+    ) -> tuple[CSP[int], State[int]]:
+        if delta_record is None:
+            delta_record = DeltaRecord()
         return (
             self._make_csp(self.size),
             State[int](
@@ -0,0 +1,229 @@
+from csp.games.sudoku import Sudoku
+from csp.processing import Propagator
+from csp.model import CSP, Constraint
+from csp.model.constraints import AllDifferent
+from csp.state import State
+from typing import Iterable, Optional, override
+import itertools
+import math
+
+
+class SudokuPropagator(Propagator[int]):
+    """Human-style Sudoku deductions over the rows, columns and boxes of a board.
+
+    Each unit is filtered with, in order: naked singles, hidden singles, naked
+    and hidden pairs and triples, and pointing (a box whose candidates for a
+    value all lie in one row or column clears it from the rest of that line) or
+    box-line reduction (the converse). The first rule that prunes re-queues the
+    units of the pruned cells, this one included, so cheap rules reach their
+    fixpoint before the subset rules run. Each unit pass is linear in the number
+    of candidates of the unit, apart from the subset rules, which only combine
+    cells or values with at most three candidates.
+
+    The board is read from the variable names of Sudoku.to_state, and prune
+    counts are reported per rule in Stats.by_rule.
+    """
+
+    NAKED_SINGLE = "naked_single"
+    HIDDEN_SINGLE = "hidden_single"
+    NAKED_PAIR = "naked_pair"
+    NAKED_TRIPLE = "naked_triple"
+    HIDDEN_PAIR = "hidden_pair"
+    HIDDEN_TRIPLE = "hidden_triple"
+    POINTING = "pointing"
+    BOX_LINE = "box_line"
+
+    _NAKED_SUBSETS = {2: NAKED_PAIR, 3: NAKED_TRIPLE}
+    _HIDDEN_SUBSETS = {2: HIDDEN_PAIR, 3: HIDDEN_TRIPLE}
+
+    def __init__(self) -> None:
+        self._state: Optional[State[int]] = None
+        self._units = list[list[int]]()
+        self._is_box = list[bool]()
+        self._cell_units = list[list[int]]()
+        self._crossings = list[list[tuple[int, set[int]]]]()
+        self._constraints = list[Optional[Constraint[int]]]()
+
+    @override
+    def handles(self, constraint: Constraint[int]) -> bool:
+        return isinstance(constraint, AllDifferent)
+
+    @override
+    def propagate(self, csp: CSP[int], state: State[int]) -> Propagator.Result:
+        self._compile(csp, state)
+        if not state.is_valid():
+            return Propagator.Result(success=False)
+        return self._filter(state, range(len(self._units)))
+
+    @override
+    def propagate_changes(
+        self, csp: CSP[int], state: State[int], changed: Iterable[int]
+    ) -> Propagator.Result:
+        self._compile(csp, state)
+        return self._filter(
+            state, [unit for var_id in changed for unit in self._cell_units[var_id]]
+        )
+
+    def _compile(self, csp: CSP[int], state: State[int]) -> None:
+        csp.compile(state)
+        if state is self._state:
+            return
+        size = math.isqrt(len(state))
+        Sudoku._validate_size(size)
+        box_size = math.isqrt(size)
+        cells = {
+            Sudoku._var_to_key(variable.name): variable.id
+            for variable in state.variables()
+        }
+        if set(cells) != {(row, col) for row in range(size) for col in range(size)}:
+            raise Sudoku.Error(f"state is not a {size}x{size} sudoku board")
+
+        boxes = [
+            [
+                cells[row, col]
+                for row in range(box_row, box_row + box_size)
+                for col in range(box_col, box_col + box_size)
+            ]
+            for box_row in range(0, size, box_size)
+            for box_col in range(0, size, box_size)
+        ]
+        rows = [[cells[row, col] for col in range(size)] for row in range(size)]
+        cols = [[cells[row, col] for row in range(size)] for col in range(size)]
+        self._units = boxes + rows + cols
+        self._is_box = [True] * len(boxes) + [False] * (len(rows) + len(cols))
+
+        self._cell_units = [[] for _ in range(len(state))]
+        for unit, var_ids in enumerate(self._units):
+            for var_id in var_ids:
+                self._cell_units[var_id].append(unit)
+
+        self._crossings = [[] for _ in self._units]
+        for box in range(len(boxes)):
+            for line in range(len(boxes), len(self._units)):
+                shared = set(self._units[box]) & set(self._units[line])
+                if len(shared) > 1:
+                    self._crossings[box].append((line, shared))
+                    self._crossings[line].append((box, shared))
+        constraints = {
+            frozenset(constraint.scope_ids()): constraint
+            for constraint in csp.constraints()
+        }
+        self._constraints = [
+            constraints.get(frozenset(var_ids)) for var_ids in self._units
+        ]
+        self._state = state
+
+    def _filter(self, state: State[int], units: Iterable[int]) -> Propagator.Result:
+        stats = Propagator.Stats()
+        queue = dict.fromkeys(units)
+        while queue:
+            unit = next(iter(queue))
+            del queue[unit]
+            stats.constraint_checks += 1
+            pruned = self._filter_unit(state, unit, stats)
+            if pruned is None:
+                return Propagator.Result(
+                    success=False, stats=stats, conflict=self._constraints[unit]
+                )
+            for var_id in pruned:
+                queue.update(dict.fromkeys(self._cell_units[var_id]))
+        return Propagator.Result(success=True, stats=stats)
+
+    def _filter_unit(
+        self, state: State[int], unit: int, stats: Propagator.Stats
+    ) -> Optional[set[int]]:
+        """Apply the rules to unit until one prunes, returning the ids of the
+        pruned cells, or None if the unit can't be completed."""
+        var_ids = self._units[unit]
+        candidates = dict[int, set[int]]()
+        for var_id in var_ids:
+            variable = state.variable(var_id)
+            value = variable.value()
+            candidates[var_id] = (
+                {value} if value is not None else variable.domain_values()
+            )
+            if not candidates[var_id]:
+                return None
+
+        pruned = set[int]()
+
+        def remove(var_id: int, values: Iterable[int], rule: str) -> bool:
+            variable = state.variable(var_id)
+            value = variable.value()
+            for other in values:
+                if value is not None:
+                    if other == value:
+                        return False
+                    continue
+                if other not in variable.domain:
+                    continue
+                variable.remove_value_from_domain(other)
+                if var_id in candidates:
+                    candidates[var_id].discard(other)
+                stats.domain_prunes += 1
+                stats.by_rule[rule] = stats.by_rule.get(rule, 0) + 1
+                pruned.add(var_id)
+            return value is not None or variable.domain_size() > 0
+
+        for var_id, values in candidates.items():
+            if len(values) != 1:
+                continue
+            for other in var_ids:
+                if other != var_id and not remove(other, values, self.NAKED_SINGLE):
+                    return None
+        if pruned:
+            return pruned
+
+        positions = dict[int, list[int]]()
+        for var_id, values in candidates.items():
+            for value in values:
+                positions.setdefault(value, []).append(var_id)
+        if len(positions) < len(var_ids):
+            return None
+        for value, var_ids_for_value in positions.items():
+            if len(var_ids_for_value) == 1:
+                var_id = var_ids_for_value[0]
+                if not remove(var_id, candidates[var_id] - {value}, self.HIDDEN_SINGLE):
+                    return None
+        if pruned:
+            return pruned
+
+        for k, rule in self._NAKED_SUBSETS.items():
+            small = [var_id for var_id in var_ids if 2 <= len(candidates[var_id]) <= k]
+            for subset in itertools.combinations(small, k):
+                values = set[int]().union(*(candidates[var_id] for var_id in subset))
+                if len(values) < k:
+                    return None
+                if len(values) > k:
+                    continue
+                for other in var_ids:
+                    if other not in subset and not remove(other, values, rule):
+                        return None
+            if pruned:
+                return pruned
+
+        for k, rule in self._HIDDEN_SUBSETS.items():
+            small = [value for value, ids in positions.items() if 2 <= len(ids) <= k]
+            for subset in itertools.combinations(small, k):
+                cells = set[int]().union(*(positions[value] for value in subset))
+                if len(cells) < k:
+                    return None
+                if len(cells) > k:
+                    continue
+                for var_id in cells:
+                    if not remove(var_id, candidates[var_id] - set(subset), rule):
+                        return None
+            if pruned:
+                return pruned
+
+        rule = self.POINTING if self._is_box[unit] else self.BOX_LINE
+        for other_unit, shared in self._crossings[unit]:
+            for value, var_ids_for_value in positions.items():
+                if len(var_ids_for_value) < 2 or not shared.issuperset(
+                    var_ids_for_value
+                ):
+                    continue
+                for other in self._units[other_unit]:
+                    if other not in shared and not remove(other, (value,), rule):
+                        return None
+        return pruned
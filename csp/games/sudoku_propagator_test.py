@@ -0,0 +1,144 @@
+from csp.games import Sudoku, SudokuPropagator
+from csp.processing.strategies import DepthFirstSearch
+from csp.delta import DeltaRecord
+from csp.model import CSP
+from csp.state import State, Variable, Domain
+import pytest
+
+
+def test_naked_single():
+    csp, state = Sudoku(4, {(0, 0): 1}).to_state()
+
+    result = SudokuPropagator().propagate(csp, state)
+
+    assert result.success
+    for name in ["A2", "A3", "A4", "B1", "B2", "C1", "D1"]:
+        assert 1 not in state[name].domain
+    assert result.stats.by_rule == {SudokuPropagator.NAKED_SINGLE: 7}
+
+
+def test_hidden_single():
+    csp, state = Sudoku(4, {}).to_state()
+    for name in ["A2", "A3", "A4"]:
+        state[name].remove_value_from_domain(1)
+
+    result = SudokuPropagator().propagate(csp, state)
+
+    assert result.success
+    assert state["A1"].domain_values() == {1}
+    assert result.stats.by_rule[SudokuPropagator.HIDDEN_SINGLE] == 3
+
+
+def test_naked_pair():
+    csp, state = Sudoku(9, {}).to_state()
+    for name in ["A1", "A2"]:
+        for value in range(3, 10):
+            state[name].remove_value_from_domain(value)
+
+    result = SudokuPropagator().propagate(csp, state)
+
+    assert result.success
+    for name in ["A3", "A9", "B1", "C3"]:
+        assert state[name].domain_values() == set(range(3, 10))
+    assert state["D1"].domain_values() == set(range(1, 10))
+    assert result.stats.by_rule == {SudokuPropagator.NAKED_PAIR: 2 * (7 + 6)}
+
+
+def test_hidden_pair():
+    csp, state = Sudoku(9, {}).to_state()
+    for name in ["A3", "A4", "A5", "A6", "A7", "A8", "A9"]:
+        for value in [1, 2]:
+            state[name].remove_value_from_domain(value)
+
+    result = SudokuPropagator().propagate(csp, state)
+
+    assert result.success
+    assert state["A1"].domain_values() == {1, 2}
+    assert state["A2"].domain_values() == {1, 2}
+    assert result.stats.by_rule[SudokuPropagator.HIDDEN_PAIR] == 14
+
+
+def test_pointing():
+    csp, state = Sudoku(9, {}).to_state()
+    for name in ["B1", "B2", "B3", "C1", "C2", "C3"]:
+        state[name].remove_value_from_domain(1)
+
+    result = SudokuPropagator().propagate(csp, state)
+
+    assert result.success
+    for col in range(4, 10):
+        assert 1 not in state[f"A{col}"].domain
+    assert result.stats.by_rule == {SudokuPropagator.POINTING: 6}
+
+
+def test_box_line():
+    csp, state = Sudoku(9, {}).to_state()
+    for col in range(4, 10):
+        state[f"A{col}"].remove_value_from_domain(1)
+
+    result = SudokuPropagator().propagate(csp, state)
+
+    assert result.success
+    for name in ["B1", "B2", "B3", "C1", "C2", "C3"]:
+        assert 1 not in state[name].domain
+    assert result.stats.by_rule == {SudokuPropagator.BOX_LINE: 6}
+
+
+def test_failure():
+    csp, state = Sudoku(4, {}).to_state()
+    for name in ["A1", "A2", "A3", "A4"]:
+        state[name].remove_value_from_domain(1)
+
+    assert not SudokuPropagator().propagate(csp, state).success
+
+
+def test_propagate_changes():
+    csp, state = Sudoku(4, {}).to_state()
+    propagator = SudokuPropagator()
+    assert propagator.propagate(csp, state).success
+
+    state["A1"].assign(1)
+    result = propagator.propagate_changes(csp, state, [state.id("A1")])
+
+    assert result.success
+    assert 1 not in state["A4"].domain
+    assert 1 not in state["D1"].domain
+    assert 1 not in state["B2"].domain
+
+
+def test_solves_easy_puzzle_without_search():
+    puzzle = Sudoku.from_str(
+        """
+        5 3 . . 7 . . . .
+        6 . . 1 9 5 . . .
+        . 9 8 . . . . 6 .
+        8 . . . 6 . . . 3
+        4 . . 8 . 3 . . 1
+        7 . . . 2 . . . 6
+        . 6 . . . . 2 8 .
+        . . . 4 1 9 . . 5
+        . . . . 8 . . 7 9
+        """
+    )
+    csp, state = puzzle.to_state()
+
+    assert SudokuPropagator().propagate(csp, state).success
+    assert all(
+        variable.is_assigned() or variable.domain_size() == 1
+        for variable in state.variables()
+    )
+
+    solution, stats = puzzle.solve(DepthFirstSearch(SudokuPropagator()))
+    assert solution.satisfies_puzzle(puzzle)
+    assert stats.propagator_stats.by_rule[SudokuPropagator.NAKED_SINGLE] > 0
+
+
+def test_not_a_board():
+    delta = DeltaRecord()
+    names = [f"{row}{col}" for row in "ABCD" for col in "1234"][:-1] + ["E1"]
+    state = State(
+        delta, [Variable(delta, name, Domain(delta, {1, 2, 3, 4})) for name in names]
+    )
+
+    with pytest.raises(Sudoku.Error):
+        SudokuPropagator().propagate(CSP[int]([]), state)
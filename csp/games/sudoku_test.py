@@ -1,11 +1,21 @@
-from csp.games import Sudoku
+from csp.games import Sudoku, SudokuPropagator, solve_batch
 from csp.state import State, Variable, Domain
 from csp.delta import DeltaRecord
 from csp.model import CSP
 from csp.processing import SearchStrategy
 from csp.processing.strategies import DepthFirstSearch
-from csp.processing.propagators import NullPropagator, SimplePropagator, AC3
+from csp.processing.propagators import (
+    NullPropagator,
+    SimplePropagator,
+    AC3,
+    AC3RM,
+    AllDifferentGAC,
+    ForwardChecking,
+    PropagationEngine,
+)
+import asyncio
 import pytest
+import time
 from collections.abc import Mapping
 from typing import Optional
 
@@ -109,6 +119,13 @@ def test_to_state_and_back():
     assert restored == sudoku
 
 
+def test_to_state_and_back_16x16():
+    sudoku = Sudoku(16, {(0, 0): 16, (3, 11): 12, (15, 15): 1})
+    csp, state = sudoku.to_state()
+    assert state["D12"].value() == 12
+    assert sudoku.from_state(csp, state) == sudoku
+
+
 def test_to_state_correct_variables():
     sudoku = Sudoku(4, {(0, 0): 1, (1, 1): 2})
     csp, state = sudoku.to_state()
@@ -168,6 +185,19 @@ def test_solve(subtests):
             DepthFirstSearch(NullPropagator()),
             DepthFirstSearch(SimplePropagator()),
             DepthFirstSearch(AC3()),
+            DepthFirstSearch(AC3RM()),
+            DepthFirstSearch(AllDifferentGAC()),
+            DepthFirstSearch(ForwardChecking()),
+            DepthFirstSearch(
+                PropagationEngine(
+                    [
+                        (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+                        (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+                    ]
+                )
+            ),
+            DepthFirstSearch(SudokuPropagator()),
+            DepthFirstSearch(),
         ]
     ):
         for name, game, expected in list[
@@ -307,3 +337,115 @@ def test_solve(subtests):
                     for key, val in expected.items():
                         assert result[key] == val, str(result)
                     assert result.satisfies_puzzle(game)
+
+
+def test_is_unique():
+    puzzle = Sudoku.from_str(
+        """
+        . . . . . . . 1 .
+        4 . . . . . . . .
+        . 2 . . . . . . .
+        . . . . 5 . 4 . 7
+        . . 8 . . . 3 . .
+        . . 1 . 9 . . . .
+        3 . . 4 . . 2 . .
+        . 5 . 1 . . . . .
+        . . . 8 . 6 . . .
+        """
+    )
+    strategy = DepthFirstSearch[int](AllDifferentGAC())
+    assert strategy.is_unique(*puzzle.to_state())
+
+    del puzzle[(0, 7)]
+    assert not strategy.is_unique(*puzzle.to_state())
+
+
+def test_solve_async():
+    puzzle = Sudoku.from_str(
+        """
+        8 . . . . . . . .
+        . . 3 6 . . . . .
+        . 7 . . 9 . 2 . .
+        . 5 . . . 7 . . .
+        . . . . 4 5 7 . .
+        . . . 1 . . . 3 .
+        . . 1 . . . . 6 8
+        . . 8 5 . . . 1 .
+        . 9 . . . . 4 . .
+        """
+    )
+    strategy = DepthFirstSearch[int](AllDifferentGAC())
+
+    solution, _ = asyncio.run(puzzle.solve_async(strategy))
+    assert solution.satisfies_puzzle(puzzle)
+
+    with pytest.raises(Sudoku.Error):
+        asyncio.run(puzzle.solve_async(strategy, SearchStrategy.Limits(nodes=1)))
+
+
+def test_solve_batch():
+    puzzles = [
+        Sudoku.from_str(
+            """
+            1 . . .
+            . . 1 .
+            . 1 . .
+            . . . 1
+            """
+        ),
+        Sudoku.from_str(
+            """
+            . 2 . .
+            . . . 1
+            3 . . .
+            . . 4 .
+            """
+        ),
+    ]
+    solved = asyncio.run(solve_batch(puzzles, DepthFirstSearch[int]()))
+
+    assert [
+        solution.satisfies_puzzle(puzzle)
+        for (solution, _), puzzle in zip(solved, puzzles)
+    ] == [True, True]
+
+
+class WaitsForCancellation(SearchStrategy[int]):
+    def solve(
+        self,
+        csp: CSP[int],
+        state: State[int],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
+        deadline = time.perf_counter() + 30
+        while time.perf_counter() < deadline:
+            if limits is not None and limits.cancellation is not None:
+                if limits.cancellation.is_cancelled():
+                    return SearchStrategy.Result(success=False, limit_reached=True)
+            time.sleep(0.01)
+        return SearchStrategy.Result(success=False)
+
+
+def test_solve_batch_cancel_stops_running_solves():
+    puzzle = Sudoku.from_str(
+        """
+        1 . . .
+        . . 1 .
+        . 1 . .
+        . . . 1
+        """
+    )
+
+    async def cancel_batch() -> None:
+        task = asyncio.create_task(
+            solve_batch([puzzle, puzzle], WaitsForCancellation())
+        )
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.perf_counter()
+    # asyncio.run waits for the executor's threads, so for the solves to stop.
+    asyncio.run(cancel_batch())
+    assert time.perf_counter() - start < 10
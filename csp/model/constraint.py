@@ -1,24 +1,70 @@
 from csp.state import State, Variable
 from abc import ABC, abstractmethod
 from typing import Optional
-from collections.abc import Set, Sequence
+from collections.abc import Iterable, Set, Sequence
 
 
 class Constraint[T](ABC):
     def __init__(self, variables: Set[str]) -> None:
         self._variables = set(variables)
+        self._state: Optional[State[T]] = None
+        self._scope: Sequence[Variable[T]] = ()
+        self._scope_ids: Sequence[int] = ()
 
     def variables(self) -> Set[str]:
         return self._variables
 
+    def bind(self, state: State[T]) -> None:
+        # Scope in id order, so iteration doesn't depend on string hashing.
+        self._scope = tuple(
+            sorted((state[var] for var in self._variables), key=lambda var: var.id)
+        )
+        self._scope_ids = tuple(var.id for var in self._scope)
+        self._state = state
+
+    def scope_ids(self) -> Sequence[int]:
+        return self._scope_ids
+
     def _vars(self, state: State[T]) -> Sequence[Variable[T]]:
+        if state is self._state:
+            return self._scope
         return [state[var] for var in self._variables]
 
     def _values(self, state: State[T]) -> Sequence[Optional[T]]:
-        return [var.value() for var in self._vars(state)]
+        return [var._value for var in self._vars(state)]
 
     def _assigned_values(self, state: State[T]) -> Sequence[T]:
-        return [value for value in self._values(state) if value is not None]
+        return [value for var in self._vars(state) if (value := var._value) is not None]
 
     @abstractmethod
     def is_satisfied(self, state: State[T]) -> bool: ...
+
+    def is_pairwise_not_equal(self) -> bool:
+        """Whether two values are compatible exactly when they differ, for every
+        pair of variables in the scope."""
+        return False
+
+    def is_compatible(
+        self, state: State[T], var1: int, value1: T, var2: int, value2: T
+    ) -> bool:
+        """Whether var1 = value1 and var2 = value2 can hold together under this
+        constraint, without changing state.
+
+        The default assigns both values under maintain_state and checks the
+        whole constraint against the rest of state, so it writes to the trail.
+        Subclasses should override it with a direct check.
+        """
+        with state.maintain_state():
+            state.variable(var1).assign(value1)
+            state.variable(var2).assign(value2)
+            return self.is_satisfied(state)
+
+    def supports(
+        self, state: State[T], var1: int, value1: T, var2: int, values2: Iterable[T]
+    ) -> set[T]:
+        """The values in values2 that are compatible with var1 = value1."""
+        return {
+            value2
+            for value2 in values2
+            if self.is_compatible(state, var1, value1, var2, value2)
+        }
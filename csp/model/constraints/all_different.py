@@ -1,6 +1,6 @@
 from csp.model import Constraint
 from csp.state import State
-from typing import override
+from typing import Iterable, override
 
 
 class AllDifferent[T](Constraint[T]):
@@ -8,3 +8,22 @@ class AllDifferent[T](Constraint[T]):
     def is_satisfied(self, state: State[T]) -> bool:
         values = self._assigned_values(state)
         return len(values) == len(set(values))
+
+    @override
+    def is_pairwise_not_equal(self) -> bool:
+        return True
+
+    @override
+    def is_compatible(
+        self, state: State[T], var1: int, value1: T, var2: int, value2: T
+    ) -> bool:
+        # Other assigned variables in the scope are checked by their own pairs.
+        return value1 != value2
+
+    @override
+    def supports(
+        self, state: State[T], var1: int, value1: T, var2: int, values2: Iterable[T]
+    ) -> set[T]:
+        values = set(values2)
+        values.discard(value1)
+        return values
@@ -35,3 +35,15 @@ def test_is_satisfied_with_unassigned():
         ],
     )
     assert AllDifferent[int]({"a", "b"}).is_satisfied(state)
+
+
+def test_is_compatible_and_supports():
+    delta_record = DeltaRecord()
+    a = Variable(delta_record, "a", Domain(delta_record, {1, 2, 3}))
+    b = Variable(delta_record, "b", Domain(delta_record, {1, 2, 3}))
+    state = State(delta_record, [a, b])
+    constraint = AllDifferent[int]({"a", "b"})
+    assert constraint.is_compatible(state, a.id, 1, b.id, 2)
+    assert not constraint.is_compatible(state, a.id, 1, b.id, 1)
+    assert constraint.supports(state, a.id, 1, b.id, b.domain) == {2, 3}
+    assert len(delta_record) == 0
@@ -1,6 +1,6 @@
 from csp.model.constraint import Constraint
 from csp.state import State
-from typing import Iterable
+from typing import Iterable, Optional
 from collections.abc import Sequence, Set
 from collections import defaultdict
 
@@ -20,18 +20,78 @@ class CSP[T]:
                     if a != b:
                         self._neighbors[a].add(b)
 
+        self._state: Optional[State[T]] = None
+        self._constraints_by_id = list[list[Constraint[T]]]()
+        self._neighbors_by_id = list[list[int]]()
+        self._constraints_between_ids = dict[tuple[int, int], list[Constraint[T]]]()
+
+    def compile(self, state: State[T]) -> None:
+        """Index the model by the dense variable ids of state.
+
+        Binds every constraint to state and builds the id-indexed constraint and
+        neighbor lists used by the *_id methods. Compiling the state the CSP is
+        already compiled for is a no-op.
+        """
+        if state is self._state:
+            return
+        self._constraints_by_id = [list() for _ in range(len(state))]
+        neighbors_by_id = [set[int]() for _ in range(len(state))]
+        for constraint in self._constraints:
+            constraint.bind(state)
+            scope_ids = constraint.scope_ids()
+            for a in scope_ids:
+                self._constraints_by_id[a].append(constraint)
+                neighbors_by_id[a].update(b for b in scope_ids if b != a)
+        self._neighbors_by_id = [sorted(neighbors) for neighbors in neighbors_by_id]
+        self._constraints_between_ids = {}
+        self._state = state
+
     def constraints(self) -> Sequence[Constraint[T]]:
         return self._constraints
 
     def constraints_for(self, var: str) -> Sequence[Constraint[T]]:
         return self._var_to_constraints.get(var, list())
 
+    def constraints_for_id(self, var: int) -> Sequence[Constraint[T]]:
+        return self._constraints_by_id[var]
+
     def constraints_between(self, var1: str, var2: str) -> Sequence[Constraint[T]]:
         return [c for c in self.constraints_for(var1) if var2 in c.variables()]
 
+    def constraints_between_ids(self, var1: int, var2: int) -> Sequence[Constraint[T]]:
+        key = (var1, var2)
+        constraints = self._constraints_between_ids.get(key)
+        if constraints is None:
+            constraints = [
+                c for c in self._constraints_by_id[var1] if var2 in c.scope_ids()
+            ]
+            self._constraints_between_ids[key] = constraints
+        return constraints
+
     def neighbors(self, var: str) -> Set[str]:
         return self._neighbors.get(var, set())
 
+    def neighbor_ids(self, var: int) -> Sequence[int]:
+        return self._neighbors_by_id[var]
+
+    def is_compatible(
+        self, state: State[T], var1: int, value1: T, var2: int, value2: T
+    ) -> bool:
+        return all(
+            constraint.is_compatible(state, var1, value1, var2, value2)
+            for constraint in self.constraints_between_ids(var1, var2)
+        )
+
+    def supports(
+        self, state: State[T], var1: int, value1: T, var2: int, values2: Iterable[T]
+    ) -> set[T]:
+        values = set(values2)
+        for constraint in self.constraints_between_ids(var1, var2):
+            if not values:
+                break
+            values = constraint.supports(state, var1, value1, var2, values)
+        return values
+
     def is_satisfied_for_constraints(
         self, state: State[T], constraints: Iterable[Constraint[T]]
     ) -> bool:
@@ -49,3 +109,10 @@ class CSP[T]:
         return self.is_satisfied_for_constraints(
             state, self.constraints_between(var1, var2)
         )
+
+    def is_satisfied_for_constraints_between_ids(
+        self, var1: int, var2: int, state: State[T]
+    ) -> bool:
+        return self.is_satisfied_for_constraints(
+            state, self.constraints_between_ids(var1, var2)
+        )
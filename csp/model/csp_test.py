@@ -1,4 +1,4 @@
-from csp.model import CSP
+from csp.model import CSP, Constraint
 from csp.model.constraints import AllDifferent
 from csp.delta import DeltaRecord
 from csp.state import State, Variable, Domain
@@ -97,3 +97,61 @@ def test_is_satisfied_for_constraints_between(simple_csp_and_state):
     assert not csp.is_satisfied_for_constraints_between("A", "B", state)
     state["B"].assign(2)
     assert csp.is_satisfied_for_constraints_between("A", "B", state)
+
+
+def test_compile(simple_csp_and_state):
+    csp, state = simple_csp_and_state
+    csp.compile(state)
+    a, b, c = state.id("A"), state.id("B"), state.id("C")
+    assert csp.constraints_for_id(a) == csp.constraints_for("A")
+    assert set(csp.neighbor_ids(a)) == {b, c}
+    assert csp.constraints_between_ids(a, b) == csp.constraints_between("A", "B")
+    assert csp.constraints()[0].scope_ids() == (a, b, c)
+
+
+def test_is_satisfied_for_constraints_between_ids(simple_csp_and_state):
+    csp, state = simple_csp_and_state
+    csp.compile(state)
+    state["A"].assign(1)
+    state["B"].assign(1)
+    assert not csp.is_satisfied_for_constraints_between_ids(
+        state.id("A"), state.id("B"), state
+    )
+    state["B"].assign(2)
+    assert csp.is_satisfied_for_constraints_between_ids(
+        state.id("A"), state.id("B"), state
+    )
+
+
+def test_compile_unknown_variable():
+    delta = DeltaRecord()
+    state = State(delta, [Variable(delta, "A", Domain(delta, {1}))])
+    with pytest.raises(State.KeyError):
+        CSP[int]([AllDifferent({"A", "B"})]).compile(state)
+
+
+class Sum3(Constraint[int]):
+    def is_satisfied(self, state):
+        values = self._values(state)
+        return None in values or sum(v for v in values if v is not None) == 3
+
+
+def test_is_compatible_default(simple_csp_and_state):
+    _, state = simple_csp_and_state
+    csp = CSP[int]([Sum3({"A", "B"})])
+    csp.compile(state)
+    a, b = state.id("A"), state.id("B")
+    assert csp.is_compatible(state, a, 1, b, 2)
+    assert not csp.is_compatible(state, a, 1, b, 1)
+    assert csp.supports(state, a, 2, b, {1, 2, 3}) == {1}
+    assert len(state._delta_record) == 0
+    assert state["A"].value() is None
+
+
+def test_supports_combines_constraints(simple_csp_and_state):
+    _, state = simple_csp_and_state
+    csp = CSP[int]([AllDifferent({"A", "B", "C"}), Sum3({"A", "B"})])
+    csp.compile(state)
+    a, b = state.id("A"), state.id("B")
+    assert csp.supports(state, a, 1, b, {1, 2, 3}) == {2}
+    assert csp.supports(state, a, 3, b, {1, 2, 3}) == set()
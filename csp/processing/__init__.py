@@ -1,2 +1,3 @@
 from .propagator import Propagator as Propagator
+from .cancellation_token import CancellationToken as CancellationToken
 from .search_strategy import SearchStrategy as SearchStrategy
@@ -0,0 +1,18 @@
+from typing import Optional
+
+
+class CancellationToken:
+    """Asks the searches it's given to stop at their next node. It may be
+    cancelled from another thread, and is also cancelled with its parent."""
+
+    def __init__(self, parent: Optional["CancellationToken"] = None) -> None:
+        self._cancelled = False
+        self._parent = parent
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled or (
+            self._parent is not None and self._parent.is_cancelled()
+        )
@@ -0,0 +1,86 @@
+"""Problems shared by the propagator and strategy tests."""
+
+from csp.state import Domain, Variable, State
+from csp.delta import DeltaRecord
+from csp.model import CSP, Constraint
+from csp.model.constraints import AllDifferent
+import itertools
+import random
+import string
+
+
+class LessThan(Constraint[int]):
+    def __init__(self, a: str, b: str) -> None:
+        super().__init__({a, b})
+        self._a = a
+        self._b = b
+
+    def is_satisfied(self, state: State[int]) -> bool:
+        a, b = state[self._a].value(), state[self._b].value()
+        return a is None or b is None or a < b
+
+
+def make(
+    domains: dict[str, set[int]], scopes: list[set[str]]
+) -> tuple[CSP[int], State[int]]:
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, values))
+            for name, values in domains.items()
+        ],
+    )
+    return CSP[int]([AllDifferent(scope) for scope in scopes]), state
+
+
+def trap() -> tuple[CSP[int], State[int]]:
+    # a, z and w can't all differ, but the search only finds out after trying
+    # every combination of the unrelated b variables in between.
+    return make(
+        {"a": {1, 2}}
+        | {f"b{i}": {1, 2, 3} for i in range(4)}
+        | {"z": {1, 2}, "w": {1, 2}},
+        [{"a", "z"}, {"a", "w"}, {"z", "w"}]
+        + [{f"b{i}", f"b{i + 1}"} for i in range(3)],
+    )
+
+
+def random_problem(
+    rng: random.Random,
+    variables: int = 6,
+    values: int = 4,
+    scope_size: tuple[int, int] = (2, 3),
+    constraints: tuple[int, int] = (1, 6),
+    min_domain_size: int = 1,
+) -> tuple[dict[str, set[int]], list[set[str]]]:
+    """Random domains over 1..values and AllDifferent scopes for make, with
+    scope sizes and the number of constraints drawn from the given ranges."""
+    names = string.ascii_lowercase[:variables]
+    domains = {
+        name: set(
+            rng.sample(range(1, values + 1), rng.randint(min_domain_size, values))
+        )
+        for name in names
+    }
+    scopes = [
+        set(rng.sample(names, rng.randint(*scope_size)))
+        for _ in range(rng.randint(*constraints))
+    ]
+    return domains, scopes
+
+
+def brute_force(
+    domains: dict[str, set[int]], scopes: list[set[str]]
+) -> list[dict[str, int]]:
+    """Every solution of the problem make builds from domains and scopes."""
+    return [
+        values
+        for values in (
+            dict(zip(domains, combination))
+            for combination in itertools.product(
+                *(sorted(values) for values in domains.values())
+            )
+        )
+        if all(len({values[n] for n in scope}) == len(scope) for scope in scopes)
+    ]
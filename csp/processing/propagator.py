@@ -1,7 +1,8 @@
-from csp.model import CSP
+from csp.model import CSP, Constraint
 from csp.state import State
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
 
 
 class Propagator[T](ABC):
@@ -9,17 +10,58 @@ class Propagator[T](ABC):
     class Stats:
         domain_prunes: int = 0
         constraint_checks: int = 0
+        arcs_processed: int = 0
+        elapsed_time: float = 0
+        by_propagator: dict[str, "Propagator.Stats"] = field(default_factory=dict)
+        by_rule: dict[str, int] = field(default_factory=dict)
 
         def __add__(self, rhs: "Propagator.Stats") -> "Propagator.Stats":
+            by_propagator = dict(self.by_propagator)
+            for name, stats in rhs.by_propagator.items():
+                by_propagator[name] = (
+                    by_propagator[name] + stats if name in by_propagator else stats
+                )
+            by_rule = dict(self.by_rule)
+            for rule, prunes in rhs.by_rule.items():
+                by_rule[rule] = by_rule.get(rule, 0) + prunes
             return Propagator.Stats(
                 domain_prunes=self.domain_prunes + rhs.domain_prunes,
                 constraint_checks=self.constraint_checks + rhs.constraint_checks,
+                arcs_processed=self.arcs_processed + rhs.arcs_processed,
+                elapsed_time=self.elapsed_time + rhs.elapsed_time,
+                by_propagator=by_propagator,
+                by_rule=by_rule,
             )
 
     @dataclass
     class Result:
         stats: "Propagator.Stats" = field(default_factory=lambda: Propagator.Stats())
         success: bool = True
+        # The constraint whose filtering wiped out a domain, if known.
+        conflict: Optional[Constraint[Any]] = None
+
+    def handles(self, constraint: Constraint[T]) -> bool:
+        """Whether this propagator filters constraint, and so needs to run again
+        when the domains of its variables change."""
+        return True
+
+    def prunes_by_assignment(self) -> bool:
+        """Whether each value propagate_changes prunes is ruled out by the changed
+        assignments together with the other assigned variables of the
+        constraints they share with the pruned variable, whatever the other
+        domains are. Strategies that explain prunes, such as
+        ConflictDirectedBackjumping, can then blame just those assignments."""
+        return False
 
     @abstractmethod
     def propagate(self, csp: CSP[T], state: State[T]) -> "Propagator.Result": ...
+
+    def propagate_changes(
+        self, csp: CSP[T], state: State[T], changed: Iterable[int]
+    ) -> "Propagator.Result":
+        """Propagate a state that was at this propagator's fixpoint until the
+        variables with ids in changed were assigned or had their domains reduced.
+
+        Propagators that can't take advantage of this fall back to propagate.
+        """
+        return self.propagate(csp, state)
@@ -1,3 +1,7 @@
 from .null_propagator import NullPropagator as NullPropagator
 from .simple_propagator import SimplePropagator as SimplePropagator
 from .ac3 import AC3 as AC3
+from .ac3rm import AC3RM as AC3RM
+from .all_different_gac import AllDifferentGAC as AllDifferentGAC
+from .forward_checking import ForwardChecking as ForwardChecking
+from .propagation_engine import PropagationEngine as PropagationEngine
@@ -1,54 +1,87 @@
 from csp.processing import Propagator
 from csp.model import CSP
 from csp.state import State, Variable
-from typing import override
+from typing import Iterable, Optional, override
 
 
 class AC3[T](Propagator[T]):
     @override
     def propagate(self, csp: CSP[T], state: State[T]) -> Propagator.Result:
-        stats = Propagator.Stats()
-        queue = set[tuple[str, str]]()
+        csp.compile(state)
+        queue = set[tuple[int, int]]()
         for var1 in state.variables():
-            for constraint in csp.constraints_for(var1.name):
-                for var2_name in constraint.variables():
-                    queue.add((var1.name, var2_name))
-
-        def is_supported(var: Variable[T], value: T, neighbor: Variable[T]) -> bool:
-            neighbor_value = neighbor.value()
-            neighbor_values: set[T] = (
-                neighbor.domain_values() if neighbor_value is None else {neighbor_value}
-            )
-
-            with var.maintain_state():
-                var.assign(value)
-                with neighbor.maintain_state():
-                    for y in neighbor_values:
-                        neighbor.assign(y)
-                        stats.constraint_checks += 1
-                        if csp.is_satisfied_for_constraints_between(
-                            var.name,
-                            neighbor.name,
-                            state,
-                        ):
-                            return True
-            return False
+            for var2_id in csp.neighbor_ids(var1.id):
+                queue.add((var1.id, var2_id))
+        return self._revise(csp, state, queue)
+
+    @override
+    def propagate_changes(
+        self, csp: CSP[T], state: State[T], changed: Iterable[int]
+    ) -> Propagator.Result:
+        csp.compile(state)
+        queue = set[tuple[int, int]]()
+        for var_id in changed:
+            for neighbor_id in csp.neighbor_ids(var_id):
+                queue.add((neighbor_id, var_id))
+        return self._revise(csp, state, queue)
+
+    def _revise(
+        self, csp: CSP[T], state: State[T], queue: set[tuple[int, int]]
+    ) -> Propagator.Result:
+        stats = Propagator.Stats()
 
         while queue:
-            var_name, neighbor_name = queue.pop()
-            var = state[var_name]
-            neighbor = state[neighbor_name]
+            var_id, neighbor_id = queue.pop()
+            stats.arcs_processed += 1
+            var = state.variable(var_id)
+            neighbor = state.variable(neighbor_id)
 
             if var.is_assigned():
                 continue
 
             for value in list(var.domain_values()):
-                if not is_supported(var, value, neighbor):
+                if not self._is_supported(csp, state, var, value, neighbor, stats):
                     var.remove_value_from_domain(value)
                     stats.domain_prunes += 1
                     if var.domain_size() == 0:
-                        return Propagator.Result(success=False, stats=stats)
-                    for new_var in csp.neighbors(var.name):
-                        queue.add((new_var, var.name))
+                        return Propagator.Result(
+                            success=False,
+                            stats=stats,
+                            conflict=csp.constraints_between_ids(var_id, neighbor_id)[
+                                0
+                            ],
+                        )
+                    for new_var_id in csp.neighbor_ids(var_id):
+                        queue.add((new_var_id, var_id))
 
         return Propagator.Result(success=True, stats=stats)
+
+    def _is_supported(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        var: Variable[T],
+        value: T,
+        neighbor: Variable[T],
+        stats: Propagator.Stats,
+    ) -> bool:
+        return self._find_support(csp, state, var, value, neighbor, stats) is not None
+
+    def _find_support(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        var: Variable[T],
+        value: T,
+        neighbor: Variable[T],
+        stats: Propagator.Stats,
+    ) -> Optional[T]:
+        neighbor_value = neighbor.value()
+        neighbor_values: Iterable[T] = (
+            neighbor.domain if neighbor_value is None else (neighbor_value,)
+        )
+        for y in neighbor_values:
+            stats.constraint_checks += 1
+            if csp.is_compatible(state, var.id, value, neighbor.id, y):
+                return y
+        return None
@@ -44,6 +44,7 @@ def test_propagate_failure_due_to_empty_domain(small_csp_and_state):
 
     assert result.success is False
     assert result.stats.domain_prunes > 0
+    assert result.conflict is csp.constraints()[0]
 
 
 def test_ac3_chain_propagation():
@@ -110,3 +111,38 @@ def test_ac3_symmetric_prune():
     assert result.success is True
     assert a.domain_values() == {2}
     assert result.stats.domain_prunes == 1
+
+
+def test_propagate_changes_matches_full_propagation():
+    def make():
+        delta = DeltaRecord()
+        variables = [Variable(delta, name, Domain(delta, {1, 2, 3})) for name in "ABCD"]
+        state = State(delta, variables)
+        csp = CSP[int](
+            [AllDifferent({"A", "B", "C"}), AllDifferent({"C", "D"})],
+        )
+        return csp, state
+
+    full_csp, full_state = make()
+    incremental_csp, incremental_state = make()
+    propagator = AC3[int]()
+    assert propagator.propagate(incremental_csp, incremental_state).success
+
+    full_state["A"].assign(1)
+    full_state["B"].assign(2)
+    incremental_state["A"].assign(1)
+    incremental_state["B"].assign(2)
+    full = propagator.propagate(full_csp, full_state)
+    incremental = propagator.propagate_changes(
+        incremental_csp,
+        incremental_state,
+        [incremental_state.id("A"), incremental_state.id("B")],
+    )
+
+    assert full.success and incremental.success
+    for name in "ABCD":
+        assert full_state[name].domain_values() == (
+            incremental_state[name].domain_values()
+        )
+    assert incremental_state["D"].domain_values() == {1, 2}
+    assert 0 < incremental.stats.arcs_processed < full.stats.arcs_processed
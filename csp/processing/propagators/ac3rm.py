@@ -0,0 +1,62 @@
+from csp.processing import Propagator
+from csp.processing.propagators.ac3 import AC3
+from csp.model import CSP
+from csp.state import State, Variable
+from typing import Optional, override
+
+
+class AC3RM[T](AC3[T]):
+    """AC3 with residual supports (AC-3rm).
+
+    The last support found for each (variable, value, neighbor) is remembered
+    and re-checked before scanning the neighbor's domain. Residues aren't
+    restored on backtracking: a residue is only trusted after it has been
+    checked against the current state, so stale residues just cost one check.
+    """
+
+    def __init__(self) -> None:
+        self._residues = dict[tuple[int, T, int], T]()
+        self._residue_state: Optional[State[T]] = None
+
+    @override
+    def _is_supported(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        var: Variable[T],
+        value: T,
+        neighbor: Variable[T],
+        stats: Propagator.Stats,
+    ) -> bool:
+        if state is not self._residue_state:
+            self._residues.clear()
+            self._residue_state = state
+        key = (var.id, value, neighbor.id)
+        residue = self._residues.get(key)
+        if residue is not None and self._is_compatible(
+            csp, state, var, value, neighbor, residue, stats
+        ):
+            return True
+        support = self._find_support(csp, state, var, value, neighbor, stats)
+        if support is None:
+            return False
+        self._residues[key] = support
+        return True
+
+    def _is_compatible(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        var: Variable[T],
+        value: T,
+        neighbor: Variable[T],
+        neighbor_value: T,
+        stats: Propagator.Stats,
+    ) -> bool:
+        if neighbor.is_assigned():
+            if neighbor.value() != neighbor_value:
+                return False
+        elif neighbor_value not in neighbor.domain:
+            return False
+        stats.constraint_checks += 1
+        return csp.is_compatible(state, var.id, value, neighbor.id, neighbor_value)
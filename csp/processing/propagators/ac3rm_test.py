@@ -0,0 +1,96 @@
+from csp.processing import SearchStrategy
+from csp.processing.conftest import LessThan
+from csp.processing.propagators import AC3, AC3RM
+from csp.processing.strategies import DepthFirstSearch
+from csp.model import CSP
+from csp.model.constraints import AllDifferent
+from csp.delta import DeltaRecord
+from csp.state import State, Variable, Domain
+
+
+def make_chain():
+    delta = DeltaRecord()
+    variables = [Variable(delta, name, Domain(delta, {1, 2, 3})) for name in "ABCD"]
+    state = State(delta, variables)
+    csp = CSP[int](
+        [
+            AllDifferent({"A", "B"}),
+            AllDifferent({"B", "C"}),
+            AllDifferent({"C", "D"}),
+        ]
+    )
+    return csp, state
+
+
+def test_propagate_success():
+    csp, state = make_chain()
+    state["A"].assign(1)
+
+    result = AC3RM[int]().propagate(csp, state)
+
+    assert result.success
+    assert state["B"].domain_values() == {2, 3}
+    assert result.stats.domain_prunes == 1
+
+
+def test_propagate_failure():
+    csp, state = make_chain()
+    state["A"].assign(1)
+    state["B"].domain.remove_value(2)
+    state["B"].domain.remove_value(3)
+
+    assert not AC3RM[int]().propagate(csp, state).success
+
+
+def test_same_prunes_as_ac3_across_backtracking():
+    ac3_csp, ac3_state = make_chain()
+    ac3rm_csp, ac3rm_state = make_chain()
+    ac3 = AC3[int]()
+    ac3rm = AC3RM[int]()
+    ac3_checks = ac3rm_checks = 0
+
+    def run(csp, state, propagator, assignments):
+        with state.maintain_state():
+            for name, value in assignments.items():
+                state[name].assign(value)
+            result = propagator.propagate(csp, state)
+            assert result.success
+            domains = {name: set(state[name].domain_values()) for name in "ABCD"}
+            return domains, result.stats.constraint_checks
+
+    for assignments in [{"A": 1, "C": 2}, {"A": 2}, {"B": 3, "D": 1}, {"A": 1}]:
+        ac3_domains, checks = run(ac3_csp, ac3_state, ac3, assignments)
+        ac3_checks += checks
+        ac3rm_domains, checks = run(ac3rm_csp, ac3rm_state, ac3rm, assignments)
+        ac3rm_checks += checks
+        assert ac3_domains == ac3rm_domains
+
+    assert ac3rm_checks < ac3_checks
+
+
+def test_residues_save_scans_of_late_supports():
+    # The supports of a < b lie past every value of b up to a, which AC3 scans
+    # again on each revision.
+    def count(propagator: AC3[int]) -> tuple[int, SearchStrategy.Stats]:
+        delta = DeltaRecord()
+        state = State(
+            delta,
+            [
+                Variable(delta, name, Domain(delta, set(range(1, 41))))
+                for name in "ABCD"
+            ],
+        )
+        csp = CSP[int]([LessThan(a, b) for a, b in zip("ABC", "BCD")])
+        stats = SearchStrategy.Stats()
+        strategy = DepthFirstSearch(propagator, least_constraining_values=False)
+        return strategy.count(csp, state, 100, stats), stats
+
+    ac3_count, ac3_stats = count(AC3[int]())
+    ac3rm_count, ac3rm_stats = count(AC3RM[int]())
+
+    assert ac3rm_count == ac3_count == 100
+    assert ac3rm_stats.state_visits == ac3_stats.state_visits
+    assert (
+        ac3rm_stats.propagator_stats.constraint_checks
+        < 0.75 * ac3_stats.propagator_stats.constraint_checks
+    )
@@ -0,0 +1,212 @@
+from csp.processing import Propagator
+from csp.model import CSP, Constraint
+from csp.model.constraints import AllDifferent
+from csp.state import State
+from typing import Iterable, Optional, override
+
+
+class AllDifferentGAC[T](Propagator[T]):
+    """Generalized arc consistency for AllDifferent constraints (Régin).
+
+    Each AllDifferent is filtered by finding a maximum matching between its
+    variables and their values and removing every value that belongs to no
+    maximum matching: values on an alternating path from a free value or in the
+    same strongly connected component as their variable survive, everything
+    else is pruned. This finds pigeonhole deductions such as hidden singles and
+    naked pairs that the pairwise not-equal checks of AC3 miss.
+
+    Matchings are kept per constraint and repaired from the surviving edges on
+    the next call, and propagate_changes only re-filters the constraints on the
+    changed variables. Constraints other than AllDifferent are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._matchings = dict[Constraint[T], dict[int, T]]()
+        self._state: Optional[State[T]] = None
+
+    @override
+    def handles(self, constraint: Constraint[T]) -> bool:
+        return isinstance(constraint, AllDifferent)
+
+    @override
+    def propagate(self, csp: CSP[T], state: State[T]) -> Propagator.Result:
+        self._compile(csp, state)
+        return self._filter(csp, state, csp.constraints())
+
+    @override
+    def propagate_changes(
+        self, csp: CSP[T], state: State[T], changed: Iterable[int]
+    ) -> Propagator.Result:
+        self._compile(csp, state)
+        return self._filter(
+            csp,
+            state,
+            [
+                constraint
+                for var_id in changed
+                for constraint in csp.constraints_for_id(var_id)
+            ],
+        )
+
+    def _compile(self, csp: CSP[T], state: State[T]) -> None:
+        csp.compile(state)
+        if state is not self._state:
+            self._matchings.clear()
+            self._state = state
+
+    def _filter(
+        self, csp: CSP[T], state: State[T], constraints: Iterable[Constraint[T]]
+    ) -> Propagator.Result:
+        stats = Propagator.Stats()
+        queue = dict.fromkeys(c for c in constraints if isinstance(c, AllDifferent))
+        while queue:
+            constraint = next(iter(queue))
+            del queue[constraint]
+            stats.constraint_checks += 1
+            pruned = self._filter_constraint(state, constraint, stats)
+            if pruned is None:
+                return Propagator.Result(
+                    success=False, stats=stats, conflict=constraint
+                )
+            for var_id in pruned:
+                for other in csp.constraints_for_id(var_id):
+                    if other is not constraint and isinstance(other, AllDifferent):
+                        queue[other] = None
+        return Propagator.Result(success=True, stats=stats)
+
+    def _filter_constraint(
+        self, state: State[T], constraint: Constraint[T], stats: Propagator.Stats
+    ) -> Optional[list[int]]:
+        """Prune constraint to GAC, returning the ids of pruned variables, or
+        None if the constraint can't be satisfied."""
+        scope = constraint.scope_ids()
+        domains = dict[int, set[T]]()
+        for var_id in scope:
+            variable = state.variable(var_id)
+            value = variable.value()
+            domains[var_id] = {value} if value is not None else set(variable.domain)
+
+        var_to_value = dict[int, T]()
+        value_to_var = dict[T, int]()
+        for var_id, value in self._matchings.get(constraint, {}).items():
+            if value in domains[var_id] and value not in value_to_var:
+                var_to_value[var_id] = value
+                value_to_var[value] = var_id
+        for var_id in scope:
+            if var_id not in var_to_value and not self._augment(
+                var_id, domains, var_to_value, value_to_var, set()
+            ):
+                return None
+        self._matchings[constraint] = var_to_value
+
+        # Residual graph: vars are nodes 0..n-1 in scope order and values follow.
+        # Matched edges point var -> value, unmatched edges value -> var.
+        var_nodes = {var_id: node for node, var_id in enumerate(scope)}
+        value_nodes = dict[T, int]()
+        for var_id in scope:
+            for value in domains[var_id]:
+                if value not in value_nodes:
+                    value_nodes[value] = len(scope) + len(value_nodes)
+        edges: list[list[int]] = [[] for _ in range(len(scope) + len(value_nodes))]
+        for var_id in scope:
+            matched = var_to_value[var_id]
+            edges[var_nodes[var_id]].append(value_nodes[matched])
+            for value in domains[var_id]:
+                if value != matched:
+                    edges[value_nodes[value]].append(var_nodes[var_id])
+
+        free = [
+            node for value, node in value_nodes.items() if value not in value_to_var
+        ]
+        reachable = set(free)
+        while free:
+            node = free.pop()
+            for next_node in edges[node]:
+                if next_node not in reachable:
+                    reachable.add(next_node)
+                    free.append(next_node)
+        components = self._strongly_connected_components(edges)
+
+        pruned = list[int]()
+        for var_id in scope:
+            variable = state.variable(var_id)
+            if variable.is_assigned():
+                continue
+            var_node = var_nodes[var_id]
+            for value in domains[var_id]:
+                value_node = value_nodes[value]
+                if (
+                    value == var_to_value[var_id]
+                    or value_node in reachable
+                    or components[value_node] == components[var_node]
+                ):
+                    continue
+                variable.remove_value_from_domain(value)
+                stats.domain_prunes += 1
+                if not pruned or pruned[-1] != var_id:
+                    pruned.append(var_id)
+        return pruned
+
+    def _augment(
+        self,
+        var_id: int,
+        domains: dict[int, set[T]],
+        var_to_value: dict[int, T],
+        value_to_var: dict[T, int],
+        visited: set[T],
+    ) -> bool:
+        for value in domains[var_id]:
+            if value in visited:
+                continue
+            visited.add(value)
+            other = value_to_var.get(value)
+            if other is None or self._augment(
+                other, domains, var_to_value, value_to_var, visited
+            ):
+                var_to_value[var_id] = value
+                value_to_var[value] = var_id
+                return True
+        return False
+
+    @staticmethod
+    def _strongly_connected_components(edges: list[list[int]]) -> list[int]:
+        """Iterative Tarjan: the component index of every node."""
+        index = [-1] * len(edges)
+        low = [0] * len(edges)
+        components = [-1] * len(edges)
+        on_stack = [False] * len(edges)
+        stack = list[int]()
+        counter = 0
+        component = 0
+        for root in range(len(edges)):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work[-1]
+                if edge == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                if edge < len(edges[node]):
+                    work[-1] = (node, edge + 1)
+                    next_node = edges[node][edge]
+                    if index[next_node] == -1:
+                        work.append((next_node, 0))
+                    elif on_stack[next_node]:
+                        low[node] = min(low[node], index[next_node])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        components[member] = component
+                        if member == node:
+                            break
+                    component += 1
+        return components
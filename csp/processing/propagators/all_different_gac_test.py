@@ -0,0 +1,109 @@
+from csp.processing.propagators import AllDifferentGAC
+from csp.model import CSP
+from csp.model.constraints import AllDifferent
+from csp.delta import DeltaRecord
+from csp.state import State, Variable, Domain
+import itertools
+import random
+
+
+def make(domains: dict[str, set[int]]) -> tuple[CSP[int], State[int]]:
+    delta = DeltaRecord()
+    state = State(
+        delta,
+        [
+            Variable(delta, name, Domain(delta, values))
+            for name, values in domains.items()
+        ],
+    )
+    return CSP[int]([AllDifferent(set(domains))]), state
+
+
+def test_naked_pair():
+    csp, state = make({"A": {1, 2}, "B": {1, 2}, "C": {1, 2, 3}})
+
+    result = AllDifferentGAC[int]().propagate(csp, state)
+
+    assert result.success
+    assert state["C"].domain_values() == {3}
+    assert result.stats.domain_prunes == 2
+
+
+def test_hidden_single():
+    csp, state = make({"A": {1, 2, 3}, "B": {1, 2}, "C": {1, 2}})
+
+    result = AllDifferentGAC[int]().propagate(csp, state)
+
+    assert result.success
+    assert state["A"].domain_values() == {3}
+
+
+def test_pigeonhole_failure():
+    csp, state = make({"A": {1, 2}, "B": {1, 2}, "C": {1, 2}})
+
+    result = AllDifferentGAC[int]().propagate(csp, state)
+
+    assert not result.success
+    assert result.conflict is csp.constraints()[0]
+
+
+def test_assigned_values():
+    csp, state = make({"A": {1, 2, 3}, "B": {1, 2, 3}, "C": {1, 2, 3}})
+    state["A"].assign(1)
+
+    result = AllDifferentGAC[int]().propagate(csp, state)
+
+    assert result.success
+    assert state["B"].domain_values() == {2, 3}
+    assert state["C"].domain_values() == {2, 3}
+    assert state["A"].domain_values() == {1, 2, 3}
+
+
+def test_propagate_changes_across_constraints():
+    delta = DeltaRecord()
+    state = State(
+        delta,
+        [Variable(delta, name, Domain(delta, {1, 2, 3})) for name in "ABCDE"],
+    )
+    csp = CSP[int]([AllDifferent({"A", "B", "C"}), AllDifferent({"C", "D", "E"})])
+    propagator = AllDifferentGAC[int]()
+    assert propagator.propagate(csp, state).success
+
+    with state.maintain_state():
+        state["A"].assign(1)
+        state["B"].assign(2)
+        result = propagator.propagate_changes(
+            csp, state, [state.id("A"), state.id("B")]
+        )
+        assert result.success
+        assert state["C"].domain_values() == {3}
+        assert state["D"].domain_values() == {1, 2}
+        assert state["E"].domain_values() == {1, 2}
+
+    with state.maintain_state():
+        state["D"].assign(3)
+        result = propagator.propagate_changes(csp, state, [state.id("D")])
+        assert result.success
+        assert state["C"].domain_values() == {1, 2}
+
+
+def test_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(200):
+        names = "ABCDE"[: rng.randint(2, 5)]
+        domains = {
+            name: set(rng.sample(range(1, 6), rng.randint(1, 4))) for name in names
+        }
+        csp, state = make(domains)
+        solutions = [
+            values
+            for values in itertools.product(*(sorted(domains[n]) for n in names))
+            if len(set(values)) == len(values)
+        ]
+
+        result = AllDifferentGAC[int]().propagate(csp, state)
+
+        assert result.success == bool(solutions)
+        if solutions:
+            for i, name in enumerate(names):
+                assert state[name].domain_values() == {s[i] for s in solutions}
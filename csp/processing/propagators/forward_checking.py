@@ -0,0 +1,71 @@
+from csp.processing import Propagator
+from csp.model import CSP
+from csp.state import State
+from typing import Iterable, override
+
+
+class ForwardChecking[T](Propagator[T]):
+    """Prune the values of unassigned neighbors that conflict with an assignment.
+
+    For pairwise not-equal constraints such as AllDifferent that is just the
+    assigned value, so each assignment costs O(degree). Other constraints are
+    checked value by value with Constraint.is_compatible.
+    """
+
+    @override
+    def prunes_by_assignment(self) -> bool:
+        return True
+
+    @override
+    def propagate(self, csp: CSP[T], state: State[T]) -> Propagator.Result:
+        csp.compile(state)
+        if not state.is_valid():
+            return Propagator.Result(success=False)
+        return self.propagate_changes(
+            csp, state, [v.id for v in state.variables() if v.is_assigned()]
+        )
+
+    @override
+    def propagate_changes(
+        self, csp: CSP[T], state: State[T], changed: Iterable[int]
+    ) -> Propagator.Result:
+        csp.compile(state)
+        stats = Propagator.Stats()
+        for var_id in changed:
+            value = state.variable(var_id).value()
+            if value is None:
+                continue
+            for constraint in csp.constraints_for_id(var_id):
+                stats.constraint_checks += 1
+                not_equal = constraint.is_pairwise_not_equal()
+                for neighbor_id in constraint.scope_ids():
+                    if neighbor_id == var_id:
+                        continue
+                    neighbor = state.variable(neighbor_id)
+                    neighbor_value = neighbor.value()
+                    if neighbor_value is not None:
+                        if not constraint.is_compatible(
+                            state, var_id, value, neighbor_id, neighbor_value
+                        ):
+                            return Propagator.Result(
+                                success=False, stats=stats, conflict=constraint
+                            )
+                        continue
+                    if not_equal:
+                        if value not in neighbor.domain:
+                            continue
+                        neighbor.remove_value_from_domain(value)
+                        stats.domain_prunes += 1
+                    else:
+                        domain = neighbor.domain_values()
+                        supported = constraint.supports(
+                            state, var_id, value, neighbor_id, domain
+                        )
+                        for neighbor_value in domain - supported:
+                            neighbor.remove_value_from_domain(neighbor_value)
+                            stats.domain_prunes += 1
+                    if neighbor.domain_size() == 0:
+                        return Propagator.Result(
+                            success=False, stats=stats, conflict=constraint
+                        )
+        return Propagator.Result(success=True, stats=stats)
@@ -0,0 +1,86 @@
+from csp.processing.propagators import ForwardChecking
+from csp.processing.conftest import LessThan
+from csp.model import CSP
+from csp.model.constraints import AllDifferent
+from csp.delta import DeltaRecord
+from csp.state import State, Variable, Domain
+
+
+def make_state(names: str) -> State[int]:
+    delta = DeltaRecord()
+    return State(
+        delta, [Variable(delta, name, Domain(delta, {1, 2, 3})) for name in names]
+    )
+
+
+def test_prunes_assigned_value_from_neighbors():
+    state = make_state("ABCD")
+    csp = CSP[int]([AllDifferent({"A", "B", "C"})])
+    propagator = ForwardChecking[int]()
+    assert propagator.propagate(csp, state).success
+
+    state["A"].assign(1)
+    result = propagator.propagate_changes(csp, state, [state.id("A")])
+
+    assert result.success
+    assert state["B"].domain_values() == {2, 3}
+    assert state["C"].domain_values() == {2, 3}
+    assert state["D"].domain_values() == {1, 2, 3}
+    assert result.stats.domain_prunes == 2
+
+
+def test_propagate_uses_existing_assignments():
+    state = make_state("AB")
+    state["A"].assign(2)
+    csp = CSP[int]([AllDifferent({"A", "B"})])
+
+    result = ForwardChecking[int]().propagate(csp, state)
+
+    assert result.success
+    assert state["B"].domain_values() == {1, 3}
+
+
+def test_wipeout():
+    state = make_state("AB")
+    state["B"].remove_value_from_domain(2)
+    state["B"].remove_value_from_domain(3)
+    state["A"].assign(1)
+    csp = CSP[int]([AllDifferent({"A", "B"})])
+
+    assert not ForwardChecking[int]().propagate(csp, state).success
+
+
+def test_assigned_conflict():
+    state = make_state("AB")
+    state["A"].assign(1)
+    state["B"].assign(1)
+    csp = CSP[int]([AllDifferent({"A", "B"})])
+
+    assert not ForwardChecking[int]().propagate(csp, state).success
+
+
+def test_generic_constraint():
+    state = make_state("AB")
+    csp = CSP[int]([LessThan("A", "B")])
+    csp.compile(state)
+    state["A"].assign(2)
+
+    result = ForwardChecking[int]().propagate_changes(csp, state, [state.id("A")])
+
+    assert result.success
+    assert state["B"].domain_values() == {3}
+
+
+def test_failure_reports_conflict():
+    state = make_state("ABC")
+    constraint = AllDifferent[int]({"B", "C"})
+    csp = CSP[int]([AllDifferent({"A", "B"}), constraint])
+    csp.compile(state)
+    state["B"].remove_value_from_domain(1)
+    state["B"].remove_value_from_domain(2)
+    state["C"].assign(3)
+
+    result = ForwardChecking[int]().propagate_changes(csp, state, [state.id("C")])
+
+    assert not result.success
+    assert result.conflict is constraint
@@ -1,9 +1,15 @@
 from csp.processing import Propagator
-from csp.model import CSP
+from csp.model import CSP, Constraint
 from csp.state import State
 
 
 class NullPropagator[T](Propagator[T]):
+    def handles(self, constraint: Constraint[T]) -> bool:
+        return False
+
+    def prunes_by_assignment(self) -> bool:
+        return True
+
     def propagate(self, csp: CSP[T], state: State[T]) -> Propagator.Result:
         """
         A propagator that performs no propagation.
@@ -0,0 +1,110 @@
+from csp.processing import Propagator
+from csp.model import CSP
+from csp.state import State
+from enum import IntEnum
+from typing import Iterable, Optional, override
+import time
+
+
+class PropagationEngine[T](Propagator[T]):
+    """Run several propagators to a joint fixpoint, cheapest first.
+
+    Each propagator watches the variables of the constraints it handles and is
+    only woken, through propagate_changes, with the watched variables that
+    changed since it last ran. The cheapest woken propagator always runs next,
+    so an expensive propagator only runs once the cheaper ones have stalled.
+    Time and stats of each propagator are reported in Stats.by_propagator.
+    """
+
+    class Cost(IntEnum):
+        CHEAP = 0
+        LINEAR = 1
+        EXPENSIVE = 2
+
+    def __init__(
+        self, propagators: Iterable[tuple[Propagator[T], "PropagationEngine.Cost"]]
+    ) -> None:
+        ordered = sorted(enumerate(propagators), key=lambda p: (p[1][1], p[0]))
+        self._propagators = [propagator for _, (propagator, _) in ordered]
+        self._names = list[str]()
+        for propagator in self._propagators:
+            name = type(propagator).__name__
+            while name in self._names:
+                name += "'"
+            self._names.append(name)
+        self._watched = list[set[int]]()
+        self._csp: Optional[CSP[T]] = None
+        self._state: Optional[State[T]] = None
+
+    def _compile(self, csp: CSP[T], state: State[T]) -> None:
+        csp.compile(state)
+        if csp is self._csp and state is self._state:
+            return
+        self._watched = [
+            {
+                var_id
+                for constraint in csp.constraints()
+                if propagator.handles(constraint)
+                for var_id in constraint.scope_ids()
+            }
+            for propagator in self._propagators
+        ]
+        self._csp = csp
+        self._state = state
+
+    @override
+    def propagate(self, csp: CSP[T], state: State[T]) -> Propagator.Result:
+        self._compile(csp, state)
+        return self._run(csp, state, [None] * len(self._propagators))
+
+    @override
+    def propagate_changes(
+        self, csp: CSP[T], state: State[T], changed: Iterable[int]
+    ) -> Propagator.Result:
+        self._compile(csp, state)
+        changed = set(changed)
+        return self._run(csp, state, [changed & watched for watched in self._watched])
+
+    def _run(
+        self, csp: CSP[T], state: State[T], pending: list[Optional[set[int]]]
+    ) -> Propagator.Result:
+        """Run until no propagator is pending. A pending entry of None asks for a
+        full propagate, a set for propagate_changes with those ids. What each
+        propagator modified is tracked by a reader of the engine's own, so the
+        readers of callers see every change as if there were one propagator."""
+        stats = Propagator.Stats()
+        with state.track_modified_variable_ids() as modified:
+            while True:
+                index = next(
+                    (i for i, ids in enumerate(pending) if ids is None or ids), None
+                )
+                if index is None:
+                    return Propagator.Result(success=True, stats=stats)
+                propagator = self._propagators[index]
+                ids = pending[index]
+                pending[index] = set()
+
+                modified.clear()
+                start = time.perf_counter()
+                if ids is None:
+                    result = propagator.propagate(csp, state)
+                else:
+                    result = propagator.propagate_changes(csp, state, ids)
+                result.stats.elapsed_time += time.perf_counter() - start
+                stats += Propagator.Stats(
+                    domain_prunes=result.stats.domain_prunes,
+                    constraint_checks=result.stats.constraint_checks,
+                    arcs_processed=result.stats.arcs_processed,
+                    elapsed_time=result.stats.elapsed_time,
+                    by_propagator={self._names[index]: result.stats},
+                    by_rule=result.stats.by_rule,
+                )
+                if not result.success:
+                    return Propagator.Result(
+                        success=False, stats=stats, conflict=result.conflict
+                    )
+
+                for other, watched in enumerate(self._watched):
+                    other_pending = pending[other]
+                    if other != index and other_pending is not None:
+                        other_pending.update(modified.ids() & watched)
@@ -0,0 +1,127 @@
+from csp.processing import Propagator
+from csp.processing.propagators import (
+    PropagationEngine,
+    ForwardChecking,
+    AllDifferentGAC,
+)
+from csp.model import CSP
+from csp.model.constraints import AllDifferent
+from csp.delta import DeltaRecord
+from csp.state import State, Variable, Domain
+from typing import Iterable, override
+
+
+class Recorder(Propagator[int]):
+    def __init__(self) -> None:
+        self.calls = list[set[int]]()
+
+    @override
+    def propagate(self, csp: CSP[int], state: State[int]) -> Propagator.Result:
+        self.calls.append(set(range(len(state))))
+        return Propagator.Result()
+
+    @override
+    def propagate_changes(
+        self, csp: CSP[int], state: State[int], changed: Iterable[int]
+    ) -> Propagator.Result:
+        self.calls.append(set(changed))
+        return Propagator.Result()
+
+
+def make() -> tuple[CSP[int], State[int]]:
+    delta = DeltaRecord()
+    state = State(
+        delta,
+        [Variable(delta, name, Domain(delta, {1, 2, 3})) for name in "ABCDE"],
+    )
+    csp = CSP[int]([AllDifferent({"A", "B", "C"}), AllDifferent({"D", "E"})])
+    return csp, state
+
+
+def test_joint_fixpoint():
+    csp, state = make()
+    engine = PropagationEngine[int](
+        [
+            (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+            (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+        ]
+    )
+    assert engine.propagate(csp, state).success
+
+    state["C"].remove_value_from_domain(3)
+    state["A"].assign(3)
+    result = engine.propagate_changes(csp, state, [state.id("A"), state.id("C")])
+
+    assert result.success
+    # ForwardChecking removes 3 from B, GAC then sees the {1, 2} pair on B and C.
+    assert state["B"].domain_values() == {1, 2}
+    assert set(result.stats.by_propagator) == {"ForwardChecking", "AllDifferentGAC"}
+    assert result.stats.by_propagator["ForwardChecking"].domain_prunes == 1
+    assert result.stats.domain_prunes == sum(
+        stats.domain_prunes for stats in result.stats.by_propagator.values()
+    )
+    assert result.stats.elapsed_time > 0
+
+
+def test_wakes_only_on_watched_changes():
+    csp, state = make()
+    recorder = Recorder()
+    engine = PropagationEngine[int](
+        [
+            (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+            (recorder, PropagationEngine.Cost.EXPENSIVE),
+        ]
+    )
+    assert engine.propagate(csp, state).success
+    recorder.calls.clear()
+
+    state["D"].assign(1)
+    assert engine.propagate_changes(csp, state, [state.id("D")]).success
+
+    # The recorder is woken once, with D and the E domain ForwardChecking pruned.
+    assert recorder.calls == [{state.id("D"), state.id("E")}]
+
+
+def test_failure():
+    csp, state = make()
+    engine = PropagationEngine[int]([(AllDifferentGAC(), PropagationEngine.Cost.CHEAP)])
+    state["D"].remove_value_from_domain(3)
+    state["E"].remove_value_from_domain(3)
+    state["D"].assign(1)
+    state["E"].remove_value_from_domain(2)
+
+    result = engine.propagate(csp, state)
+
+    assert not result.success
+    assert "AllDifferentGAC" in result.stats.by_propagator
+
+
+def test_duplicate_names():
+    engine = PropagationEngine[int](
+        [
+            (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+            (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+        ]
+    )
+    csp, state = make()
+    result = engine.propagate(csp, state)
+    assert set(result.stats.by_propagator) <= {"ForwardChecking", "ForwardChecking'"}
+
+
+def test_modified_ids_span_every_propagator():
+    csp, state = make()
+    engine = PropagationEngine[int](
+        [
+            (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+            (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+        ]
+    )
+    assert engine.propagate(csp, state).success
+    modified = state.track_modified_variable_ids()
+
+    state["C"].remove_value_from_domain(3)
+    state["A"].assign(3)
+    assert engine.propagate_changes(csp, state, [state.id("A"), state.id("C")]).success
+
+    # GAC runs last and prunes nothing, but ForwardChecking's prune of B counts.
+    assert modified.ids() == {state.id(name) for name in "ABC"}
@@ -8,13 +8,14 @@ class SimplePropagator[T](Propagator[T]):
     @override
     def propagate(self, csp: CSP[T], state: State[T]) -> Propagator.Result:
         stats = Propagator.Stats()
+        csp.compile(state)
         for variable in state.variables():
             if variable.is_assigned():
                 continue
             for value in variable.domain_values():
                 with variable.maintain_state():
                     variable.assign(value)
-                    constraints = csp.constraints_for(variable.name)
+                    constraints = csp.constraints_for_id(variable.id)
                     stats.constraint_checks += len(constraints)
                     if csp.is_satisfied_for_constraints(state, constraints):
                         continue
@@ -1,8 +1,12 @@
 from csp.model import CSP
 from csp.state import State
-from csp.processing import Propagator
+from csp.processing import CancellationToken, Propagator
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+import asyncio
+import dataclasses
+import time
 
 
 class SearchStrategy[T](ABC):
@@ -12,8 +16,20 @@ class SearchStrategy[T](ABC):
         assignments: int = 0
         propagations: int = 0
         max_depth: int = 0
+        constraint_checks: int = 0
+        constraint_checks_saved: int = 0
         elapsed_time: float = 0
         propagator_stats: Propagator.Stats = field(default_factory=Propagator.Stats)
+        failures: int = 0
+        restarts: int = 0
+        backjumped_levels: int = 0
+        conflicts: int = 0
+        nogoods_learned: int = 0
+        nogood_prunes: int = 0
+        nogood_evictions: int = 0
+        # Weights of the constraints that caused failures, by index in
+        # CSP.constraints(). Weights only grow, so merging keeps the largest.
+        constraint_weights: dict[int, int] = field(default_factory=dict)
 
         def __add__(self, rhs: "SearchStrategy.Stats") -> "SearchStrategy.Stats":
             return SearchStrategy.Stats(
@@ -21,8 +37,26 @@ class SearchStrategy[T](ABC):
                 assignments=self.assignments + rhs.assignments,
                 propagations=self.propagations + rhs.propagations,
                 max_depth=max(self.max_depth, rhs.max_depth),
+                constraint_checks=self.constraint_checks + rhs.constraint_checks,
+                constraint_checks_saved=self.constraint_checks_saved
+                + rhs.constraint_checks_saved,
                 elapsed_time=self.elapsed_time + rhs.elapsed_time,
                 propagator_stats=self.propagator_stats + rhs.propagator_stats,
+                failures=self.failures + rhs.failures,
+                restarts=self.restarts + rhs.restarts,
+                backjumped_levels=self.backjumped_levels + rhs.backjumped_levels,
+                conflicts=self.conflicts + rhs.conflicts,
+                nogoods_learned=self.nogoods_learned + rhs.nogoods_learned,
+                nogood_prunes=self.nogood_prunes + rhs.nogood_prunes,
+                nogood_evictions=self.nogood_evictions + rhs.nogood_evictions,
+                constraint_weights={
+                    index: max(
+                        self.constraint_weights.get(index, 0),
+                        rhs.constraint_weights.get(index, 0),
+                    )
+                    for index in self.constraint_weights.keys()
+                    | rhs.constraint_weights.keys()
+                },
             )
 
     @dataclass
@@ -31,6 +65,119 @@ class SearchStrategy[T](ABC):
             default_factory=lambda: SearchStrategy.Stats()
         )
         success: bool = True
+        # The search stopped at a limit before it could decide success.
+        limit_reached: bool = False
+
+    @dataclass
+    class Limits:
+        """Budgets for a search, which stops with limit_reached, with the state
+        reverted, as soon as one runs out. Nodes are state visits, time is
+        wall-clock seconds and trail is the number of changes on the delta
+        record beyond where the search started."""
+
+        failures: Optional[int] = None
+        nodes: Optional[int] = None
+        propagations: Optional[int] = None
+        time: Optional[float] = None
+        trail: Optional[int] = None
+        cancellation: Optional[CancellationToken] = None
+
+        def exhausted[
+            V
+        ](self, state: State[V], stats: "SearchStrategy.Stats") -> Optional[
+            Callable[[], bool]
+        ]:
+            """A check, starting now, of whether a search counted in stats has
+            run out of budget, or None if there is no budget to run out of."""
+            checks = list[Callable[[], bool]]()
+            if (failures := self.failures) is not None:
+                checks.append(lambda: stats.failures >= failures)
+            if (nodes := self.nodes) is not None:
+                checks.append(lambda: stats.state_visits >= nodes)
+            if (propagations := self.propagations) is not None:
+                checks.append(lambda: stats.propagations >= propagations)
+            if self.time is not None:
+                deadline = time.perf_counter() + self.time
+                checks.append(lambda: time.perf_counter() >= deadline)
+            if (trail := self.trail) is not None:
+                root = state.checkpoint()
+                checks.append(lambda: state.checkpoint() - root >= trail)
+            if self.cancellation is not None:
+                checks.append(self.cancellation.is_cancelled)
+            if not checks:
+                return None
+            if len(checks) == 1:
+                return checks[0]
+            return lambda: any(check() for check in checks)
 
     @abstractmethod
-    def solve(self, csp: CSP[T], state: State[T]) -> "SearchStrategy.Result": ...
+    def solve(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional["SearchStrategy.Limits"] = None,
+    ) -> "SearchStrategy.Result": ...
+
+    def solutions(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        stats: Optional["SearchStrategy.Stats"] = None,
+    ) -> Iterator[tuple[T, ...]]:
+        """Lazily yield every solution, as the values of the variables by id.
+        The state holds each solution while it's being yielded, and is reverted
+        once the iterator is exhausted or closed. The search is counted into
+        stats, if given."""
+        raise NotImplementedError(f"{type(self).__name__} can't enumerate solutions")
+
+    def count(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limit: Optional[int] = None,
+        stats: Optional["SearchStrategy.Stats"] = None,
+    ) -> int:
+        """The number of solutions, counting no further than limit."""
+        found = 0
+        if limit is not None and limit <= 0:
+            return found
+        for _ in self.solutions(csp, state, stats):
+            found += 1
+            if found == limit:
+                break
+        return found
+
+    def is_unique(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        stats: Optional["SearchStrategy.Stats"] = None,
+    ) -> bool:
+        """Whether there is exactly one solution, stopping at the second."""
+        return self.count(csp, state, 2, stats) == 1
+
+    async def solve_async(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional["SearchStrategy.Limits"] = None,
+    ) -> "SearchStrategy.Result":
+        """solve on a thread of the event loop's default executor. Cancelling
+        the task cancels the search, which reverts the state, before raising
+        CancelledError."""
+        if limits is None:
+            limits = SearchStrategy.Limits()
+        cancellation = CancellationToken(limits.cancellation)
+        future = asyncio.get_running_loop().run_in_executor(
+            None,
+            self.solve,
+            csp,
+            state,
+            dataclasses.replace(limits, cancellation=cancellation),
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancellation.cancel()
+            await asyncio.wait([future])
+            raise
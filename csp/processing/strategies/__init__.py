@@ -1 +1,14 @@
 from .depth_first_search import DepthFirstSearch as DepthFirstSearch
+from .restarts import Restarts as Restarts
+from .conflict_directed_backjumping import (
+    ConflictDirectedBackjumping as ConflictDirectedBackjumping,
+)
+from .nogood_learning import (
+    NogoodLearning as NogoodLearning,
+    NogoodStore as NogoodStore,
+)
+from .parallel_search import ParallelSearch as ParallelSearch
+from .portfolio import Portfolio as Portfolio
+from .dancing_links import DancingLinks as DancingLinks
+from .cdcl_solver import CDCLSolver as CDCLSolver
+from .sat_search import SatSearch as SatSearch
@@ -0,0 +1,378 @@
+from csp.processing import SearchStrategy
+from csp.processing.strategies.restarts import luby
+from collections.abc import Iterable
+from typing import Callable, Optional
+import heapq
+
+
+class CDCLSolver:
+    """A conflict-driven clause learning SAT solver.
+
+    Variables are numbered from 1 and literals are DIMACS-style: v or -v.
+    Internally literal v is 2(v-1) and -v is 2(v-1)+1, so negation is ^ 1 and
+    values, watches and the like are flat lists indexed by literal or variable.
+
+    Each clause watches its first two literals and is only visited when one of
+    them becomes false. A conflict is analysed to its first unique implication
+    point, and the learnt clause, minimized by dropping literals implied by
+    the others, backjumps to the second highest level in it. Decisions take
+    the unassigned variable with the highest VSIDS activity, in its last
+    value, which is false at first. Restarts follow the Luby sequence times
+    restart_scale conflicts, and the less active half of the learnt clauses is
+    dropped when there are too many of them.
+
+    The search is counted into the Stats of SearchStrategy: decisions as
+    assignments, conflicts as failures, learnt clauses as nogoods and
+    propagated literals as propagations.
+    """
+
+    class Error(Exception): ...
+
+    _RESCALE = 1e100
+    _CLAUSE_RESCALE = 1e20
+    _CLAUSE_DECAY = 0.999
+
+    def __init__(self, decay: float = 0.95, restart_scale: int = 100) -> None:
+        if not 0 < decay <= 1:
+            raise self.Error(f"decay {decay} must be in (0, 1]")
+        if restart_scale < 1:
+            raise self.Error(f"restart_scale {restart_scale} must be positive")
+        self._decay = decay
+        self._restart_scale = restart_scale
+        # Deleted clauses are None, and dropped from watch lists when visited.
+        self._clauses = list[Optional[list[int]]]()
+        self._clause_activity = list[float]()
+        self._learnts = list[int]()
+        self._max_learnts = 0.0
+        self._watches = list[list[int]]()
+        # 1 if true, -1 if false and 0 if unassigned, by literal.
+        self._values = list[int]()
+        # By variable. A reason is the clause that implied the variable, whose
+        # first literal it is, or -1 for decisions and level 0 units.
+        self._level = list[int]()
+        self._reason = list[int]()
+        self._activity = list[float]()
+        self._phase = list[int]()
+        self._seen = list[bool]()
+        self._increment = 1.0
+        self._clause_increment = 1.0
+        self._heap = list[tuple[float, int]]()
+        self._trail = list[int]()
+        self._trail_lim = list[int]()
+        self._head = 0
+        self._unsatisfiable = False
+        self._model: Optional[list[bool]] = None
+
+    def variables(self) -> int:
+        return len(self._level)
+
+    def new_variable(self) -> int:
+        var = len(self._level)
+        self._watches += [[], []]
+        self._values += [0, 0]
+        self._level.append(0)
+        self._reason.append(-1)
+        self._activity.append(0.0)
+        self._phase.append(1)
+        self._seen.append(False)
+        heapq.heappush(self._heap, (0.0, var))
+        return var + 1
+
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        """Add a clause, returning False if the clauses are now unsatisfiable
+        without search."""
+        if self._unsatisfiable:
+            return False
+        self._model = None
+        self._backtrack(0)
+        values = self._values
+        clause = list[int]()
+        for literal in literals:
+            internal = self._internal(literal)
+            if values[internal] == 1 or internal ^ 1 in clause:
+                return True
+            if values[internal] == 0 and internal not in clause:
+                clause.append(internal)
+        if not clause:
+            self._unsatisfiable = True
+        elif len(clause) == 1:
+            self._assign(clause[0], -1)
+            self._unsatisfiable = self._propagate() != -1
+        else:
+            self._attach(clause)
+        return not self._unsatisfiable
+
+    def solve(
+        self,
+        stats: Optional[SearchStrategy.Stats] = None,
+        exhausted: Optional[Callable[[], bool]] = None,
+    ) -> Optional[bool]:
+        """Whether the clauses are satisfiable, or None if exhausted said to
+        stop first. A satisfying assignment is kept for value."""
+        if stats is None:
+            stats = SearchStrategy.Stats()
+        self._model = None
+        if self._unsatisfiable:
+            return False
+        self._max_learnts = max(self._max_learnts, len(self._clauses) / 3, 1000)
+        stats.state_visits += 1
+        restarts = 0
+        conflicts = 0
+        while True:
+            head = self._head
+            conflict = self._propagate()
+            stats.propagations += self._head - head
+            if conflict != -1:
+                stats.failures += 1
+                conflicts += 1
+                if not self._trail_lim:
+                    self._unsatisfiable = True
+                    return False
+                learnt, level = self._analyze(conflict)
+                stats.backjumped_levels += len(self._trail_lim) - level - 1
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], -1)
+                else:
+                    self._assign(learnt[0], self._attach(learnt, learnt=True))
+                stats.nogoods_learned += 1
+                self._increment /= self._decay
+                self._clause_increment /= self._CLAUSE_DECAY
+                continue
+            if exhausted is not None and exhausted():
+                self._backtrack(0)
+                return None
+            if conflicts >= self._restart_scale * luby(restarts):
+                restarts += 1
+                conflicts = 0
+                stats.restarts += 1
+                self._backtrack(0)
+                self._max_learnts *= 1.1
+            if len(self._learnts) - len(self._trail) >= self._max_learnts:
+                self._reduce()
+            var = self._pick()
+            if var == -1:
+                self._model = [value == 1 for value in self._values[::2]]
+                self._backtrack(0)
+                return True
+            self._trail_lim.append(len(self._trail))
+            stats.state_visits += 1
+            stats.assignments += 1
+            stats.max_depth = max(stats.max_depth, len(self._trail_lim))
+            self._assign(2 * var + self._phase[var], -1)
+
+    def value(self, var: int) -> bool:
+        """The value of var in the assignment found by the last solve."""
+        if self._model is None:
+            raise self.Error("there is no satisfying assignment to read")
+        if not 0 < var <= len(self._model):
+            raise self.Error(f"unknown variable {var}")
+        return self._model[var - 1]
+
+    def _internal(self, literal: int) -> int:
+        var = abs(literal)
+        if not 0 < var <= len(self._level):
+            raise self.Error(f"unknown variable in literal {literal}")
+        return 2 * (var - 1) + (literal < 0)
+
+    def _attach(self, clause: list[int], learnt: bool = False) -> int:
+        index = len(self._clauses)
+        self._clauses.append(clause)
+        self._clause_activity.append(self._clause_increment if learnt else 0.0)
+        if learnt:
+            self._learnts.append(index)
+        self._watches[clause[0]].append(index)
+        self._watches[clause[1]].append(index)
+        return index
+
+    def _assign(self, literal: int, reason: int) -> None:
+        self._values[literal] = 1
+        self._values[literal ^ 1] = -1
+        var = literal >> 1
+        self._level[var] = len(self._trail_lim)
+        self._reason[var] = reason
+        self._trail.append(literal)
+
+    def _backtrack(self, level: int) -> None:
+        if len(self._trail_lim) <= level:
+            return
+        values, phase, activity, heap = (
+            self._values,
+            self._phase,
+            self._activity,
+            self._heap,
+        )
+        start = self._trail_lim[level]
+        for literal in self._trail[start:]:
+            values[literal] = values[literal ^ 1] = 0
+            var = literal >> 1
+            phase[var] = literal & 1
+            heapq.heappush(heap, (-activity[var], var))
+        del self._trail[start:]
+        del self._trail_lim[level:]
+        self._head = start
+        if len(heap) > 4 * len(activity):
+            self._heap = [
+                (-activity[var], var)
+                for var in range(len(activity))
+                if values[2 * var] == 0
+            ]
+            heapq.heapify(self._heap)
+
+    def _propagate(self) -> int:
+        """Propagate the trail to a fixed point, returning the index of a clause
+        with every literal false, or -1."""
+        values, watches, clauses, trail = (
+            self._values,
+            self._watches,
+            self._clauses,
+            self._trail,
+        )
+        while self._head < len(trail):
+            false_literal = trail[self._head] ^ 1
+            self._head += 1
+            watching = watches[false_literal]
+            kept = list[int]()
+            for position, index in enumerate(watching):
+                clause = clauses[index]
+                if clause is None:
+                    continue
+                if clause[0] == false_literal:
+                    clause[0] = clause[1]
+                    clause[1] = false_literal
+                first = clause[0]
+                if values[first] == 1:
+                    kept.append(index)
+                    continue
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    if values[literal] != -1:
+                        clause[1] = literal
+                        clause[k] = false_literal
+                        watches[literal].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if values[first] == -1:
+                        kept += watching[position + 1 :]
+                        watches[false_literal] = kept
+                        self._head = len(trail)
+                        return index
+                    self._assign(first, index)
+            watches[false_literal] = kept
+        return -1
+
+    def _analyze(self, conflict: int) -> tuple[list[int], int]:
+        """The clause learnt from conflict, asserting its first literal, and
+        the level to backjump to, where its second literal was assigned."""
+        clauses, level, reason, seen, trail = (
+            self._clauses,
+            self._level,
+            self._reason,
+            self._seen,
+            self._trail,
+        )
+        current = len(self._trail_lim)
+        learnt = [-1]
+        marked = list[int]()
+        pending = 0
+        index = len(trail) - 1
+        clause_index = conflict
+        literal = -1
+        while True:
+            clause = clauses[clause_index]
+            assert clause is not None
+            self._bump_clause(clause_index)
+            for other in clause if literal == -1 else clause[1:]:
+                var = other >> 1
+                if seen[var] or level[var] == 0:
+                    continue
+                seen[var] = True
+                marked.append(var)
+                self._bump_variable(var)
+                if level[var] == current:
+                    pending += 1
+                else:
+                    learnt.append(other)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause_index = reason[literal >> 1]
+        learnt[0] = literal ^ 1
+
+        minimized = learnt[:1]
+        for other in learnt[1:]:
+            implied_by = reason[other >> 1]
+            implying = clauses[implied_by] if implied_by != -1 else None
+            if implying is None or any(
+                not seen[p >> 1] and level[p >> 1] > 0 for p in implying[1:]
+            ):
+                minimized.append(other)
+        for var in marked:
+            seen[var] = False
+
+        if len(minimized) == 1:
+            return minimized, 0
+        deepest = max(range(1, len(minimized)), key=lambda i: level[minimized[i] >> 1])
+        minimized[1], minimized[deepest] = minimized[deepest], minimized[1]
+        return minimized, level[minimized[1] >> 1]
+
+    def _bump_variable(self, var: int) -> None:
+        activity = self._activity
+        activity[var] += self._increment
+        if activity[var] > self._RESCALE:
+            for other in range(len(activity)):
+                activity[other] /= self._RESCALE
+            self._increment /= self._RESCALE
+            self._heap = [(-activity[other], other) for _, other in self._heap]
+            heapq.heapify(self._heap)
+        if self._values[2 * var] == 0:
+            heapq.heappush(self._heap, (-activity[var], var))
+
+    def _bump_clause(self, index: int) -> None:
+        activity = self._clause_activity
+        activity[index] += self._clause_increment
+        if activity[index] > self._CLAUSE_RESCALE:
+            for other in range(len(activity)):
+                activity[other] /= self._CLAUSE_RESCALE
+            self._clause_increment /= self._CLAUSE_RESCALE
+
+    def _pick(self) -> int:
+        """The unassigned variable with the highest activity, or -1."""
+        heap, values = self._heap, self._values
+        while heap:
+            _, var = heapq.heappop(heap)
+            if values[2 * var] == 0:
+                return var
+        return -1
+
+    def _reduce(self) -> None:
+        """Drop the less active half of the learnt clauses, apart from binary
+        ones and reasons for the current assignment."""
+        clauses, activity, reason, values = (
+            self._clauses,
+            self._clause_activity,
+            self._reason,
+            self._values,
+        )
+
+        def locked(index: int) -> bool:
+            clause = clauses[index]
+            assert clause is not None
+            return len(clause) == 2 or (
+                values[clause[0]] == 1 and reason[clause[0] >> 1] == index
+            )
+
+        self._learnts.sort(key=lambda index: activity[index])
+        kept = list[int]()
+        half = len(self._learnts) // 2
+        for position, index in enumerate(self._learnts):
+            if position < half and not locked(index):
+                clauses[index] = None
+            else:
+                kept.append(index)
+        self._learnts = kept
@@ -0,0 +1,98 @@
+from csp.processing import SearchStrategy
+from csp.processing.strategies import CDCLSolver
+import itertools
+import pytest
+import random
+
+
+def satisfies(solver: CDCLSolver, clauses: list[list[int]]) -> bool:
+    return all(
+        any(solver.value(abs(literal)) == (literal > 0) for literal in clause)
+        for clause in clauses
+    )
+
+
+def test_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(200):
+        variables = rng.randint(1, 8)
+        clauses = [
+            [
+                rng.choice([-1, 1]) * var
+                for var in rng.sample(range(1, variables + 1), min(3, variables))
+            ]
+            for _ in range(rng.randint(1, 40))
+        ]
+        solver = CDCLSolver(restart_scale=1)
+        for _ in range(variables):
+            solver.new_variable()
+        for clause in clauses:
+            solver.add_clause(clause)
+
+        satisfiable = any(
+            all(
+                any(values[abs(literal) - 1] == (literal > 0) for literal in clause)
+                for clause in clauses
+            )
+            for values in itertools.product([False, True], repeat=variables)
+        )
+        assert solver.solve() == satisfiable
+        if satisfiable:
+            assert satisfies(solver, clauses)
+
+
+def pigeonhole(holes: int) -> tuple[CDCLSolver, list[list[int]]]:
+    solver = CDCLSolver()
+    var = [[solver.new_variable() for _ in range(holes)] for _ in range(holes + 1)]
+    clauses = [list(pigeon) for pigeon in var]
+    for hole in range(holes):
+        for first, second in itertools.combinations(range(holes + 1), 2):
+            clauses.append([-var[first][hole], -var[second][hole]])
+    for clause in clauses:
+        solver.add_clause(clause)
+    return solver, clauses
+
+
+def test_learns_and_restarts():
+    solver, _ = pigeonhole(5)
+    stats = SearchStrategy.Stats()
+
+    assert solver.solve(stats) is False
+    assert stats.failures > 0
+    assert stats.nogoods_learned == stats.failures - 1
+    assert stats.restarts > 0
+    assert solver.solve() is False
+
+
+def test_limits():
+    solver, _ = pigeonhole(7)
+    stats = SearchStrategy.Stats()
+
+    assert solver.solve(stats, lambda: stats.failures >= 10) is None
+    assert stats.failures >= 10
+
+
+def test_add_clause():
+    solver = CDCLSolver()
+    a, b = solver.new_variable(), solver.new_variable()
+
+    assert solver.add_clause([a, -a])
+    assert solver.add_clause([a, b])
+    assert solver.add_clause([-a])
+    assert solver.solve()
+    assert not solver.value(a) and solver.value(b)
+    assert not solver.add_clause([-b])
+    assert solver.solve() is False
+
+
+def test_errors():
+    solver = CDCLSolver()
+    a = solver.new_variable()
+    with pytest.raises(CDCLSolver.Error):
+        solver.add_clause([a, 2])
+    with pytest.raises(CDCLSolver.Error):
+        solver.add_clause([0])
+    with pytest.raises(CDCLSolver.Error):
+        solver.value(a)
+    with pytest.raises(CDCLSolver.Error):
+        CDCLSolver(decay=0)
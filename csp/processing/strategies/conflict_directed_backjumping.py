@@ -0,0 +1,268 @@
+from csp.model import CSP, Constraint
+from csp.state import State, Variable
+from csp.processing import SearchStrategy
+from csp.processing.strategies.depth_first_search import DepthFirstSearch
+from dataclasses import dataclass, field
+from typing import (
+    AbstractSet,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    cast,
+    override,
+)
+
+
+class ConflictDirectedBackjumping[T](DepthFirstSearch[T]):
+    """DepthFirstSearch that backjumps to the deepest assignment responsible for
+    a dead end instead of the previous one (FC-CBJ with any propagator).
+
+    Search levels are numbered from 1, one per assignment, and 0 stands for the
+    initial state. Every variable has a reason: the levels whose propagation
+    pruned its domain. After a propagator that prunes by assignment, a prune is
+    blamed on the new assignment and on the other assignments of the
+    non-binary constraints it shares with the pruned variable. For any other
+    propagator, a prune is blamed on the new assignment and on the reasons of
+    all the pruned variable's neighbors. That is coarser but still sound.
+
+    A failed value blames the reasons of the variables of the failing
+    constraint. When a variable runs out of values, its conflict set is all the
+    levels blamed for its failed values plus its own reason. The search jumps
+    to the deepest level in that set and passes the rest of the set on to that
+    level.
+    """
+
+    @dataclass(slots=True)
+    class _Level[V]:
+        variable: Variable[V]
+        values: Iterator[V]
+        checkpoint: Optional[int] = None
+        conflicts: set[int] = field(default_factory=set)
+        # Reasons replaced at this level, to restore when it's retried.
+        saved: dict[int, frozenset[int]] = field(default_factory=dict)
+
+    @dataclass(slots=True, eq=False)
+    class _Search[V](DepthFirstSearch._Search[V]):
+        # The level of each variable, by id, if it's assigned, and its reason.
+        levels: list[int] = field(default_factory=list)
+        reasons: list[frozenset[int]] = field(default_factory=list)
+        # The variables propagation modified since the last assignment.
+        modified: State.Changes = field(init=False)
+
+        @override
+        def close(self) -> None:
+            # Not super(), which slots=True breaks.
+            DepthFirstSearch._Search.close(self)
+            self.modified.close()
+
+    @override
+    def _begin(
+        self, csp: CSP[T], state: State[T], stats: SearchStrategy.Stats
+    ) -> DepthFirstSearch._Search[T]:
+        search = cast(
+            ConflictDirectedBackjumping._Search[T], super()._begin(csp, state, stats)
+        )
+        search.modified = state.track_modified_variable_ids()
+        return search
+
+    @override
+    def _dfs(
+        self,
+        search: DepthFirstSearch._Search[T],
+        exhausted: Optional[Callable[[], bool]],
+        pause_every: Optional[int],
+    ) -> Generator[bool, None, Optional[bool]]:
+        search = cast(ConflictDirectedBackjumping._Search[T], search)
+        state, stats = search.state, search.stats
+        branch = self._visit(search, 0)
+        if branch is True:
+            yield True
+        if branch is False:
+            stats.failures += 1
+        if isinstance(branch, bool):
+            return False
+        search.levels = [0] * len(state)
+        search.reasons = [frozenset[int]()] * len(state)
+        stack = [self._Level[T](branch, self._ordered_values(search, branch))]
+        found = False
+        while stack:
+            level = len(stack)
+            frame = stack[-1]
+            if frame.checkpoint is not None:
+                state.revert_to(frame.checkpoint)
+                self._restore(search, frame)
+            value = next(frame.values, self._UNCHECKED)
+            if value is self._UNCHECKED:
+                conflicts = frame.conflicts | search.reasons[frame.variable.id]
+                conflicts.discard(level)
+                target = max(conflicts, default=0)
+                if target == 0:
+                    return False
+                # Past a solution, conflict sets also hold levels that only
+                # led to it, so they no longer mean those levels can't hold.
+                if not found:
+                    self._learn(search, stack, conflicts)
+                stats.backjumped_levels += level - 1 - target
+                for popped in reversed(stack[target:-1]):
+                    self._restore(search, popped)
+                del stack[target:]
+                conflicts.discard(target)
+                stack[-1].conflicts |= conflicts
+                continue
+
+            if exhausted is not None and exhausted():
+                return None
+            if pause_every is not None and stats.assignments % pause_every == 0:
+                yield False
+            variable = frame.variable
+            frame.checkpoint = state.checkpoint()
+            variable.assign(cast(T, value))
+            search.levels[variable.id] = level
+            stats.assignments += 1
+
+            culprits = self._propagate_assignment(search, frame, level)
+            if culprits is None:
+                stats.state_visits += 1
+                if level > stats.max_depth:
+                    stats.max_depth = level
+                if not state.is_valid():
+                    culprits = self._blame_wipeouts(search, level)
+                elif (violated := self._violated_constraint(search)) is not None:
+                    culprits = self._blame(search, violated, level)
+                elif state.is_complete():
+                    found = True
+                    yield True  # <- the caller may stop here, keeping the solution
+                    # Every level led here, so none can be jumped over.
+                    frame.conflicts.update(range(1, level))
+                    continue
+            if culprits is not None:
+                stats.failures += 1
+                culprits.discard(level)
+                frame.conflicts |= culprits
+                continue
+
+            branch = self._select_variable(search)
+            stack.append(self._Level[T](branch, self._ordered_values(search, branch)))
+        return False
+
+    def _propagate_assignment(
+        self,
+        search: "ConflictDirectedBackjumping._Search[T]",
+        frame: "ConflictDirectedBackjumping._Level[T]",
+        level: int,
+    ) -> Optional[set[int]]:
+        """Propagate the assignment at level and explain its prunes, returning
+        the levels to blame if propagation failed."""
+        csp, state, stats = search.csp, search.state, search.stats
+        search.modified.clear()
+        result = self._propagator.propagate_changes(csp, state, (frame.variable.id,))
+        stats.propagations += 1
+        stats.propagator_stats += result.stats
+        self._explain_prunes(
+            search, frame, level, self._propagator.prunes_by_assignment()
+        )
+        if not result.success:
+            self._bump(search, result.conflict)
+            return self._blame(search, result.conflict, level)
+        return None
+
+    def _learn(
+        self,
+        search: "ConflictDirectedBackjumping._Search[T]",
+        stack: list["ConflictDirectedBackjumping._Level[T]"],
+        conflicts: set[int],
+    ) -> None:
+        """Called at a dead end, before jumping back, with the levels whose
+        assignments can't all hold together."""
+
+    def _restore(
+        self,
+        search: "ConflictDirectedBackjumping._Search[T]",
+        frame: "ConflictDirectedBackjumping._Level[T]",
+    ) -> None:
+        for var_id, reason in frame.saved.items():
+            search.reasons[var_id] = reason
+        frame.saved.clear()
+
+    def _explain(
+        self, search: "ConflictDirectedBackjumping._Search[T]", var_id: int
+    ) -> AbstractSet[int]:
+        """The levels that fixed the current domain of a variable: its own level
+        if assigned, its reason otherwise."""
+        if search.state.variable(var_id).is_assigned():
+            return {search.levels[var_id]}
+        return search.reasons[var_id]
+
+    def _set_reason(
+        self,
+        search: "ConflictDirectedBackjumping._Search[T]",
+        frame: "ConflictDirectedBackjumping._Level[T]",
+        var_id: int,
+        levels: Iterable[int],
+    ) -> bool:
+        reason = search.reasons[var_id]
+        if reason.issuperset(levels):
+            return False
+        frame.saved.setdefault(var_id, reason)
+        search.reasons[var_id] = reason.union(levels)
+        return True
+
+    def _explain_prunes(
+        self,
+        search: "ConflictDirectedBackjumping._Search[T]",
+        frame: "ConflictDirectedBackjumping._Level[T]",
+        level: int,
+        by_assignment: bool,
+    ) -> None:
+        """Add level, and whatever else the prunes may have depended on, to the
+        reasons of the variables modified since the last clear. by_assignment
+        says they were pruned by the assignment at level, as in
+        Propagator.prunes_by_assignment."""
+        csp, state = search.csp, search.state
+        var_id = frame.variable.id
+        modified = [other for other in search.modified.ids() if other != var_id]
+        if by_assignment:
+            for other in modified:
+                levels = {level}
+                for constraint in csp.constraints_between_ids(var_id, other):
+                    if not constraint.is_pairwise_not_equal():
+                        for scope_id in constraint.scope_ids():
+                            if state.variable(scope_id).is_assigned():
+                                levels.add(search.levels[scope_id])
+                self._set_reason(search, frame, other, levels)
+            return
+        changed = True
+        while changed:
+            changed = False
+            for other in modified:
+                levels = {level}
+                for neighbor_id in csp.neighbor_ids(other):
+                    levels.update(self._explain(search, neighbor_id))
+                changed |= self._set_reason(search, frame, other, levels)
+
+    def _blame(
+        self,
+        search: "ConflictDirectedBackjumping._Search[T]",
+        constraint: Optional[Constraint[T]],
+        level: int,
+    ) -> set[int]:
+        """The levels responsible for constraint failing, or every level if the
+        failing constraint isn't known."""
+        if constraint is None:
+            return set(range(level + 1))
+        culprits = {level}
+        for var_id in constraint.scope_ids():
+            culprits.update(self._explain(search, var_id))
+        return culprits
+
+    def _blame_wipeouts(
+        self, search: "ConflictDirectedBackjumping._Search[T]", level: int
+    ) -> set[int]:
+        state = search.state
+        culprits = {level}
+        for var_id in search.modified.ids():
+            if state.variable(var_id).domain_size() == 0:
+                culprits.update(search.reasons[var_id])
+        return culprits
@@ -0,0 +1,142 @@
+from csp.games import Sudoku, SudokuPropagator
+from csp.processing import Propagator, SearchStrategy
+from csp.processing.strategies import (
+    ConflictDirectedBackjumping,
+    DepthFirstSearch,
+    NogoodLearning,
+)
+from csp.processing.propagators import (
+    NullPropagator,
+    ForwardChecking,
+    AC3,
+    AllDifferentGAC,
+    PropagationEngine,
+)
+from csp.processing.conftest import brute_force, make, random_problem, trap
+import pytest
+import random
+
+
+@pytest.mark.parametrize(
+    "propagator",
+    [NullPropagator(), ForwardChecking()],
+    ids=type,
+)
+def test_backjumps_over_unrelated_levels(propagator: Propagator[int]):
+    def solve(strategy: SearchStrategy[int]) -> SearchStrategy.Result:
+        csp, state = trap()
+        return strategy.solve(csp, state)
+
+    options = dict(minimum_remaining_values=False, least_constraining_values=False)
+    cbj = solve(ConflictDirectedBackjumping(propagator, **options))
+    dfs = solve(DepthFirstSearch(propagator, **options))
+
+    assert not cbj.success and not dfs.success
+    assert cbj.stats.backjumped_levels > 0
+    assert cbj.stats.state_visits < dfs.stats.state_visits
+
+
+@pytest.mark.parametrize(
+    "propagator",
+    [
+        NullPropagator(),
+        ForwardChecking(),
+        AC3(),
+        AllDifferentGAC(),
+        PropagationEngine(
+            [
+                (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+                (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+            ]
+        ),
+    ],
+    ids=type,
+)
+def test_matches_brute_force(propagator: Propagator[int]):
+    rng = random.Random(0)
+    for _ in range(100):
+        domains, scopes = random_problem(rng)
+        csp, state = make(domains, scopes)
+
+        result = ConflictDirectedBackjumping(propagator).solve(csp, state)
+
+        satisfiable = bool(brute_force(domains, scopes))
+        assert result.success == satisfiable
+        if result.success:
+            assert csp.is_satisfied(state)
+            assert all(variable.is_assigned() for variable in state.variables())
+
+
+@pytest.mark.parametrize(
+    "propagator",
+    [
+        NullPropagator(),
+        ForwardChecking(),
+        AllDifferentGAC(),
+        PropagationEngine(
+            [
+                (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+                (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+            ]
+        ),
+    ],
+    ids=type,
+)
+def test_counts_match_brute_force(propagator: Propagator[int]):
+    rng = random.Random(1)
+    for _ in range(50):
+        domains, scopes = random_problem(rng, variables=5, constraints=(1, 5))
+        expected = len(brute_force(domains, scopes))
+        for strategy in [
+            ConflictDirectedBackjumping[int](propagator),
+            NogoodLearning[int](propagator),
+        ]:
+            csp, state = make(domains, scopes)
+            assert strategy.count(csp, state) == expected
+
+
+def test_counts_with_a_propagation_engine():
+    # Prunes by ForwardChecking must keep their reasons after GAC runs on them.
+    domains = {
+        "a": {2, 4},
+        "b": {1, 2, 3, 4},
+        "c": {1, 2, 3, 4},
+        "d": {1, 4},
+        "e": {1, 3, 4},
+    }
+    scopes = [
+        {"c", "d"},
+        {"b", "e"},
+        {"c", "d", "e"},
+        {"a", "d"},
+        {"a", "b", "c"},
+        {"b", "d"},
+    ]
+    engine = PropagationEngine[int](
+        [
+            (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+            (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+        ]
+    )
+    csp, state = make(domains, scopes)
+
+    assert ConflictDirectedBackjumping[int](engine).count(csp, state) == 2
+
+
+def test_solves_sudoku():
+    puzzle = Sudoku.from_str(
+        """
+        8 . . . . . . . .
+        . . 3 6 . . . . .
+        . 7 . . 9 . 2 . .
+        . 5 . . . 7 . . .
+        . . . . 4 5 7 . .
+        . . . 1 . . . 3 .
+        . . 1 . . . . 6 8
+        . . 8 5 . . . 1 .
+        . 9 . . . . 4 . .
+        """
+    )
+    for propagator in [AllDifferentGAC[int](), SudokuPropagator()]:
+        solution, _ = puzzle.solve(ConflictDirectedBackjumping(propagator))
+        assert solution.satisfies_puzzle(puzzle)
@@ -0,0 +1,268 @@
+from csp.model import CSP
+from csp.model.constraints import AllDifferent
+from csp.state import State
+from csp.processing import SearchStrategy
+from collections.abc import Sequence
+from typing import Generator, Optional, cast
+import time
+
+
+class _Matrix:
+    """A sparse 0/1 matrix as circular doubly linked lists of its ones, kept in
+    flat lists indexed by node. Node 0 is the root of the list of primary
+    columns, nodes 1 to columns are the column headers, and the rest are the
+    ones, each row's nodes contiguous. A secondary column's header is linked
+    to itself, so it's never chosen, but its rows still exclude each other."""
+
+    def __init__(self, primary: Sequence[bool]) -> None:
+        count = len(primary) + 1
+        self.left = list(range(count))
+        self.right = list(range(count))
+        self.up = list(range(count))
+        self.down = list(range(count))
+        self.column = list(range(count))
+        self.size = [0] * count
+        self.row = [-1] * count
+        for column, is_primary in enumerate(primary, 1):
+            if is_primary:
+                self.left[column] = self.left[0]
+                self.right[column] = 0
+                self.right[self.left[0]] = column
+                self.left[0] = column
+
+    def add_row(self, row: int, columns: Sequence[int]) -> None:
+        first = len(self.column)
+        last = first + len(columns) - 1
+        for node, column in enumerate(columns, first):
+            self.left.append(node - 1 if node > first else last)
+            self.right.append(node + 1 if node < last else first)
+            self.up.append(self.up[column])
+            self.down.append(column)
+            self.down[self.up[column]] = node
+            self.up[column] = node
+            self.column.append(column)
+            self.row.append(row)
+            self.size[column] += 1
+
+    def smallest_column(self) -> int:
+        """The primary column with the fewest rows, or 0 if none is left."""
+        right, size = self.right, self.size
+        best = right[0]
+        column = right[best]
+        while column != 0 and size[best] > 1:
+            if size[column] < size[best]:
+                best = column
+            column = right[column]
+        return best
+
+    def cover(self, column: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        size, columns = self.size, self.column
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+        i = down[column]
+        while i != column:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[columns[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, column: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        size, columns = self.size, self.column
+        i = up[column]
+        while i != column:
+            j = left[i]
+            while j != i:
+                size[columns[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[column]] = column
+        left[right[column]] = column
+
+    def select(self, node: int) -> None:
+        """Cover the other columns of node's row, after its own column."""
+        j = self.right[node]
+        while j != node:
+            self.cover(self.column[j])
+            j = self.right[j]
+
+    def unselect(self, node: int) -> None:
+        j = self.left[node]
+        while j != node:
+            self.uncover(self.column[j])
+            j = self.left[j]
+
+
+class DancingLinks[T](SearchStrategy[T]):
+    """Knuth's Algorithm X with dancing links, for CSPs made only of AllDifferent
+    constraints, such as Sudoku.
+
+    Every (variable, value) candidate is a row of an exact cover matrix, with a
+    one in its variable's column and in the column for the value of each
+    constraint on the variable. A constraint with as many candidate values as
+    variables must use every value once, so its columns are primary, and must
+    be covered. Otherwise they're secondary, and covered at most once. The
+    search branches on the primary column with the fewest rows left, so on the
+    cell, or the place of a value in a row, column or box of a Sudoku, with
+    the fewest options.
+
+    The state isn't changed during the search, only assigned each solution.
+    Limits on the trail don't apply.
+    """
+
+    class Error(Exception): ...
+
+    def solve(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
+        start = time.perf_counter()
+        stats = SearchStrategy.Stats()
+        search = self._search(csp, state, stats, limits)
+        try:
+            self._assign(state, next(search))
+            success: Optional[bool] = True
+        except StopIteration as stop:
+            success = stop.value
+        finally:
+            search.close()
+        stats.elapsed_time = time.perf_counter() - start
+        return SearchStrategy.Result(
+            success=success is True, stats=stats, limit_reached=success is None
+        )
+
+    def solutions(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        stats: Optional[SearchStrategy.Stats] = None,
+    ) -> Generator[tuple[T, ...], None, None]:
+        if stats is None:
+            stats = SearchStrategy.Stats()
+        root = state.checkpoint()
+        search = self._search(csp, state, stats, None)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    solution = next(search)
+                except StopIteration:
+                    return
+                finally:
+                    stats.elapsed_time += time.perf_counter() - start
+                self._assign(state, solution)
+                yield tuple(cast(T, variable.value()) for variable in state.variables())
+                state.revert_to(root)
+        finally:
+            search.close()
+            state.revert_to(root)
+
+    def _assign(self, state: State[T], solution: Sequence[tuple[int, T]]) -> None:
+        for var_id, value in solution:
+            variable = state.variable(var_id)
+            if not variable.is_assigned():
+                variable.assign(value)
+
+    def _build(
+        self, csp: CSP[T], state: State[T]
+    ) -> Optional[tuple[_Matrix, list[tuple[int, T]]]]:
+        """The exact cover matrix of state and the candidate of each row, or
+        None if a variable or constraint has too few candidates to cover."""
+        csp.compile(state)
+        candidates = list[list[T]]()
+        for variable in state.variables():
+            value = variable.value()
+            candidates.append([value] if value is not None else list(variable.domain))
+            if not candidates[-1]:
+                return None
+
+        primary = [True] * len(candidates)
+        value_columns = dict[int, dict[T, int]]()
+        for constraint in csp.constraints():
+            if not isinstance(constraint, AllDifferent):
+                raise self.Error(f"{type(constraint).__name__} isn't AllDifferent")
+            scope = constraint.scope_ids()
+            columns = dict[T, int]()
+            for var_id in scope:
+                columns.update(dict.fromkeys(candidates[var_id], 0))
+            if len(columns) < len(scope):
+                return None
+            for value in columns:
+                primary.append(len(columns) == len(scope))
+                columns[value] = len(primary)
+            value_columns[id(constraint)] = columns
+
+        matrix = _Matrix(primary)
+        rows = list[tuple[int, T]]()
+        for var_id, var_candidates in enumerate(candidates):
+            constraint_columns = [
+                value_columns[id(constraint)]
+                for constraint in csp.constraints_for_id(var_id)
+            ]
+            for value in var_candidates:
+                matrix.add_row(
+                    len(rows),
+                    [var_id + 1] + [columns[value] for columns in constraint_columns],
+                )
+                rows.append((var_id, value))
+        return matrix, rows
+
+    def _search(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        stats: SearchStrategy.Stats,
+        limits: Optional[SearchStrategy.Limits],
+    ) -> Generator[list[tuple[int, T]], None, Optional[bool]]:
+        """Yield the candidates of each solution, and return False once there
+        are no more, or None if the limits were reached first."""
+        exhausted = limits.exhausted(state, stats) if limits is not None else None
+        built = self._build(csp, state)
+        if built is None:
+            stats.failures += 1
+            return False
+        matrix, rows = built
+        down = matrix.down
+        # The chosen node at each level, which is a row of the column there.
+        nodes = list[int]()
+        columns = list[int]()
+        while True:
+            stats.state_visits += 1
+            stats.max_depth = max(stats.max_depth, len(nodes))
+            column = matrix.smallest_column()
+            if column == 0:
+                yield [rows[matrix.row[node]] for node in nodes]
+            elif matrix.size[column] == 0:
+                stats.failures += 1
+            else:
+                if exhausted is not None and exhausted():
+                    return None
+                matrix.cover(column)
+                columns.append(column)
+                nodes.append(down[column])
+                matrix.select(nodes[-1])
+                stats.assignments += 1
+                continue
+            # Backtrack to the deepest level with another row to try.
+            while True:
+                if not nodes:
+                    return False
+                node = nodes.pop()
+                matrix.unselect(node)
+                node = down[node]
+                if node != columns[-1]:
+                    break
+                matrix.uncover(columns.pop())
+            if exhausted is not None and exhausted():
+                return None
+            nodes.append(node)
+            matrix.select(node)
+            stats.assignments += 1
@@ -0,0 +1,101 @@
+from csp.games import Sudoku
+from csp.processing import CancellationToken, SearchStrategy
+from csp.processing.strategies import DancingLinks
+from csp.processing.conftest import LessThan, brute_force, make, random_problem, trap
+from csp.model import CSP
+import itertools
+import pytest
+import random
+
+hard = Sudoku.from_str(
+    """
+    8 . . . . . . . .
+    . . 3 6 . . . . .
+    . 7 . . 9 . 2 . .
+    . 5 . . . 7 . . .
+    . . . . 4 5 7 . .
+    . . . 1 . . . 3 .
+    . . 1 . . . . 6 8
+    . . 8 5 . . . 1 .
+    . 9 . . . . 4 . .
+    """
+)
+
+
+def test_solves_sudoku():
+    solution, stats = hard.solve(DancingLinks[int]())
+
+    assert solution.satisfies_puzzle(hard)
+    assert stats.state_visits == stats.assignments + 1
+    assert stats.max_depth == 81
+
+
+def test_solves_empty_16x16():
+    solution, _ = Sudoku(16, {}).solve(DancingLinks[int]())
+
+    assert len(solution) == 16 * 16
+
+
+def test_unsatisfiable_givens():
+    csp, state = Sudoku(4, {(0, 0): 1, (0, 3): 1}).to_state()
+    result = DancingLinks[int]().solve(csp, state)
+
+    assert not result.success and not result.limit_reached
+
+
+def test_unsatisfiable():
+    csp, state = trap()
+    result = DancingLinks[int]().solve(csp, state)
+
+    assert not result.success
+    assert not any(variable.is_assigned() for variable in state.variables())
+
+
+def test_counts_match_brute_force():
+    rng = random.Random(2)
+    for _ in range(100):
+        domains, scopes = random_problem(
+            rng, variables=5, scope_size=(2, 4), constraints=(1, 5)
+        )
+        expected = len(brute_force(domains, scopes))
+        csp, state = make(domains, scopes)
+        assert DancingLinks[int]().count(csp, state) == expected
+
+
+def test_solutions_holds_each_solution_in_state():
+    csp, state = make({name: {1, 2, 3} for name in "abc"}, [{"a", "b", "c"}])
+    solutions = list[tuple[int, ...]]()
+    for solution in DancingLinks[int]().solutions(csp, state):
+        assert csp.is_satisfied(state)
+        assert tuple(variable.value() for variable in state.variables()) == solution
+        solutions.append(solution)
+
+    assert sorted(solutions) == sorted(itertools.permutations((1, 2, 3)))
+    assert not any(variable.is_assigned() for variable in state.variables())
+
+
+def test_count_and_is_unique():
+    strategy = DancingLinks[int]()
+
+    assert strategy.is_unique(*hard.to_state())
+    assert strategy.count(*Sudoku(4, {}).to_state()) == 288
+    assert strategy.count(*Sudoku(4, {}).to_state(), limit=10) == 10
+
+
+def test_limits():
+    csp, state = hard.to_state()
+    cancellation = CancellationToken()
+    cancellation.cancel()
+
+    result = DancingLinks[int]().solve(
+        csp, state, SearchStrategy.Limits(cancellation=cancellation)
+    )
+
+    assert not result.success and result.limit_reached
+    assert not state.is_complete()
+
+
+def test_only_all_different():
+    _, state = make({"a": {1, 2}, "b": {1, 2}}, [])
+    with pytest.raises(DancingLinks.Error):
+        DancingLinks[int]().solve(CSP[int]([LessThan("a", "b")]), state)
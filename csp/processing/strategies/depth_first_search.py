@@ -1,102 +1,440 @@
-from csp.model import CSP
+from csp.model import CSP, Constraint
 from csp.state import State, Variable
 from csp.processing import Propagator, SearchStrategy
+from csp.processing.propagators import ForwardChecking
+from dataclasses import dataclass, field
+from typing import Callable, Collection, Generator, Iterator, Optional, cast
+import asyncio
+import random
 import time
 
 
 class DepthFirstSearch[T](SearchStrategy[T]):
+    class Error(Exception): ...
+
+    _UNCHECKED = object()
+
     def __init__(
         self,
-        propagator: Propagator[T],
+        propagator: Optional[Propagator[T]] = None,
         minimum_remaining_values: bool = True,
         least_constraining_values: bool = True,
+        fast_least_constraining_values: bool = False,
+        weighted_degree: bool = False,
+        seed: Optional[int] = None,
     ) -> None:
-        self._propagator = propagator
+        self._propagator: Propagator[T] = (
+            propagator if propagator is not None else ForwardChecking()
+        )
         self._mrv = minimum_remaining_values
         self._lcv = least_constraining_values
+        self._fast_lcv = fast_least_constraining_values
+        self._wdeg = weighted_degree
+        self._weights = dict[Constraint[T], int]()
+        self._weights_csp: Optional[CSP[T]] = None
+        self.seed(seed)
+
+    def propagator(self) -> Propagator[T]:
+        return self._propagator
+
+    def seed(self, seed: Optional[int]) -> None:
+        """Break ties in variable and value selection at random from seed, or
+        deterministically by id and domain order if seed is None."""
+        self._random = random.Random(seed) if seed is not None else None
 
-    def solve(self, csp: CSP[T], state: State[T]) -> SearchStrategy.Result:
+    def solve(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
         start = time.perf_counter()
         stats = SearchStrategy.Stats()
-        result = self._propagator.propagate(csp, state)
-        stats.propagations += 1
-        stats.propagator_stats += result.stats
-        if not result.success:
-            return SearchStrategy.Result(success=False, stats=stats)
-        success = self._dfs(csp, state, stats, 0)
+        search = self._search(csp, state, stats, limits)
+        try:
+            next(search)
+            success: Optional[bool] = True
+        except StopIteration as stop:
+            success = stop.value
+        # Closing at a solution leaves it in the state.
+        search.close()
         stats.elapsed_time = time.perf_counter() - start
-        return SearchStrategy.Result(success=success, stats=stats)
+        return SearchStrategy.Result(
+            success=success is True, stats=stats, limit_reached=success is None
+        )
 
-    def _dfs(
+    async def solve_async(
         self,
         csp: CSP[T],
         state: State[T],
-        stats: SearchStrategy.Stats,
-        depth: int,
-    ) -> bool:
-        stats.state_visits += 1
-        stats.max_depth = max(stats.max_depth, depth)
+        limits: Optional[SearchStrategy.Limits] = None,
+        pause_every: int = 10,
+    ) -> SearchStrategy.Result:
+        """solve on the event loop itself, pausing for other tasks every
+        pause_every assignments. Cancelling the task reverts the state before
+        raising CancelledError. elapsed_time only counts time spent searching."""
+        if pause_every < 1:
+            raise self.Error(f"pause_every {pause_every} must be positive")
+        stats = SearchStrategy.Stats()
+        root = state.checkpoint()
+        search = self._search(csp, state, stats, limits, pause_every)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    if next(search):
+                        success: Optional[bool] = True
+                        break
+                except StopIteration as stop:
+                    success = stop.value
+                    break
+                finally:
+                    stats.elapsed_time += time.perf_counter() - start
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            search.close()
+            state.revert_to(root)
+            raise
+        search.close()
+        return SearchStrategy.Result(
+            success=success is True, stats=stats, limit_reached=success is None
+        )
 
-        # values = {name: var.value() for name, var in state.items() if var.is_assigned()}
-        # print(f"dfs: depth = {depth} stats = {stats} values = {values}")
+    def solutions(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        stats: Optional[SearchStrategy.Stats] = None,
+    ) -> Generator[tuple[T, ...], None, None]:
+        if stats is None:
+            stats = SearchStrategy.Stats()
+        root = state.checkpoint()
+        search = self._search(csp, state, stats, None)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    next(search)
+                except StopIteration:
+                    return
+                finally:
+                    stats.elapsed_time += time.perf_counter() - start
+                yield tuple(cast(T, variable.value()) for variable in state.variables())
+        finally:
+            search.close()
+            state.revert_to(root)
 
-        if not state.is_valid():
-            return False
+    def _search(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        stats: SearchStrategy.Stats,
+        limits: Optional[SearchStrategy.Limits],
+        pause_every: Optional[int] = None,
+    ) -> Generator[bool, None, Optional[bool]]:
+        root = state.checkpoint()
+        exhausted = limits.exhausted(state, stats) if limits is not None else None
+        search = self._begin(csp, state, stats)
+        try:
+            result = self._propagator.propagate(csp, state)
+            stats.propagations += 1
+            stats.propagator_stats += result.stats
+            if not result.success:
+                stats.failures += 1
+                self._bump(search, result.conflict)
+                return False
+            success = yield from self._dfs(search, exhausted, pause_every)
+            if success is None:
+                state.revert_to(root)
+            return success
+        finally:
+            search.close()
 
-        if not csp.is_satisfied(state):
-            return False
+    @dataclass(slots=True, eq=False)
+    class _Search[V]:
+        """Everything a search keeps of its own, apart from the strategy, so that
+        searches interleaved on one strategy, like two solutions generators,
+        don't overwrite each other's."""
 
-        if all(v.is_assigned() for v in state.variables()):
-            return True
+        csp: CSP[V]
+        state: State[V]
+        stats: SearchStrategy.Stats
+        # The variables assigned or unassigned since their constraints were last
+        # checked, and the value of each, by id, when they last passed.
+        changed: State.Changes
+        checked_values: list[object]
+        constraint_index: dict[Constraint[V], int]
+        weights: dict[Constraint[V], int]
+        not_equal_neighbors: list[list[int]] = field(default_factory=list)
+        other_neighbors: list[list[int]] = field(default_factory=list)
 
-        # Select unassigned variable
-        def variable_key(var: Variable[T]) -> int:
-            return var.domain_size() if self._mrv else 0
+        def close(self) -> None:
+            """Stop tracking changes to the state for this search."""
+            self.changed.close()
 
-        variable = min(state.unassigned_variables(), key=variable_key)
+    def _begin(
+        self, csp: CSP[T], state: State[T], stats: SearchStrategy.Stats
+    ) -> "DepthFirstSearch._Search[T]":
+        """Start a search of csp in state, counted into stats, before root
+        propagation, to be closed once it's over. Weights are shared with the
+        searches of the same CSP before it, and forgotten on another."""
+        csp.compile(state)
+        if csp is not self._weights_csp:
+            # A new dict, so that a search of the other CSP keeps its own.
+            self._weights = dict[Constraint[T], int]()
+            self._weights_csp = csp
+        search = self._Search[T](
+            csp,
+            state,
+            stats,
+            # Every variable is checked once first.
+            state.track_changed_variable_ids(range(len(state))),
+            [self._UNCHECKED] * len(state),
+            {constraint: index for index, constraint in enumerate(csp.constraints())},
+            self._weights,
+        )
+        if self._lcv and self._fast_lcv:
+            self._split_neighbors(search)
+        return search
 
-        def value_key(value: T) -> int:
-            if not self._lcv:
-                return 0
-            return self._lcv_score(csp, state, variable, value)
+    @dataclass(slots=True)
+    class _Frame[V]:
+        variable: Variable[V]
+        values: Iterator[V]
+        checkpoint: Optional[int] = None
 
-        for value in sorted(variable.domain_values(), key=value_key):
-            checkpoint = state.checkpoint()
-            variable.assign(value)
+    def _dfs(
+        self,
+        search: "DepthFirstSearch._Search[T]",
+        exhausted: Optional[Callable[[], bool]],
+        pause_every: Optional[int],
+    ) -> Generator[bool, None, Optional[bool]]:
+        """Search with an explicit stack of frames, one per assigned variable, so
+        the depth isn't bounded by the recursion limit. Yields True with each
+        solution in the state, and False to pause every pause_every
+        assignments. Returns None once exhausted says the limits are reached,
+        checking before every assignment."""
+        csp, state, stats = search.csp, search.state, search.stats
+        branch = self._visit(search, 0)
+        if branch is True:
+            yield True
+        if branch is False:
+            stats.failures += 1
+        if isinstance(branch, bool):
+            return False
+        stack = [self._Frame[T](branch, self._ordered_values(search, branch))]
+        while stack:
+            frame = stack[-1]
+            if frame.checkpoint is not None:
+                state.revert_to(frame.checkpoint)
+            value = next(frame.values, self._UNCHECKED)
+            if value is self._UNCHECKED:
+                stack.pop()
+                continue
+            if exhausted is not None and exhausted():
+                return None
+            if pause_every is not None and stats.assignments % pause_every == 0:
+                yield False
+            variable = frame.variable
+            frame.checkpoint = state.checkpoint()
+            variable.assign(cast(T, value))
             stats.assignments += 1
 
-            result = self._propagator.propagate(csp, state)
+            result = self._propagator.propagate_changes(csp, state, (variable.id,))
             stats.propagations += 1
             stats.propagator_stats += result.stats
-
             if result.success:
-                if self._dfs(csp, state, stats, depth + 1):
-                    return True  # <- early return preserves solution
+                branch = self._visit(search, len(stack))
+                if branch is True:
+                    yield True  # <- the caller may stop here, keeping the solution
+                    continue
+            else:
+                self._bump(search, result.conflict)
+                branch = False
+            if branch is False:
+                stats.failures += 1
+                continue
+            stack.append(self._Frame[T](branch, self._ordered_values(search, branch)))
+        return False
 
-            state.revert_to(checkpoint)
+    def _visit(
+        self, search: "DepthFirstSearch._Search[T]", depth: int
+    ) -> bool | Variable[T]:
+        """Check a new state, returning the variable to branch on, or whether the
+        state is a solution if there's nothing left to branch on."""
+        state, stats = search.state, search.stats
+        stats.state_visits += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
 
-        return False
+        if not state.is_valid():
+            return False
+
+        if self._violated_constraint(search) is not None:
+            return False
+
+        if state.is_complete():
+            return True
+
+        return self._select_variable(search)
+
+    def _select_variable(self, search: "DepthFirstSearch._Search[T]") -> Variable[T]:
+        state = search.state
+        if self._wdeg:
+            return self._weighted_degree_variable(search)
+        elif self._mrv:
+            if self._random is not None:
+                ids = sorted(state.smallest_unassigned_variable_ids())
+                return state.variable(self._random.choice(ids))
+            return state.smallest_unassigned_variable()
+        else:
+            return next(iter(state.unassigned_variables()))
+
+    def _bump(
+        self, search: "DepthFirstSearch._Search[T]", constraint: Optional[Constraint[T]]
+    ) -> None:
+        """Weight constraint up for causing a failure. Weights are kept for as
+        long as this strategy solves the same CSP, across backtracks and solves."""
+        if constraint is None:
+            return
+        weight = search.weights.get(constraint, 1) + 1
+        search.weights[constraint] = weight
+        search.stats.conflicts += 1
+        search.stats.constraint_weights[search.constraint_index[constraint]] = weight
+
+    def _weighted_degree_variable(
+        self, search: "DepthFirstSearch._Search[T]"
+    ) -> Variable[T]:
+        """The unassigned variable with the smallest domain size divided by the
+        total weight of its constraints on other unassigned variables (dom/wdeg).
+        Ties go to the lowest id, or a random one if seeded."""
+        csp, state, weights = search.csp, search.state, search.weights
+        best = list[Variable[T]]()
+        best_score = 0.0
+        for variable in state.unassigned_variables():
+            var_id = variable.id
+            weighted_degree = 0
+            for constraint in csp.constraints_for_id(var_id):
+                for other_id in constraint.scope_ids():
+                    if (
+                        other_id != var_id
+                        and not state.variable(other_id).is_assigned()
+                    ):
+                        weighted_degree += weights.get(constraint, 1)
+                        break
+            score = variable.domain_size() / max(weighted_degree, 1)
+            if not best or score < best_score:
+                best = [variable]
+                best_score = score
+            elif score == best_score and self._random is not None:
+                best.append(variable)
+        return self._random.choice(best) if self._random is not None else best[0]
+
+    def _ordered_values(
+        self, search: "DepthFirstSearch._Search[T]", variable: Variable[T]
+    ) -> Iterator[T]:
+        values = list(variable.domain)
+        if self._random is not None:
+            self._random.shuffle(values)
+        if not self._lcv:
+            return iter(values)
+        if self._fast_lcv:
+            scores = self._fast_lcv_scores(search, variable, values)
+        else:
+            csp, state = search.csp, search.state
+            scores = {
+                value: self._lcv_score(csp, state, variable, value) for value in values
+            }
+        return iter(sorted(values, key=scores.__getitem__))
+
+    def _violated_constraint(
+        self, search: "DepthFirstSearch._Search[T]"
+    ) -> Optional[Constraint[T]]:
+        """A constraint state violates, if any. Checks only the constraints on
+        variables whose values differ from the last state that passed this check,
+        since every other constraint sees the same values it was satisfied with
+        then."""
+        csp, state, stats = search.csp, search.state, search.stats
+        checked_values = search.checked_values
+        dirty = [
+            var_id
+            for var_id in search.changed.ids()
+            if state.variable(var_id)._value != checked_values[var_id]
+        ]
+        constraints = dict.fromkeys(
+            constraint
+            for var_id in dirty
+            for constraint in csp.constraints_for_id(var_id)
+        )
+        stats.constraint_checks_saved += len(csp.constraints()) - len(constraints)
+        for constraint in constraints:
+            stats.constraint_checks += 1
+            if not constraint.is_satisfied(state):
+                self._bump(search, constraint)
+                return constraint
+        for var_id in dirty:
+            checked_values[var_id] = state.variable(var_id)._value
+        search.changed.clear()
+        return None
 
     def _lcv_score(
         self, csp: CSP[T], state: State[T], variable: Variable[T], value: T
     ) -> int:
         score = 0
-        with state.maintain_state():
-            variable.assign(value)
-
-            # For all neighbors of X, count how many values are still valid
-            for neighbor_name in csp.neighbors(variable.name):
-                neighbor = state[neighbor_name]
-                if neighbor.is_assigned():
-                    continue
+        # For all unassigned neighbors of X, count the values this one rules out
+        for neighbor_id in csp.neighbor_ids(variable.id):
+            neighbor = state.variable(neighbor_id)
+            if neighbor.is_assigned():
+                continue
+            domain = neighbor.domain
+            score += len(domain) - len(
+                csp.supports(state, variable.id, value, neighbor_id, domain)
+            )
+        return score
 
-                # Try assigning each neighbor value and check full constraint satisfaction
-                for neighbor_value in neighbor.domain_values():
-                    with neighbor.maintain_state():
-                        neighbor.assign(neighbor_value)
-                        if not csp.is_satisfied_for_constraints_between(
-                            variable.name, neighbor_name, state
-                        ):
-                            score += 1
+    def _split_neighbors(self, search: "DepthFirstSearch._Search[T]") -> None:
+        """Split the neighbors of each variable into those it only shares pairwise
+        not-equal constraints with and the rest."""
+        csp = search.csp
+        for var_id in range(len(search.state)):
+            not_equal = list[int]()
+            other = list[int]()
+            for neighbor_id in csp.neighbor_ids(var_id):
+                if all(
+                    constraint.is_pairwise_not_equal()
+                    for constraint in csp.constraints_between_ids(var_id, neighbor_id)
+                ):
+                    not_equal.append(neighbor_id)
+                else:
+                    other.append(neighbor_id)
+            search.not_equal_neighbors.append(not_equal)
+            search.other_neighbors.append(other)
 
-        return score
+    def _fast_lcv_scores(
+        self,
+        search: "DepthFirstSearch._Search[T]",
+        variable: Variable[T],
+        values: Collection[T],
+    ) -> dict[T, int]:
+        """_lcv_score for every value at once. A not-equal neighbor only loses
+        value if its domain contains it, so those neighbors are scored by one
+        pass over their domains instead of a supports check per value."""
+        csp, state = search.csp, search.state
+        scores = dict.fromkeys(values, 0)
+        for neighbor_id in search.not_equal_neighbors[variable.id]:
+            neighbor = state.variable(neighbor_id)
+            if neighbor.is_assigned():
+                continue
+            for value in neighbor.domain:
+                if value in scores:
+                    scores[value] += 1
+        for neighbor_id in search.other_neighbors[variable.id]:
+            neighbor = state.variable(neighbor_id)
+            if neighbor.is_assigned():
+                continue
+            domain = neighbor.domain
+            for value in values:
+                scores[value] += len(domain) - len(
+                    csp.supports(state, variable.id, value, neighbor_id, domain)
+                )
+        return scores
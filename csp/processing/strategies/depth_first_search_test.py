@@ -1,9 +1,25 @@
-from csp.processing.strategies import DepthFirstSearch
-from csp.processing.propagators import NullPropagator
+from csp.processing import CancellationToken, SearchStrategy
+from csp.processing.strategies import (
+    ConflictDirectedBackjumping,
+    DepthFirstSearch,
+    NogoodLearning,
+)
+from csp.processing.propagators import (
+    ForwardChecking,
+    NullPropagator,
+    PropagationEngine,
+)
+from csp.processing.conftest import LessThan, make
 from csp.state import Domain, Variable, State
 from csp.delta import DeltaRecord
 from csp.model import CSP
 from csp.model.constraints import AllDifferent
+import asyncio
+import itertools
+import pytest
+import sys
+import threading
+import time
 
 
 def test_basic_solution():
@@ -69,3 +85,467 @@ def test_lcv_heuristic_does_not_break_correctness():
 
     assert result.success
     assert a.value() != b.value()
+
+
+def test_dirty_constraint_checks():
+    delta_record = DeltaRecord()
+    variables = [
+        Variable(delta_record, name, Domain(delta_record, {1, 2, 3})) for name in "abcd"
+    ]
+    state = State(delta_record, variables)
+    csp = CSP(
+        [
+            AllDifferent({"a", "b"}),
+            AllDifferent({"b", "c"}),
+            AllDifferent({"c", "d"}),
+        ]
+    )
+
+    result = DepthFirstSearch(NullPropagator()).solve(csp, state)
+
+    assert result.success
+    assert csp.is_satisfied(state)
+    assert result.stats.constraint_checks_saved > 0
+    assert (
+        result.stats.constraint_checks + result.stats.constraint_checks_saved
+        <= result.stats.state_visits * len(csp.constraints())
+    )
+
+
+def test_rechecks_givens_against_another_csp():
+    delta_record = DeltaRecord()
+    variables = [
+        Variable(delta_record, name, Domain(delta_record, {1, 2})) for name in "abc"
+    ]
+    state = State(delta_record, variables)
+    state.assign("a", 1)
+    state.assign("b", 1)
+    strategy = DepthFirstSearch[int](NullPropagator())
+
+    assert strategy.solve(CSP([AllDifferent({"b", "c"})]), state).success
+    state.unassign("c")
+    assert not strategy.solve(CSP([AllDifferent({"a", "b"})]), state).success
+
+
+def test_default_propagator():
+    delta_record = DeltaRecord()
+    a = Variable(delta_record, "a", Domain(delta_record, {1, 2}))
+    b = Variable(delta_record, "b", Domain(delta_record, {1, 2}))
+    c = Variable(delta_record, "c", Domain(delta_record, {1, 2, 3}))
+    state = State(delta_record, [a, b, c])
+    csp = CSP([AllDifferent({"a", "b", "c"})])
+
+    result = DepthFirstSearch().solve(csp, state)
+
+    assert result.success
+    assert c.value() == 3
+    assert result.stats.propagator_stats.domain_prunes > 0
+
+
+def test_deeper_than_recursion_limit():
+    delta_record = DeltaRecord()
+    names = [f"v{i}" for i in range(sys.getrecursionlimit() + 1000)]
+    state = State(
+        delta_record,
+        [Variable(delta_record, name, Domain(delta_record, {1, 2})) for name in names],
+    )
+    csp = CSP([AllDifferent({a, b}) for a, b in zip(names, names[1:])])
+
+    result = DepthFirstSearch(
+        minimum_remaining_values=False, least_constraining_values=False
+    ).solve(csp, state)
+
+    assert result.success
+    assert result.stats.max_depth == len(names)
+    assert csp.is_satisfied(state)
+
+
+def test_backtracking_stats():
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, {1, 2, 3}))
+            for name in "abcd"
+        ],
+    )
+    # a, b and c are pairwise different and d differs from all of them, which
+    # only fails once d is reached.
+    csp = CSP(
+        [AllDifferent({"a", "b", "c"})] + [AllDifferent({name, "d"}) for name in "abc"]
+    )
+
+    result = DepthFirstSearch(
+        NullPropagator(),
+        minimum_remaining_values=False,
+        least_constraining_values=False,
+    ).solve(csp, state)
+
+    assert not result.success
+    assert result.stats.max_depth == 4
+    assert result.stats.state_visits == result.stats.assignments + 1
+    assert all(not variable.is_assigned() for variable in state.variables())
+
+
+def test_fast_lcv_scores_match_lcv_scores():
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, {1, 2, 3, 4}))
+            for name in "abcde"
+        ],
+    )
+    csp = CSP(
+        [AllDifferent({"a", "b", "c"}), AllDifferent({"a", "d"}), LessThan("a", "e")]
+    )
+    csp.compile(state)
+    state["b"].remove_value_from_domain(1)
+    state["c"].assign(2)
+    state["d"].remove_value_from_domain(4)
+
+    solver = DepthFirstSearch(fast_least_constraining_values=True)
+    search = solver._begin(csp, state, SearchStrategy.Stats())
+    a = state["a"]
+
+    assert solver._fast_lcv_scores(search, a, a.domain_values()) == {
+        value: solver._lcv_score(csp, state, a, value) for value in a.domain_values()
+    }
+
+
+def test_fast_lcv_same_search():
+    def solve(fast: bool) -> tuple[SearchStrategy.Stats, dict[str, object]]:
+        delta_record = DeltaRecord()
+        state = State(
+            delta_record,
+            [
+                Variable(delta_record, name, Domain(delta_record, {1, 2, 3}))
+                for name in "abcdef"
+            ],
+        )
+        csp = CSP(
+            [
+                AllDifferent({"a", "b", "c"}),
+                AllDifferent({"c", "d", "e"}),
+                AllDifferent({"e", "f", "a"}),
+                LessThan("b", "d"),
+            ]
+        )
+        result = DepthFirstSearch(fast_least_constraining_values=fast).solve(csp, state)
+        assert result.success
+        result.stats.elapsed_time = 0
+        result.stats.propagator_stats.elapsed_time = 0
+        return result.stats, {var.name: var.value() for var in state.variables()}
+
+    assert solve(True) == solve(False)
+
+
+def test_weighted_degree_prefers_conflicting_constraints():
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, {1, 2, 3}))
+            for name in "abcd"
+        ],
+    )
+    csp = CSP([AllDifferent({"a", "b"}), AllDifferent({"c", "d"})])
+    csp.compile(state)
+    solver = DepthFirstSearch(weighted_degree=True)
+    solver.solve(csp, state)
+    state.revert_to(0)
+
+    search = solver._begin(csp, state, SearchStrategy.Stats())
+    assert solver._weighted_degree_variable(search) is state["a"]
+    solver._bump(search, csp.constraints()[1])
+    assert solver._weighted_degree_variable(search) in (state["c"], state["d"])
+
+
+def test_weighted_degree_weights_persist():
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, {1, 2, 3}))
+            for name in "abcd"
+        ],
+    )
+    # Unsatisfiable: a, b and c need three values and d differs from all of them.
+    csp = CSP(
+        [AllDifferent({"a", "b", "c"})] + [AllDifferent({name, "d"}) for name in "abc"]
+    )
+    solver = DepthFirstSearch(weighted_degree=True)
+
+    first = solver.solve(csp, state)
+    second = solver.solve(csp, state)
+
+    assert not first.success and not second.success
+    assert first.stats.conflicts > 0
+    assert first.stats.constraint_weights
+    for index, weight in first.stats.constraint_weights.items():
+        assert second.stats.constraint_weights.get(index, weight) >= weight
+    assert (first.stats + second.stats).constraint_weights == {
+        index: max(
+            first.stats.constraint_weights.get(index, 0),
+            second.stats.constraint_weights.get(index, 0),
+        )
+        for index in first.stats.constraint_weights.keys()
+        | second.stats.constraint_weights.keys()
+    }
+
+
+def test_weighted_degree_solves():
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, {1, 2, 3}))
+            for name in "abcdef"
+        ],
+    )
+    csp = CSP(
+        [
+            AllDifferent({"a", "b", "c"}),
+            AllDifferent({"c", "d", "e"}),
+            AllDifferent({"e", "f", "a"}),
+            LessThan("b", "d"),
+        ]
+    )
+
+    result = DepthFirstSearch(NullPropagator(), weighted_degree=True).solve(csp, state)
+
+    assert result.success
+    assert csp.is_satisfied(state)
+
+
+def permutations_csp() -> tuple[CSP[int], State[int]]:
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, {1, 2, 3}))
+            for name in "abc"
+        ],
+    )
+    return CSP([AllDifferent({"a", "b", "c"})]), state
+
+
+def test_solutions():
+    csp, state = permutations_csp()
+    stats = SearchStrategy.Stats()
+
+    solutions = list(DepthFirstSearch[int]().solutions(csp, state, stats))
+
+    assert sorted(solutions) == sorted(itertools.permutations((1, 2, 3)))
+    assert not any(variable.is_assigned() for variable in state.variables())
+    assert stats.assignments > 0
+
+
+def test_solutions_holds_each_solution_in_state():
+    csp, state = permutations_csp()
+    for solution in DepthFirstSearch[int](NullPropagator()).solutions(csp, state):
+        assert csp.is_satisfied(state)
+        assert tuple(variable.value() for variable in state.variables()) == solution
+
+
+def test_closing_solutions_reverts_state():
+    csp, state = permutations_csp()
+    solutions = DepthFirstSearch[int]().solutions(csp, state)
+    next(solutions)
+    assert state.is_complete()
+
+    solutions.close()
+    assert not any(variable.is_assigned() for variable in state.variables())
+
+
+def test_count_and_is_unique():
+    csp, state = permutations_csp()
+    strategy = DepthFirstSearch[int]()
+
+    assert strategy.count(csp, state) == 6
+    assert strategy.count(csp, state, limit=4) == 4
+    assert strategy.count(csp, state, limit=0) == 0
+    assert not strategy.is_unique(csp, state)
+
+    state.assign("a", 1)
+    state.assign("b", 2)
+    assert strategy.is_unique(csp, state)
+    state.assign("c", 1)
+    assert strategy.count(csp, state) == 0
+
+
+@pytest.mark.parametrize(
+    "strategy_type", [DepthFirstSearch, ConflictDirectedBackjumping, NogoodLearning]
+)
+@pytest.mark.parametrize("propagator_type", [NullPropagator, ForwardChecking])
+def test_interleaved_solutions(strategy_type, propagator_type):
+    def problems() -> list[tuple[CSP[int], State[int]]]:
+        return [
+            make(
+                {name: {1, 2, 3, 4} for name in "abcde"},
+                [{"a", "b", "c", "d"}, {"d", "e"}, {"a", "e"}],
+            ),
+            make({name: {1, 2, 3} for name in "fgh"}, [{"f", "g", "h"}]),
+        ]
+
+    def strategy() -> DepthFirstSearch[int]:
+        return strategy_type(propagator_type(), weighted_degree=True)
+
+    alone = [list(strategy().solutions(csp, state)) for csp, state in problems()]
+    shared = strategy()
+    interleaved = itertools.zip_longest(
+        *(shared.solutions(csp, state) for csp, state in problems())
+    )
+
+    assert [
+        [solution for solution in solutions if solution is not None]
+        for solutions in zip(*interleaved)
+    ] == alone
+
+
+@pytest.mark.parametrize(
+    "strategy_type", [DepthFirstSearch, ConflictDirectedBackjumping, NogoodLearning]
+)
+def test_searches_stop_tracking_changes(strategy_type):
+    csp, state = make({name: {1, 2, 3} for name in "abc"}, [{"a", "b", "c"}])
+    strategy = strategy_type(
+        PropagationEngine([(ForwardChecking(), PropagationEngine.Cost.CHEAP)])
+    )
+    assert strategy.solve(csp, state).success
+    state.revert_to(0)
+    solutions = strategy.solutions(csp, state)
+    next(solutions)
+    solutions.close()
+
+    assert state._changed_readers == [] and state._modified_readers == []
+
+
+def pigeonhole(holes: int) -> tuple[CSP[int], State[int]]:
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, f"p{i}", Domain(delta_record, set(range(holes))))
+            for i in range(holes + 1)
+        ],
+    )
+    return (
+        CSP(
+            [AllDifferent({f"p{i}", f"p{i + 1}"}) for i in range(holes)]
+            + [AllDifferent({f"p{i}" for i in range(holes + 1)})]
+        ),
+        state,
+    )
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [
+        SearchStrategy.Limits(failures=10),
+        SearchStrategy.Limits(nodes=10),
+        SearchStrategy.Limits(propagations=10),
+        SearchStrategy.Limits(time=0.01),
+        SearchStrategy.Limits(trail=5),
+    ],
+    ids=repr,
+)
+@pytest.mark.parametrize(
+    "strategy",
+    [DepthFirstSearch[int](NullPropagator()), ConflictDirectedBackjumping[int]()],
+    ids=type,
+)
+def test_limits(strategy: DepthFirstSearch[int], limits: SearchStrategy.Limits):
+    csp, state = pigeonhole(8)
+    checkpoint = state.checkpoint()
+
+    result = strategy.solve(csp, state, limits)
+
+    assert not result.success and result.limit_reached
+    assert result.stats.assignments > 0
+    assert state.checkpoint() == checkpoint
+    assert all(variable.domain_size() == 8 for variable in state.variables())
+    if limits.nodes is not None:
+        assert result.stats.state_visits == limits.nodes
+    if limits.failures is not None:
+        assert result.stats.failures == limits.failures
+
+
+def test_cancellation():
+    csp, state = pigeonhole(8)
+    cancellation = CancellationToken()
+    timer = threading.Timer(0.01, cancellation.cancel)
+    timer.start()
+
+    result = DepthFirstSearch[int](NullPropagator()).solve(
+        csp, state, SearchStrategy.Limits(cancellation=cancellation)
+    )
+    timer.join()
+
+    assert not result.success and result.limit_reached
+    assert result.stats.assignments > 0
+    assert not any(variable.is_assigned() for variable in state.variables())
+
+
+def test_limits_not_reached():
+    csp, state = permutations_csp()
+    result = DepthFirstSearch[int]().solve(
+        csp, state, SearchStrategy.Limits(nodes=100, time=60, trail=1000)
+    )
+
+    assert result.success and not result.limit_reached
+    assert csp.is_satisfied(state)
+
+
+def test_solve_async_pauses_for_other_tasks():
+    ticks = list[float]()
+
+    async def tick() -> None:
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0)
+
+    async def solve() -> SearchStrategy.Result:
+        ticker = asyncio.create_task(tick())
+        csp, state = pigeonhole(6)
+        result = await DepthFirstSearch[int](NullPropagator()).solve_async(
+            csp, state, pause_every=10
+        )
+        ticker.cancel()
+        return result
+
+    result = asyncio.run(solve())
+
+    assert not result.success and not result.limit_reached
+    assert len(ticks) >= result.stats.assignments // 10
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.5
+
+
+def test_solve_async_needs_a_positive_pause():
+    csp, state = permutations_csp()
+    with pytest.raises(DepthFirstSearch.Error):
+        asyncio.run(DepthFirstSearch[int]().solve_async(csp, state, pause_every=0))
+
+
+def test_solve_async_solves():
+    csp, state = permutations_csp()
+    result = asyncio.run(DepthFirstSearch[int]().solve_async(csp, state))
+
+    assert result.success
+    assert csp.is_satisfied(state)
+
+
+def test_solve_async_cancel_reverts_state():
+    csp, state = pigeonhole(8)
+    checkpoint = state.checkpoint()
+
+    async def cancel() -> None:
+        task = asyncio.create_task(DepthFirstSearch[int]().solve_async(csp, state))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+
+    assert state.checkpoint() == checkpoint
+    assert not any(variable.is_assigned() for variable in state.variables())
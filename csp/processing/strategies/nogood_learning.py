@@ -0,0 +1,282 @@
+from csp.model import CSP
+from csp.state import State
+from csp.processing import Propagator, SearchStrategy
+from csp.processing.strategies.conflict_directed_backjumping import (
+    ConflictDirectedBackjumping,
+)
+from csp.processing.strategies.depth_first_search import DepthFirstSearch
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Sequence, cast, override
+
+
+class NogoodStore[T]:
+    """A bounded set of nogoods: (variable id, value) literals that can't all
+    hold in a solution.
+
+    Each nogood watches two of its literals and is only looked at when one of
+    them becomes true, so most assignments never touch it. Once every literal
+    but one holds, that last one must not: its value is pruned. Nogoods gain
+    activity when they prune or fail, and when the store is full the less
+    active half is evicted in one go to make room.
+    """
+
+    class Error(Exception): ...
+
+    @dataclass(slots=True, eq=False)
+    class Nogood[V]:
+        # The watched literals are the first two.
+        literals: list[tuple[int, V]]
+        activity: float = 0
+
+    _RESCALE = 1e100
+
+    def __init__(self, capacity: int = 1000, decay: float = 0.95) -> None:
+        if capacity < 1:
+            raise self.Error(f"capacity {capacity} must be positive")
+        if not 0 < decay <= 1:
+            raise self.Error(f"decay {decay} must be in (0, 1]")
+        self._capacity = capacity
+        self._decay = decay
+        self._increment = 1.0
+        self._nogoods = list[NogoodStore.Nogood[T]]()
+        self._watches = dict[tuple[int, T], list[NogoodStore.Nogood[T]]]()
+
+    def __len__(self) -> int:
+        return len(self._nogoods)
+
+    def __iter__(self) -> Iterator["NogoodStore.Nogood[T]"]:
+        return iter(self._nogoods)
+
+    def clear(self) -> None:
+        self._nogoods.clear()
+        self._watches.clear()
+        self._increment = 1.0
+
+    def add(self, literals: Sequence[tuple[int, T]]) -> int:
+        """Store a nogood, watching its first two literals, which should be the
+        last to have become true. Returns how many were evicted for it."""
+        if not literals:
+            raise self.Error("a nogood needs at least one literal")
+        evicted = 0
+        if len(self._nogoods) >= self._capacity:
+            evicted = self._evict()
+        nogood = NogoodStore.Nogood[T](list(literals), self._increment)
+        self._nogoods.append(nogood)
+        for literal in nogood.literals[:2]:
+            self._watches.setdefault(literal, []).append(nogood)
+        self._increment /= self._decay
+        return evicted
+
+    def bump(self, nogood: "NogoodStore.Nogood[T]") -> None:
+        nogood.activity += self._increment
+        if nogood.activity > self._RESCALE:
+            for other in self._nogoods:
+                other.activity /= self._RESCALE
+            self._increment /= self._RESCALE
+
+    def propagate(
+        self, state: State[T], var_id: int, value: T
+    ) -> tuple[list["NogoodStore.Nogood[T]"], Optional["NogoodStore.Nogood[T]"]]:
+        """Visit the nogoods watching var_id=value, which just became true, and
+        prune the one literal left of those with no other watch to move to.
+        Returns the nogoods that pruned, with the pruned literal first, and a
+        nogood whose literals all hold, if any."""
+        literal = (var_id, value)
+        watchers = self._watches.get(literal)
+        if not watchers:
+            return [], None
+        pruned = list[NogoodStore.Nogood[T]]()
+        kept = list[NogoodStore.Nogood[T]]()
+        for index, nogood in enumerate(watchers):
+            literals = nogood.literals
+            if len(literals) == 1:
+                kept.extend(watchers[index:])
+                self._watches[literal] = kept
+                return pruned, nogood
+            if literals[0] == literal:
+                literals[0], literals[1] = literals[1], literals[0]
+            for other in range(2, len(literals)):
+                if not self._holds(state, literals[other]):
+                    literals[1], literals[other] = literals[other], literals[1]
+                    self._watches.setdefault(literals[1], []).append(nogood)
+                    break
+            else:
+                kept.append(nogood)
+                last_id, last_value = literals[0]
+                variable = state.variable(last_id)
+                if variable.is_assigned():
+                    if variable.value() == last_value:
+                        kept.extend(watchers[index + 1 :])
+                        self._watches[literal] = kept
+                        return pruned, nogood
+                elif last_value in variable.domain:
+                    variable.remove_value_from_domain(last_value)
+                    pruned.append(nogood)
+        self._watches[literal] = kept
+        return pruned, None
+
+    def _holds(self, state: State[T], literal: tuple[int, T]) -> bool:
+        variable = state.variable(literal[0])
+        return variable.is_assigned() and variable.value() == literal[1]
+
+    def _evict(self) -> int:
+        """Drop the less active half of the nogoods, so that a full store sorts
+        once per capacity // 2 nogoods added rather than scanning for each."""
+        self._nogoods.sort(key=lambda nogood: nogood.activity, reverse=True)
+        evicted = self._nogoods[self._capacity // 2 :]
+        del self._nogoods[self._capacity // 2 :]
+        dropped = set(evicted)
+        for literal in {
+            literal for nogood in evicted for literal in nogood.literals[:2]
+        }:
+            self._watches[literal] = [
+                nogood for nogood in self._watches[literal] if nogood not in dropped
+            ]
+        return len(evicted)
+
+
+class NogoodLearning[T](ConflictDirectedBackjumping[T]):
+    """ConflictDirectedBackjumping that remembers why subtrees failed.
+
+    When a variable runs out of values, the assignments at the levels of its
+    conflict set can't all hold, so they are recorded as a nogood. These are
+    usually far smaller than the path to the dead end, as CBJ leaves out every
+    level that played no part in it. Nogoods are propagated after each
+    assignment, through a NogoodStore, and their prunes are explained by the
+    levels of their other literals like any other prune.
+
+    Nogoods leave out the root level, so they only hold given the domains the
+    search started from. The store is kept between searches of the same CSP and
+    state from the same root domains, as across Restarts, and replaced by an
+    empty one otherwise, as between the subproblems of a ParallelSearch worker.
+    """
+
+    @dataclass(slots=True, eq=False)
+    class _Search[V](ConflictDirectedBackjumping._Search[V]):
+        nogoods: NogoodStore[V] = field(default_factory=NogoodStore)
+
+    def __init__(
+        self,
+        propagator: Optional[Propagator[T]] = None,
+        minimum_remaining_values: bool = True,
+        least_constraining_values: bool = True,
+        fast_least_constraining_values: bool = False,
+        weighted_degree: bool = False,
+        seed: Optional[int] = None,
+        capacity: int = 1000,
+        decay: float = 0.95,
+    ) -> None:
+        super().__init__(
+            propagator,
+            minimum_remaining_values,
+            least_constraining_values,
+            fast_least_constraining_values,
+            weighted_degree,
+            seed,
+        )
+        self._capacity = capacity
+        self._decay = decay
+        self._nogoods: NogoodStore[T] = NogoodStore(capacity, decay)
+        self._nogoods_for: Optional[
+            tuple[CSP[T], State[T], tuple[frozenset[T], ...]]
+        ] = None
+
+    @override
+    def _begin(
+        self, csp: CSP[T], state: State[T], stats: SearchStrategy.Stats
+    ) -> DepthFirstSearch._Search[T]:
+        search = cast(NogoodLearning._Search[T], super()._begin(csp, state, stats))
+        root = tuple(
+            (
+                frozenset((value,))
+                if (value := variable.value()) is not None
+                else frozenset(variable.domain)
+            )
+            for variable in state.variables()
+        )
+        if self._nogoods_for is None or (
+            self._nogoods_for[0] is not csp
+            or self._nogoods_for[1] is not state
+            or self._nogoods_for[2] != root
+        ):
+            # A new store, so that a search of the other problem keeps its own.
+            self._nogoods = NogoodStore(self._capacity, self._decay)
+            self._nogoods_for = (csp, state, root)
+        search.nogoods = self._nogoods
+        return search
+
+    def nogoods(self) -> NogoodStore[T]:
+        """The nogoods kept from the last search."""
+        return self._nogoods
+
+    @override
+    def _learn(
+        self,
+        search: ConflictDirectedBackjumping._Search[T],
+        stack: list[ConflictDirectedBackjumping._Level[T]],
+        conflicts: set[int],
+    ) -> None:
+        search = cast(NogoodLearning._Search[T], search)
+        literals = list[tuple[int, T]]()
+        for level in sorted(conflicts, reverse=True):
+            if level == 0:
+                break
+            variable = stack[level - 1].variable
+            literals.append((variable.id, cast(T, variable.value())))
+        if not literals:
+            return
+        search.stats.nogoods_learned += 1
+        search.stats.nogood_evictions += search.nogoods.add(literals)
+
+    @override
+    def _propagate_assignment(
+        self,
+        search: ConflictDirectedBackjumping._Search[T],
+        frame: ConflictDirectedBackjumping._Level[T],
+        level: int,
+    ) -> Optional[set[int]]:
+        culprits = super()._propagate_assignment(search, frame, level)
+        if culprits is not None:
+            return culprits
+        search = cast(NogoodLearning._Search[T], search)
+        csp, state, stats, nogoods = (
+            search.csp,
+            search.state,
+            search.stats,
+            search.nogoods,
+        )
+        variable = frame.variable
+        pruned, conflict = nogoods.propagate(
+            state, variable.id, cast(T, variable.value())
+        )
+        if conflict is not None:
+            nogoods.bump(conflict)
+            stats.nogood_prunes += 1
+            return {search.levels[var_id] for var_id, _ in conflict.literals}
+        if not pruned:
+            return None
+
+        stats.nogood_prunes += len(pruned)
+        changed = list[int]()
+        for nogood in pruned:
+            nogoods.bump(nogood)
+            var_id = nogood.literals[0][0]
+            self._set_reason(
+                search,
+                frame,
+                var_id,
+                {search.levels[other] for other, _ in nogood.literals[1:]},
+            )
+            if state.variable(var_id).domain_size() == 0:
+                return {level} | search.reasons[var_id]
+            changed.append(var_id)
+
+        search.modified.clear()
+        result = self._propagator.propagate_changes(csp, state, changed)
+        stats.propagations += 1
+        stats.propagator_stats += result.stats
+        self._explain_prunes(search, frame, level, False)
+        if not result.success:
+            self._bump(search, result.conflict)
+            return self._blame(search, result.conflict, level)
+        return None
@@ -0,0 +1,141 @@
+from csp.games import Sudoku
+from csp.processing import Propagator
+from csp.processing.strategies import NogoodLearning, NogoodStore
+from csp.processing.conftest import brute_force, make, random_problem
+from csp.processing.propagators import (
+    NullPropagator,
+    ForwardChecking,
+    AC3,
+    AllDifferentGAC,
+    PropagationEngine,
+)
+import pytest
+import random
+
+easter_monster = Sudoku.from_str(
+    """
+    1 . . . . . . . 2
+    . 9 . 4 . . . 5 .
+    . . 6 . . . 7 . .
+    . 5 . 9 . 3 . . .
+    . . . . 7 . . . .
+    . . . 8 5 . . 4 .
+    7 . . . . . 6 . .
+    . 3 . . . 9 . 8 .
+    . . 2 . . . . . 1
+    """
+)
+
+
+def test_store_prunes_the_last_literal():
+    _, state = make({"a": {1, 2}, "b": {1, 2}, "c": {1, 2}}, [])
+    a, b, c = (state.id(name) for name in "abc")
+    store = NogoodStore[int]()
+    store.add([(c, 1), (b, 1), (a, 1)])
+
+    state.variable(a).assign(1)
+    assert store.propagate(state, a, 1) == ([], None)  # <- watch moves to a
+    assert state.variable(c).domain_values() == {1, 2}
+
+    state.variable(b).assign(1)
+    pruned, conflict = store.propagate(state, b, 1)
+    assert conflict is None
+    assert [nogood.literals[0] for nogood in pruned] == [(c, 1)]
+    assert state.variable(c).domain_values() == {2}
+
+
+def test_store_reports_a_nogood_that_holds():
+    _, state = make({"a": {1, 2}, "b": {1, 2}}, [])
+    a, b = state.id("a"), state.id("b")
+    store = NogoodStore[int]()
+    store.add([(a, 1), (b, 2)])
+
+    state.variable(a).assign(1)
+    state.variable(b).assign(2)
+    pruned, conflict = store.propagate(state, b, 2)
+    assert pruned == []
+    assert conflict is not None and conflict.literals[0] == (a, 1)
+
+
+def test_store_evicts_the_less_active_half():
+    _, state = make({"a": {1, 2, 3, 4, 5}, "b": {1, 2, 3, 4, 5}}, [])
+    store = NogoodStore[int](capacity=4)
+    for value in range(1, 5):
+        assert store.add([(0, value), (1, value)]) == 0
+    _, second, _, fourth = store
+    store.bump(second)
+    store.bump(fourth)
+
+    assert store.add([(0, 5), (1, 5)]) == 2
+    assert [nogood.literals for nogood in store] == [
+        [(0, 4), (1, 4)],
+        [(0, 2), (1, 2)],
+        [(0, 5), (1, 5)],
+    ]
+    state.variable(0).assign(1)
+    assert store.propagate(state, 0, 1) == ([], None)
+    assert state.variable(1).domain_values() == {1, 2, 3, 4, 5}
+
+
+def test_store_rejects_bad_arguments():
+    with pytest.raises(NogoodStore.Error):
+        NogoodStore[int](capacity=0)
+    with pytest.raises(NogoodStore.Error):
+        NogoodStore[int](decay=0)
+    with pytest.raises(NogoodStore.Error):
+        NogoodStore[int]().add([])
+
+
+@pytest.mark.parametrize(
+    "propagator",
+    [
+        NullPropagator(),
+        ForwardChecking(),
+        AC3(),
+        AllDifferentGAC(),
+        PropagationEngine(
+            [
+                (ForwardChecking(), PropagationEngine.Cost.CHEAP),
+                (AllDifferentGAC(), PropagationEngine.Cost.EXPENSIVE),
+            ]
+        ),
+    ],
+    ids=type,
+)
+def test_matches_brute_force(propagator: Propagator[int]):
+    rng = random.Random(0)
+    for _ in range(100):
+        domains, scopes = random_problem(rng, variables=7, constraints=(1, 8))
+        csp, state = make(domains, scopes)
+
+        result = NogoodLearning(propagator, capacity=4).solve(csp, state)
+
+        satisfiable = bool(brute_force(domains, scopes))
+        assert result.success == satisfiable
+        if result.success:
+            assert csp.is_satisfied(state)
+            assert all(variable.is_assigned() for variable in state.variables())
+
+
+def test_learns_and_prunes_on_sudoku():
+    strategy = NogoodLearning[int](capacity=100)
+    solution, stats = easter_monster.solve(strategy)
+
+    assert solution.satisfies_puzzle(easter_monster)
+    assert stats.nogoods_learned > 100
+    assert stats.nogood_prunes > 0
+    assert 50 < len(strategy.nogoods()) <= 100
+    assert stats.nogood_evictions == stats.nogoods_learned - len(strategy.nogoods())
+
+
+def test_counts_with_one_strategy_across_problems():
+    # Nogoods learned on one problem are keyed by variable id, so they must be
+    # forgotten before counting solutions of the next.
+    strategy = NogoodLearning[int](ForwardChecking())
+    rng = random.Random(4)
+    for _ in range(100):
+        domains, scopes = random_problem(rng)
+        expected = len(brute_force(domains, scopes))
+        csp, state = make(domains, scopes)
+        assert strategy.count(csp, state) == expected
+        assert strategy.is_unique(csp, state) == (expected == 1)
@@ -0,0 +1,233 @@
+from csp.model import CSP
+from csp.state import State
+from csp.processing import CancellationToken, SearchStrategy
+from csp.processing.strategies.depth_first_search import DepthFirstSearch
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing.synchronize import Event
+from typing import Any, Optional, override
+import dataclasses
+import multiprocessing
+import os
+import time
+
+# A subproblem is the root state with these (variable id, value) assignments.
+type Subproblem[T] = tuple[tuple[int, T], ...]
+
+
+class _StopToken(CancellationToken):
+    """Cancelled once the coordinator sets an event shared by every worker."""
+
+    def __init__(self, stop: Event) -> None:
+        super().__init__()
+        self._stop = stop
+
+    @override
+    def is_cancelled(self) -> bool:
+        return self._stop.is_set()
+
+
+# The problem each worker process solves subproblems of, and the token that
+# cancels them, set by _init_worker.
+_worker: Optional[tuple[DepthFirstSearch[Any], CSP[Any], State[Any], _StopToken]] = None
+
+
+def _init_worker(
+    strategy: DepthFirstSearch[Any], csp: CSP[Any], state: State[Any], stop: Event
+) -> None:
+    global _worker
+    _worker = (strategy, csp, state, _StopToken(stop))
+
+
+def _solve_subproblem(
+    subproblem: Subproblem[Any], limits: SearchStrategy.Limits
+) -> tuple[SearchStrategy.Result, Optional[Subproblem[Any]]]:
+    """Search a subproblem in a worker, returning the result and, on success,
+    the assignment of every variable."""
+    assert _worker is not None
+    strategy, csp, state, stop = _worker
+    root = state.checkpoint()
+    for var_id, value in subproblem:
+        state.variable(var_id).assign(value)
+    result = strategy.solve(csp, state, dataclasses.replace(limits, cancellation=stop))
+    solution = None
+    if result.success:
+        solution = tuple(
+            (variable.id, variable.value()) for variable in state.variables()
+        )
+    state.revert_to(root)
+    return result, solution
+
+
+class ParallelSearch[T](SearchStrategy[T]):
+    """Search subproblems in parallel on a pool of worker processes.
+
+    The top of the tree is expanded, one MRV variable at a time, until there are
+    subproblems_per_worker subproblems per worker. Each worker gets a pickled
+    copy of the strategy, CSP and state, and searches subproblems as the
+    assignments that lead to them. A subproblem that isn't decided within
+    failure_limit dead ends is split one level further and requeued, so idle
+    workers pick up the rest of an uneven subtree instead of waiting on it.
+    Workers don't hand back how far they got, so the children search the part
+    of the subtree already explored again; each split doubles their failure
+    limit, which keeps that repeated work below the work of the last split. The
+    first solution found is copied back into the state. Queued subproblems are
+    then cancelled, and running ones are stopped through an event shared by
+    the workers, which solve waits for.
+
+    Limits on the trail apply to each subproblem, and the others to the whole
+    search, checked whenever a subproblem is done and at least every
+    _POLL_INTERVAL seconds.
+
+    Stats are summed over every subproblem searched, except elapsed_time, which
+    is wall time.
+    """
+
+    _POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        strategy: Optional[DepthFirstSearch[T]] = None,
+        workers: Optional[int] = None,
+        subproblems_per_worker: int = 4,
+        failure_limit: int = 1000,
+    ) -> None:
+        self._strategy: DepthFirstSearch[T] = (
+            strategy if strategy is not None else DepthFirstSearch()
+        )
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._subproblems_per_worker = subproblems_per_worker
+        self._failure_limit = failure_limit
+
+    def solve(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
+        start = time.perf_counter()
+        stats = SearchStrategy.Stats()
+        if limits is None:
+            limits = SearchStrategy.Limits()
+        exhausted = dataclasses.replace(limits, trail=None).exhausted(state, stats)
+        subproblem_limits = SearchStrategy.Limits(trail=limits.trail)
+        csp.compile(state)
+        queue: list[Subproblem[T]] = [()]
+        while 0 < len(queue) < self._workers * self._subproblems_per_worker:
+            subproblem = queue.pop(0)
+            children = self._split(csp, state, subproblem, stats)
+            if children is None:
+                return self._finish(state, subproblem, stats, start)
+            queue.extend(children)
+        if not queue:
+            return self._finish(state, None, stats, start)
+
+        # Forking a process with threads running can deadlock the child.
+        context = multiprocessing.get_context(
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else None
+        )
+        stop = context.Event()
+        executor = ProcessPoolExecutor(
+            self._workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._strategy, csp, state, stop),
+        )
+        try:
+            # Each subproblem is searched up to its own failure limit.
+            pending = dict[
+                Future[tuple[SearchStrategy.Result, Optional[Subproblem[T]]]],
+                tuple[Subproblem[T], int],
+            ]()
+            for subproblem in queue:
+                failure_limit = self._failure_limit
+                future = self._submit(
+                    executor,
+                    subproblem,
+                    dataclasses.replace(subproblem_limits, failures=failure_limit),
+                )
+                pending[future] = subproblem, failure_limit
+            while pending:
+                done, _ = wait(
+                    pending,
+                    timeout=self._POLL_INTERVAL if exhausted is not None else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                results = [(pending.pop(future), future.result()) for future in done]
+                for _, (result, _) in results:
+                    stats += result.stats
+                for _, (_, solution) in results:
+                    if solution is not None:
+                        return self._finish(state, solution, stats, start)
+                if exhausted is not None and exhausted():
+                    return self._finish(state, None, stats, start, True)
+                for (subproblem, failure_limit), (result, _) in results:
+                    if not result.limit_reached:
+                        continue
+                    children = self._split(csp, state, subproblem, stats)
+                    if children is None:
+                        return self._finish(state, subproblem, stats, start)
+                    for child in children:
+                        future = self._submit(
+                            executor,
+                            child,
+                            dataclasses.replace(
+                                subproblem_limits, failures=2 * failure_limit
+                            ),
+                        )
+                        pending[future] = child, 2 * failure_limit
+            return self._finish(state, None, stats, start)
+        finally:
+            stop.set()
+            executor.shutdown(cancel_futures=True)
+
+    def _submit(
+        self,
+        executor: ProcessPoolExecutor,
+        subproblem: Subproblem[T],
+        limits: SearchStrategy.Limits,
+    ) -> Future[tuple[SearchStrategy.Result, Optional[Subproblem[T]]]]:
+        return executor.submit(_solve_subproblem, subproblem, limits)
+
+    def _split(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        subproblem: Subproblem[T],
+        stats: SearchStrategy.Stats,
+    ) -> Optional[list[Subproblem[T]]]:
+        """The children of subproblem, one per value of its MRV variable after
+        propagation, or None if it assigns every variable and is a solution."""
+        root = state.checkpoint()
+        try:
+            for var_id, value in subproblem:
+                state.variable(var_id).assign(value)
+            result = self._strategy.propagator().propagate(csp, state)
+            stats.propagations += 1
+            stats.propagator_stats += result.stats
+            if not result.success or not state.is_valid():
+                stats.failures += 1
+                return []
+            if state.is_complete():
+                return None if csp.is_satisfied(state) else []
+            variable = state.smallest_unassigned_variable()
+            return [subproblem + ((variable.id, value),) for value in variable.domain]
+        finally:
+            state.revert_to(root)
+
+    def _finish(
+        self,
+        state: State[T],
+        solution: Optional[Subproblem[T]],
+        stats: SearchStrategy.Stats,
+        start: float,
+        limit_reached: bool = False,
+    ) -> SearchStrategy.Result:
+        if solution is not None:
+            for var_id, value in solution:
+                state.variable(var_id).assign(value)
+        stats.elapsed_time = time.perf_counter() - start
+        return SearchStrategy.Result(
+            success=solution is not None, stats=stats, limit_reached=limit_reached
+        )
@@ -0,0 +1,223 @@
+from csp.games import Sudoku
+from csp.processing import CancellationToken, SearchStrategy
+from csp.processing.strategies import DepthFirstSearch, NogoodLearning, ParallelSearch
+from csp.processing.strategies import parallel_search
+from csp.processing.conftest import brute_force, make, random_problem, trap
+from csp.processing.propagators import AllDifferentGAC, ForwardChecking, NullPropagator
+from csp.model import CSP, Constraint
+from csp.state import State
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterable, Optional, override
+import concurrent.futures
+import itertools
+import multiprocessing
+import pickle
+import pytest
+import random
+import time
+
+hard = Sudoku.from_str(
+    """
+    8 . . . . . . . .
+    . . 3 6 . . . . .
+    . 7 . . 9 . 2 . .
+    . 5 . . . 7 . . .
+    . . . . 4 5 7 . .
+    . . . 1 . . . 3 .
+    . . 1 . . . . 6 8
+    . . 8 5 . . . 1 .
+    . 9 . . . . 4 . .
+    """
+)
+
+
+def test_model_pickles():
+    csp, state = hard.to_state()
+    state.checkpoint()
+    copy_csp, copy_state = pickle.loads(pickle.dumps((csp, state)))
+
+    assert DepthFirstSearch(AllDifferentGAC()).solve(copy_csp, copy_state).success
+    assert Sudoku.from_state(copy_csp, copy_state).satisfies_puzzle(hard)
+    assert not state.is_complete()
+
+
+def test_solves_sudoku():
+    # A small failure limit makes the workers hand subtrees back to be split.
+    strategy = ParallelSearch[int](
+        DepthFirstSearch(AllDifferentGAC()), workers=2, failure_limit=5
+    )
+    solution, stats = hard.solve(strategy)
+
+    assert solution.satisfies_puzzle(hard)
+    assert stats.failures >= 5
+
+
+def test_unsatisfiable():
+    csp, state = trap()
+    result = ParallelSearch[int](workers=2, subproblems_per_worker=2).solve(csp, state)
+
+    assert not result.success
+    assert not any(variable.is_assigned() for variable in state.variables())
+
+
+def test_solved_while_splitting():
+    csp, state = make({"a": {1, 2}, "b": {1, 2}}, [{"a", "b"}])
+    result = ParallelSearch[int](workers=8).solve(csp, state)
+
+    assert result.success
+    assert csp.is_satisfied(state)
+    assert all(variable.is_assigned() for variable in state.variables())
+
+
+def test_limits():
+    csp, state = hard.to_state()
+    cancellation = CancellationToken()
+    cancellation.cancel()
+
+    result = ParallelSearch[int](workers=2).solve(
+        csp, state, SearchStrategy.Limits(cancellation=cancellation)
+    )
+
+    assert not result.success and result.limit_reached
+    assert not state.is_complete()
+
+
+def test_keeps_a_solution_found_as_the_limits_run_out(monkeypatch: pytest.MonkeyPatch):
+    # Wait however long it takes for the subproblem, by which time the search
+    # has been cancelled.
+    def wait_for_one(
+        futures: Iterable[Future[Any]], timeout: Optional[float], return_when: str
+    ) -> tuple[set[Future[Any]], set[Future[Any]]]:
+        return concurrent.futures.wait(futures, return_when=return_when)
+
+    monkeypatch.setattr(parallel_search, "wait", wait_for_one)
+    csp, state = make({name: {1, 2, 3} for name in "abc"}, [{"a", "b", "c"}])
+    cancellation = CancellationToken()
+    cancellation.cancel()
+
+    result = ParallelSearch[int](workers=1, subproblems_per_worker=1).solve(
+        csp, state, SearchStrategy.Limits(cancellation=cancellation)
+    )
+
+    assert result.success and not result.limit_reached
+    assert csp.is_satisfied(state)
+
+
+class RecordingParallelSearch(ParallelSearch[int]):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.failure_limits = list[Optional[int]]()
+
+    @override
+    def _submit(
+        self,
+        executor: ProcessPoolExecutor,
+        subproblem: parallel_search.Subproblem[int],
+        limits: SearchStrategy.Limits,
+    ) -> Future[
+        tuple[SearchStrategy.Result, Optional[parallel_search.Subproblem[int]]]
+    ]:
+        self.failure_limits.append(limits.failures)
+        return super()._submit(executor, subproblem, limits)
+
+
+def test_split_subproblems_get_growing_failure_limits():
+    strategy = RecordingParallelSearch(
+        DepthFirstSearch(ForwardChecking()), workers=2, failure_limit=1
+    )
+    solution, _ = hard.solve(strategy)
+
+    assert solution.satisfies_puzzle(hard)
+    assert strategy.failure_limits[0] == 1
+    assert any(limit != 1 for limit in strategy.failure_limits)
+    assert all(
+        limit is not None and limit & (limit - 1) == 0
+        for limit in strategy.failure_limits
+    )
+
+
+def test_nogoods_of_one_subproblem_stay_out_of_the_next():
+    # A worker searches every subproblem on the same csp and state, from
+    # different root assignments, which the nogoods it learns depend on.
+    rng = random.Random(0)
+    for _ in range(100):
+        domains, scopes = random_problem(rng, variables=7, constraints=(1, 8))
+        solutions = brute_force(domains, scopes)
+        csp, state = make(domains, scopes)
+        csp.compile(state)
+        parallel_search._init_worker(
+            NogoodLearning(ForwardChecking()), csp, state, multiprocessing.Event()
+        )
+        for a, b in itertools.product(sorted(domains["a"]), sorted(domains["b"])):
+            result, _ = parallel_search._solve_subproblem(
+                ((0, a), (1, b)), SearchStrategy.Limits()
+            )
+            assert result.success == any(
+                values["a"] == a and values["b"] == b for values in solutions
+            )
+
+
+def test_nogood_learning_matches_brute_force():
+    rng = random.Random(1)
+    strategy = ParallelSearch[int](
+        NogoodLearning(ForwardChecking()), workers=2, failure_limit=2
+    )
+    for _ in range(5):
+        domains, scopes = random_problem(
+            rng, variables=7, constraints=(4, 8), min_domain_size=2
+        )
+        csp, state = make(domains, scopes)
+
+        result = strategy.solve(csp, state)
+
+        assert result.success == bool(brute_force(domains, scopes))
+        if result.success:
+            assert csp.is_satisfied(state)
+
+
+class PigeonsUnlessX(Constraint[int]):
+    """Pigeons can't share holes, unless x is 2."""
+
+    def __init__(self, pigeons: set[str]) -> None:
+        super().__init__(pigeons | {"x"})
+        self._pigeons = pigeons
+
+    def is_satisfied(self, state: State[int]) -> bool:
+        if state["x"].value() != 1:
+            return True
+        values = [
+            value
+            for name in self._pigeons
+            if (value := state[name].value()) is not None
+        ]
+        return len(values) == len(set(values))
+
+
+def test_stops_running_workers_on_a_solution():
+    # Subproblems with x = 1 run on until they're stopped, those with x = 2
+    # are solved straight away.
+    pigeons = {f"p{i}" for i in range(12)}
+    csp, state = make({"x": {1, 2}} | {name: set(range(11)) for name in pigeons}, [])
+    csp = CSP[int]([PigeonsUnlessX(pigeons)])
+    start = time.perf_counter()
+
+    result = ParallelSearch[int](
+        DepthFirstSearch(NullPropagator(), least_constraining_values=False),
+        workers=2,
+        subproblems_per_worker=1,
+        failure_limit=10**9,
+    ).solve(csp, state)
+
+    assert result.success and state["x"].value() == 2
+    assert time.perf_counter() - start < 30
+
+
+def test_stopped_worker_gives_up():
+    csp, state = hard.to_state()
+    stop = multiprocessing.Event()
+    stop.set()
+    parallel_search._init_worker(DepthFirstSearch(), csp, state, stop)
+
+    result, solution = parallel_search._solve_subproblem((), SearchStrategy.Limits())
+
+    assert result.limit_reached and solution is None
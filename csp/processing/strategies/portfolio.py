@@ -0,0 +1,145 @@
+from csp.model import CSP
+from csp.state import State
+from csp.processing import SearchStrategy
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Optional
+import dataclasses
+import multiprocessing
+import multiprocessing.queues
+import queue
+import time
+
+type _Outcome = tuple[str, SearchStrategy.Result, Optional[tuple[tuple[int, Any], ...]]]
+
+
+def _race(
+    name: str,
+    strategy: SearchStrategy[Any],
+    csp: CSP[Any],
+    state: State[Any],
+    limits: Optional[SearchStrategy.Limits],
+    outcomes: "multiprocessing.queues.Queue[_Outcome]",
+) -> None:
+    result = strategy.solve(csp, state, limits)
+    solution = None
+    if result.success:
+        solution = tuple(
+            (variable.id, variable.value()) for variable in state.variables()
+        )
+    outcomes.put((name, result, solution))
+
+
+class Portfolio[T](SearchStrategy[T]):
+    """Race several strategies, each in its own process, on the same problem.
+
+    The first strategy to decide the problem, by finding a solution or proving
+    there is none, wins: its solution is copied back into the state and the
+    other processes are terminated. The result is a Portfolio.Result naming
+    the winner. A strategy that stops at a limit doesn't decide anything, and
+    the race goes on without it.
+
+    Limits are passed on to every strategy, except for the cancellation token,
+    which, like the time limit, is checked while waiting for the race.
+    """
+
+    class Error(Exception): ...
+
+    @dataclass
+    class Result(SearchStrategy.Result):
+        """The stats are the winner's alone: the other strategies are
+        terminated before they can report theirs."""
+
+        # The name of the strategy that decided the problem, if any did.
+        winner: Optional[str] = None
+
+    _POLL_INTERVAL = 0.05
+
+    def __init__(self, strategies: Mapping[str, SearchStrategy[T]]) -> None:
+        if not strategies:
+            raise self.Error("a portfolio needs at least one strategy")
+        self._strategies = dict(strategies)
+
+    def solve(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> "Portfolio.Result":
+        start = time.perf_counter()
+        exhausted = None
+        if limits is not None:
+            exhausted = SearchStrategy.Limits(
+                time=limits.time, cancellation=limits.cancellation
+            ).exhausted(state, SearchStrategy.Stats())
+            limits = dataclasses.replace(limits, cancellation=None)
+        csp.compile(state)
+        # Forking a process with threads running can deadlock the child.
+        context = multiprocessing.get_context(
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else None
+        )
+        outcomes: multiprocessing.queues.Queue[_Outcome] = context.Queue()
+        processes = [
+            context.Process(
+                target=_race, args=(name, strategy, csp, state, limits, outcomes)
+            )
+            for name, strategy in self._strategies.items()
+        ]
+        for process in processes:
+            process.start()
+        try:
+            winner = self._wait(processes, outcomes, exhausted)
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+            outcomes.close()
+
+        if winner is None:
+            stats = SearchStrategy.Stats()
+            stats.elapsed_time = time.perf_counter() - start
+            return Portfolio.Result(success=False, stats=stats, limit_reached=True)
+        name, result, solution = winner
+        if solution is not None:
+            for var_id, value in solution:
+                state.variable(var_id).assign(value)
+        result.stats.elapsed_time = time.perf_counter() - start
+        return Portfolio.Result(
+            stats=result.stats,
+            success=result.success,
+            limit_reached=result.limit_reached,
+            winner=name,
+        )
+
+    def _wait(
+        self,
+        processes: Sequence[BaseProcess],
+        outcomes: "multiprocessing.queues.Queue[_Outcome]",
+        exhausted: Optional[Callable[[], bool]],
+    ) -> Optional[_Outcome]:
+        """The first outcome that decides the problem, or None if every
+        strategy stopped at a limit or exhausted says the limits are reached."""
+        remaining = len(processes)
+        while remaining:
+            try:
+                outcome = outcomes.get(timeout=self._POLL_INTERVAL)
+            except queue.Empty:
+                if exhausted is not None and exhausted():
+                    return None
+                if any(process.is_alive() for process in processes):
+                    continue
+                # Anything put before the processes exited is readable by now.
+                try:
+                    outcome = outcomes.get(timeout=self._POLL_INTERVAL)
+                except queue.Empty:
+                    raise self.Error(
+                        f"{remaining} strategies exited without a result"
+                    ) from None
+            remaining -= 1
+            if not outcome[1].limit_reached:
+                return outcome
+        return None
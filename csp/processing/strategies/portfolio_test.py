@@ -0,0 +1,92 @@
+from csp.games import Sudoku
+from csp.model import CSP
+from csp.processing import SearchStrategy
+from csp.processing.strategies import DepthFirstSearch, Portfolio
+from csp.processing.conftest import trap
+from csp.processing.propagators import AllDifferentGAC
+from csp.state import State
+from typing import Optional
+import pytest
+import time
+
+puzzle = Sudoku.from_str(
+    """
+    8 . . . . . . . .
+    . . 3 6 . . . . .
+    . 7 . . 9 . 2 . .
+    . 5 . . . 7 . . .
+    . . . . 4 5 7 . .
+    . . . 1 . . . 3 .
+    . . 1 . . . . 6 8
+    . . 8 5 . . . 1 .
+    . 9 . . . . 4 . .
+    """
+)
+
+
+class Stalls(SearchStrategy[int]):
+    def solve(
+        self,
+        csp: CSP[int],
+        state: State[int],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
+        time.sleep(60)
+        return SearchStrategy.Result(success=False)
+
+
+class GivesUp(SearchStrategy[int]):
+    def solve(
+        self,
+        csp: CSP[int],
+        state: State[int],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
+        return SearchStrategy.Result(success=False, limit_reached=True)
+
+
+def test_first_solution_wins():
+    portfolio = Portfolio[int](
+        {"stalls": Stalls(), "gac": DepthFirstSearch(AllDifferentGAC())}
+    )
+    csp, state = puzzle.to_state()
+    start = time.perf_counter()
+    result = portfolio.solve(csp, state)
+
+    assert time.perf_counter() - start < 30
+    assert result.success and result.winner == "gac"
+    assert Sudoku.from_state(csp, state).satisfies_puzzle(puzzle)
+    assert result.stats.state_visits > 0
+
+
+def test_unsatisfiable():
+    csp, state = trap()
+    result = Portfolio[int]({"gives up": GivesUp(), "dfs": DepthFirstSearch()}).solve(
+        csp, state
+    )
+
+    assert not result.success and not result.limit_reached
+    assert result.winner == "dfs"
+
+
+def test_every_strategy_gives_up():
+    csp, state = trap()
+    result = Portfolio[int]({"gives up": GivesUp()}).solve(csp, state)
+
+    assert not result.success and result.limit_reached
+    assert result.winner is None
+
+
+def test_needs_a_strategy():
+    with pytest.raises(Portfolio.Error):
+        Portfolio[int]({})
+
+
+def test_time_limit():
+    start = time.perf_counter()
+    with pytest.raises(Sudoku.Error):
+        puzzle.solve(
+            Portfolio[int]({"stalls": Stalls()}), SearchStrategy.Limits(time=0.2)
+        )
+
+    assert time.perf_counter() - start < 30
@@ -0,0 +1,113 @@
+from csp.model import CSP
+from csp.state import State
+from csp.processing import SearchStrategy
+from csp.processing.strategies.depth_first_search import DepthFirstSearch
+from enum import Enum
+from typing import Optional
+import time
+
+
+def luby(i: int) -> int:
+    """The i-th term (from 0) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ..."""
+    i += 1
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class Restarts[T](SearchStrategy[T]):
+    """Run a randomized DepthFirstSearch with growing failure cutoffs.
+
+    Each run stops after a number of dead ends given by the schedule, times
+    scale, and the state is reverted to where it was before the first run. The
+    search keeps its learned constraint weights between runs, and is seeded
+    once per solve, so results are reproducible for a given seed.
+
+    Limits apply to all the runs together, apart from the trail, which is
+    limited in each run.
+    """
+
+    class Error(Exception): ...
+
+    class Schedule(Enum):
+        LUBY = "luby"
+        GEOMETRIC = "geometric"
+
+    def __init__(
+        self,
+        strategy: Optional[DepthFirstSearch[T]] = None,
+        schedule: "Restarts.Schedule" = Schedule.LUBY,
+        scale: int = 32,
+        factor: float = 1.5,
+        seed: int = 0,
+    ) -> None:
+        if scale < 1:
+            raise self.Error(f"scale {scale} must be at least 1")
+        if schedule is Restarts.Schedule.GEOMETRIC and factor < 1:
+            raise self.Error(f"factor {factor} must be at least 1")
+        self._strategy: DepthFirstSearch[T] = (
+            strategy if strategy is not None else DepthFirstSearch(weighted_degree=True)
+        )
+        self._schedule = schedule
+        self._scale = scale
+        self._factor = factor
+        self._seed = seed
+
+    def cutoff(self, run: int) -> int:
+        """The failure limit of run, counting from 0."""
+        if self._schedule is Restarts.Schedule.LUBY:
+            return self._scale * luby(run)
+        return max(1, round(self._scale * self._factor**run))
+
+    def solve(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
+        start = time.perf_counter()
+        stats = SearchStrategy.Stats()
+        if limits is None:
+            limits = SearchStrategy.Limits()
+        root = state.checkpoint()
+        self._strategy.seed(self._seed)
+        while True:
+            cutoff = self.cutoff(stats.restarts)
+            result = self._strategy.solve(
+                csp, state, self._run_limits(limits, stats, start, cutoff)
+            )
+            stats += result.stats
+            stats.elapsed_time = time.perf_counter() - start
+            if not result.limit_reached or result.stats.failures < cutoff:
+                return SearchStrategy.Result(
+                    success=result.success,
+                    stats=stats,
+                    limit_reached=result.limit_reached,
+                )
+            state.revert_to(root)
+            stats.restarts += 1
+
+    def _run_limits(
+        self,
+        limits: SearchStrategy.Limits,
+        stats: SearchStrategy.Stats,
+        start: float,
+        cutoff: int,
+    ) -> SearchStrategy.Limits:
+        """The limits of the next run: its cutoff, or less if that's all that's
+        left of limits after the runs counted in stats."""
+
+        def left[N: (int, float)](limit: Optional[N], used: N) -> Optional[N]:
+            return None if limit is None else max(limit - used, 0)
+
+        failures = left(limits.failures, stats.failures)
+        return SearchStrategy.Limits(
+            failures=cutoff if failures is None else min(failures, cutoff),
+            nodes=left(limits.nodes, stats.state_visits),
+            propagations=left(limits.propagations, stats.propagations),
+            time=left(limits.time, time.perf_counter() - start),
+            trail=limits.trail,
+            cancellation=limits.cancellation,
+        )
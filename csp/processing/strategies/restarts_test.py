@@ -0,0 +1,152 @@
+from csp.games import Sudoku
+from csp.processing import SearchStrategy
+from csp.processing.strategies import DepthFirstSearch, Restarts
+from csp.processing.strategies.restarts import luby
+from csp.processing.propagators import AllDifferentGAC, NullPropagator
+from csp.state import Domain, Variable, State
+from csp.delta import DeltaRecord
+from csp.model import CSP
+from csp.model.constraints import AllDifferent
+import asyncio
+import pytest
+
+hard = Sudoku.from_str(
+    """
+    8 . . . . . . . .
+    . . 3 6 . . . . .
+    . 7 . . 9 . 2 . .
+    . 5 . . . 7 . . .
+    . . . . 4 5 7 . .
+    . . . 1 . . . 3 .
+    . . 1 . . . . 6 8
+    . . 8 5 . . . 1 .
+    . 9 . . . . 4 . .
+    """
+)
+
+
+def gac_restarts(scale: int, seed: int = 0) -> Restarts[int]:
+    return Restarts(
+        DepthFirstSearch(AllDifferentGAC(), weighted_degree=True),
+        scale=scale,
+        seed=seed,
+    )
+
+
+def test_luby():
+    assert [luby(i) for i in range(15)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+def test_cutoffs():
+    assert [Restarts[int](scale=10).cutoff(run) for run in range(4)] == [
+        10,
+        10,
+        20,
+        10,
+    ]
+    assert [
+        Restarts[int](schedule=Restarts.Schedule.GEOMETRIC, scale=10).cutoff(run)
+        for run in range(4)
+    ] == [10, 15, 22, 34]
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(Restarts.Error):
+        Restarts[int](scale=0)
+    with pytest.raises(Restarts.Error):
+        Restarts[int](schedule=Restarts.Schedule.GEOMETRIC, factor=0.5)
+    Restarts[int](factor=0.5)
+
+
+def test_solves_with_restarts():
+    solution, stats = hard.solve(gac_restarts(scale=1))
+
+    assert solution.satisfies_puzzle(hard)
+    assert stats.restarts > 0
+    assert stats.constraint_weights
+
+
+def test_deterministic_for_seed():
+    def run(seed: int) -> tuple[int, int, Sudoku]:
+        solution, stats = hard.solve(gac_restarts(scale=1, seed=seed))
+        return stats.state_visits, stats.restarts, solution
+
+    assert run(1) == run(1)
+
+
+def test_reverts_between_runs():
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, name, Domain(delta_record, {1, 2, 3}))
+            for name in "abcd"
+        ],
+    )
+    csp = CSP(
+        [AllDifferent({"a", "b", "c"})] + [AllDifferent({name, "d"}) for name in "abc"]
+    )
+
+    result = Restarts[int](DepthFirstSearch(), scale=1).solve(csp, state)
+
+    assert not result.success
+    assert not result.limit_reached
+    assert result.stats.restarts > 0
+    assert all(not variable.is_assigned() for variable in state.variables())
+
+
+def test_failure_limit():
+    csp, state = hard.to_state()
+    checkpoint = state.checkpoint()
+
+    result = DepthFirstSearch[int](seed=0).solve(
+        csp, state, SearchStrategy.Limits(failures=1)
+    )
+
+    assert not result.success
+    assert result.limit_reached
+    assert result.stats.failures == 1
+    assert sum(variable.is_assigned() for variable in state.variables()) == sum(
+        value != 0 for value in hard.values()
+    )
+    assert state.checkpoint() == checkpoint
+
+
+def test_limits_span_runs():
+    csp, state = hard.to_state()
+    checkpoint = state.checkpoint()
+
+    result = Restarts[int](DepthFirstSearch(), scale=2).solve(
+        csp, state, SearchStrategy.Limits(nodes=50)
+    )
+
+    assert not result.success and result.limit_reached
+    assert result.stats.restarts > 0
+    assert result.stats.state_visits <= 50 + result.stats.restarts
+    assert state.checkpoint() == checkpoint
+
+
+def test_solve_async():
+    csp, state = hard.to_state()
+    result = asyncio.run(gac_restarts(scale=4).solve_async(csp, state))
+
+    assert result.success
+    assert Sudoku.from_state(csp, state).satisfies_puzzle(hard)
+
+
+def test_solve_async_cancel_stops_the_search():
+    csp, state = hard.to_state()
+    checkpoint = state.checkpoint()
+
+    async def cancel() -> None:
+        task = asyncio.create_task(
+            Restarts[int](DepthFirstSearch(NullPropagator())).solve_async(csp, state)
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+
+    assert state.checkpoint() == checkpoint
@@ -0,0 +1,146 @@
+from csp.model import CSP, Constraint
+from csp.state import State
+from csp.processing import SearchStrategy
+from csp.processing.strategies.cdcl_solver import CDCLSolver
+from collections.abc import Sequence
+from enum import Enum
+from typing import Optional
+import itertools
+import math
+import time
+
+
+class SatSearch[T](SearchStrategy[T]):
+    """Encode the CSP as CNF and solve it with CDCLSolver.
+
+    There is a boolean for each value in each variable's domain, or only for
+    its value if it's assigned, with a clause that at least one holds and an
+    at-most-one constraint over them. Constraints that are pairwise not equal,
+    like AllDifferent, get an at-most-one constraint over the booleans for each
+    value, and when the scope has exactly as many values as variables, also a
+    clause that the value is used. Any other constraint is encoded as a clause
+    against each tuple of scope values it forbids, of which there can be up to
+    max_tuples, found by checking is_satisfied on the whole product of the
+    scope's domains.
+
+    At-most-one constraints are pairwise binary clauses, or, over more than
+    four literals, Sinz's sequential counter, which is linear in size at the
+    cost of an extra boolean per literal.
+
+    The state is only assigned the solution. Limits on the trail don't apply.
+    """
+
+    class Error(Exception): ...
+
+    class Encoding(Enum):
+        PAIRWISE = "pairwise"
+        SEQUENTIAL = "sequential"
+
+    def __init__(
+        self,
+        encoding: "SatSearch.Encoding" = Encoding.PAIRWISE,
+        max_tuples: int = 10000,
+        decay: float = 0.95,
+        restart_scale: int = 100,
+    ) -> None:
+        self._encoding = encoding
+        self._max_tuples = max_tuples
+        self._decay = decay
+        self._restart_scale = restart_scale
+
+    def solve(
+        self,
+        csp: CSP[T],
+        state: State[T],
+        limits: Optional[SearchStrategy.Limits] = None,
+    ) -> SearchStrategy.Result:
+        start = time.perf_counter()
+        stats = SearchStrategy.Stats()
+        exhausted = limits.exhausted(state, stats) if limits is not None else None
+        solver = CDCLSolver(self._decay, self._restart_scale)
+        literals = self._encode(csp, state, solver)
+        satisfiable = solver.solve(stats, exhausted)
+        if satisfiable:
+            for variable, variable_literals in zip(state.variables(), literals):
+                if variable.is_assigned():
+                    continue
+                for value, literal in variable_literals.items():
+                    if solver.value(literal):
+                        variable.assign(value)
+                        break
+        stats.elapsed_time = time.perf_counter() - start
+        return SearchStrategy.Result(
+            success=satisfiable is True,
+            stats=stats,
+            limit_reached=satisfiable is None,
+        )
+
+    def _encode(
+        self, csp: CSP[T], state: State[T], solver: CDCLSolver
+    ) -> list[dict[T, int]]:
+        """Add the clauses of the CSP in state to solver, returning the literal
+        for each value of each variable, by id."""
+        csp.compile(state)
+        literals = list[dict[T, int]]()
+        for variable in state.variables():
+            value = variable.value()
+            values = [value] if value is not None else list(variable.domain)
+            literals.append({value: solver.new_variable() for value in values})
+            solver.add_clause(literals[-1].values())
+            self._at_most_one(solver, list(literals[-1].values()))
+
+        for constraint in csp.constraints():
+            scope = constraint.scope_ids()
+            if constraint.is_pairwise_not_equal():
+                values = dict[T, list[int]]()
+                for var_id in scope:
+                    for value, literal in literals[var_id].items():
+                        values.setdefault(value, []).append(literal)
+                if len(values) < len(scope):
+                    solver.add_clause([])
+                for value_literals in values.values():
+                    self._at_most_one(solver, value_literals)
+                    if len(values) == len(scope):
+                        solver.add_clause(value_literals)
+            else:
+                self._forbid(solver, state, constraint, [literals[i] for i in scope])
+        return literals
+
+    def _forbid(
+        self,
+        solver: CDCLSolver,
+        state: State[T],
+        constraint: Constraint[T],
+        scope_literals: Sequence[dict[T, int]],
+    ) -> None:
+        tuples = math.prod(len(literals) for literals in scope_literals)
+        if tuples > self._max_tuples:
+            raise self.Error(
+                f"{type(constraint).__name__} has {tuples} tuples to check, "
+                f"more than {self._max_tuples}"
+            )
+        scope = [state.variable(var_id) for var_id in constraint.scope_ids()]
+        for values in itertools.product(*scope_literals):
+            with state.maintain_state():
+                for variable, value in zip(scope, values):
+                    variable.assign(value)
+                satisfied = constraint.is_satisfied(state)
+            if not satisfied:
+                solver.add_clause(
+                    -literals[value] for literals, value in zip(scope_literals, values)
+                )
+
+    def _at_most_one(self, solver: CDCLSolver, literals: Sequence[int]) -> None:
+        if self._encoding is SatSearch.Encoding.PAIRWISE or len(literals) <= 4:
+            for i, first in enumerate(literals):
+                for second in literals[i + 1 :]:
+                    solver.add_clause([-first, -second])
+            return
+        # counter[i] holds if any of the first i + 1 literals does.
+        counter = [solver.new_variable() for _ in literals[:-1]]
+        solver.add_clause([-literals[0], counter[0]])
+        for i in range(1, len(literals) - 1):
+            solver.add_clause([-literals[i], counter[i]])
+            solver.add_clause([-counter[i - 1], counter[i]])
+            solver.add_clause([-literals[i], -counter[i - 1]])
+        solver.add_clause([-literals[-1], -counter[-1]])
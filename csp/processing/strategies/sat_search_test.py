@@ -0,0 +1,88 @@
+from csp.games import Sudoku
+from csp.processing import CancellationToken, SearchStrategy
+from csp.processing.strategies import SatSearch
+from csp.processing.conftest import LessThan, brute_force, make, random_problem, trap
+from csp.model import CSP
+import pytest
+import random
+
+hard = Sudoku.from_str(
+    """
+    8 . . . . . . . .
+    . . 3 6 . . . . .
+    . 7 . . 9 . 2 . .
+    . 5 . . . 7 . . .
+    . . . . 4 5 7 . .
+    . . . 1 . . . 3 .
+    . . 1 . . . . 6 8
+    . . 8 5 . . . 1 .
+    . 9 . . . . 4 . .
+    """
+)
+
+
+@pytest.mark.parametrize("encoding", list(SatSearch.Encoding))
+def test_solves_sudoku(encoding: SatSearch.Encoding):
+    solution, stats = hard.solve(SatSearch[int](encoding))
+
+    assert solution.satisfies_puzzle(hard)
+    assert stats.failures > 0
+
+
+@pytest.mark.parametrize("encoding", list(SatSearch.Encoding))
+def test_matches_brute_force(encoding: SatSearch.Encoding):
+    rng = random.Random(3)
+    for _ in range(100):
+        domains, scopes = random_problem(
+            rng, values=6, scope_size=(2, 6), constraints=(1, 4)
+        )
+        csp, state = make(domains, scopes)
+
+        result = SatSearch[int](encoding).solve(csp, state)
+
+        satisfiable = bool(brute_force(domains, scopes))
+        assert result.success == satisfiable
+        if result.success:
+            assert csp.is_satisfied(state)
+            assert all(variable.is_assigned() for variable in state.variables())
+
+
+def test_unsatisfiable():
+    csp, state = trap()
+    result = SatSearch[int]().solve(csp, state)
+
+    assert not result.success and not result.limit_reached
+    assert not any(variable.is_assigned() for variable in state.variables())
+
+
+def test_does_not_enumerate_solutions():
+    csp, state = make({"a": {1, 2}}, [])
+    with pytest.raises(NotImplementedError):
+        SatSearch[int]().is_unique(csp, state)
+
+
+def test_other_constraints():
+    _, state = make({name: {1, 2, 3} for name in "abc"}, [])
+    csp = CSP[int]([LessThan("a", "b"), LessThan("b", "c")])
+
+    assert SatSearch[int]().solve(csp, state).success
+    assert [variable.value() for variable in state.variables()] == [1, 2, 3]
+
+
+def test_too_many_tuples():
+    _, state = make({name: set(range(10)) for name in "ab"}, [])
+    with pytest.raises(SatSearch.Error):
+        SatSearch[int](max_tuples=50).solve(CSP[int]([LessThan("a", "b")]), state)
+
+
+def test_limits():
+    csp, state = hard.to_state()
+    cancellation = CancellationToken()
+    cancellation.cancel()
+
+    result = SatSearch[int]().solve(
+        csp, state, SearchStrategy.Limits(cancellation=cancellation)
+    )
+
+    assert not result.success and result.limit_reached
+    assert not state.is_complete()
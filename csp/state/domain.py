@@ -1,41 +1,16 @@
-from csp.delta import Delta, DeltaObject, DeltaRecord, Noop
-from typing import override, Iterator
+from csp.delta import DeltaObject, DeltaRecord, Noop
+from typing import Callable, Optional, cast, override, Iterator
 from collections.abc import Set
 
 
-class DomainAddValue[T](Delta["Domain[T]"]):
-    def __init__(self, object: "Domain[T]", value: T) -> None:
-        super().__init__(object)
-        self._value = value
-
-    @override
-    def apply(self) -> None:
-        self._object._add_value(self._value)
-
-    @override
-    def revert(self) -> None:
-        self._object._remove_value(self._value)
-
-
-class DomainRemoveValue[T](Delta["Domain[T]"]):
-    def __init__(self, object: "Domain[T]", value: T) -> None:
-        super().__init__(object)
-        self._value = value
-
-    @override
-    def apply(self) -> None:
-        self._object._remove_value(self._value)
-
-    @override
-    def revert(self) -> None:
-        self._object._add_value(self._value)
-
-
 class Domain[T](DeltaObject, Set[T]):
-    class Error(Exception): ...
+    class Error(DeltaObject.Error): ...
 
     class ValueError(Error, ValueError): ...
 
+    _ADD_VALUE = 0
+    _REMOVE_VALUE = 1
+
     def __init__(
         self,
         delta_record: DeltaRecord,
@@ -43,6 +18,7 @@ class Domain[T](DeltaObject, Set[T]):
     ) -> None:
         super().__init__(delta_record)
         self._values = set(values)
+        self._on_resize: Optional[Callable[[int], None]] = None
 
     @override
     def __contains__(self, value: object) -> bool:
@@ -64,7 +40,7 @@ class Domain[T](DeltaObject, Set[T]):
         if value in self:
             self.apply(Noop())
         else:
-            self.apply(DomainAddValue[T](self, value))
+            self._change(self._ADD_VALUE, value)
 
     def _add_value(self, value: T) -> None:
         self._values.add(value)
@@ -72,7 +48,28 @@ class Domain[T](DeltaObject, Set[T]):
     def remove_value(self, value: T) -> None:
         if value not in self:
             raise self.ValueError(f"Value {value} not in domain {self}")
-        self.apply(DomainRemoveValue[T](self, value))
+        self._change(self._REMOVE_VALUE, value)
 
     def _remove_value(self, value: T) -> None:
         self._values.remove(value)
+
+    @override
+    def _apply_change(self, opcode: int, value: object) -> object:
+        size = len(self._values)
+        if opcode == self._ADD_VALUE:
+            self._add_value(cast(T, value))
+        else:
+            self._remove_value(cast(T, value))
+        if self._on_resize is not None:
+            self._on_resize(size)
+        return value
+
+    @override
+    def _revert_change(self, opcode: int, payload: object) -> None:
+        size = len(self._values)
+        if opcode == self._ADD_VALUE:
+            self._remove_value(cast(T, payload))
+        else:
+            self._add_value(cast(T, payload))
+        if self._on_resize is not None:
+            self._on_resize(size)
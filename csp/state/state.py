@@ -1,25 +1,106 @@
 from csp.state.variable import Variable
 from csp.delta import DeltaObject, DeltaRecord
 from typing import Iterable, Iterator, override
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence, Set
+import heapq
 
 
 class State[T](DeltaObject, Mapping[str, Variable[T]]):
-    class Error(Exception): ...
+    class Error(DeltaObject.Error): ...
 
     class KeyError(Error, KeyError): ...
 
+    class Changes:
+        """Ids of variables changed since it was opened or last cleared, kept
+        for one reader so that readers don't clear each other's changes. The
+        state adds to it until it's closed, which a with block does on exit."""
+
+        def __init__(self, readers: list[set[int]], ids: Iterable[int]) -> None:
+            self._ids = set(ids)
+            self._readers = readers
+            readers.append(self._ids)
+
+        def __enter__(self) -> "State.Changes":
+            return self
+
+        def __exit__(self, *_: object) -> None:
+            self.close()
+
+        def ids(self) -> Set[int]:
+            return self._ids
+
+        def clear(self) -> None:
+            self._ids.clear()
+
+        def close(self) -> None:
+            # By identity, as another reader's ids may be equal.
+            for index, ids in enumerate(self._readers):
+                if ids is self._ids:
+                    del self._readers[index]
+                    return
+
     def __init__(
         self,
         delta_record: DeltaRecord,
         variables: Iterable[Variable[T]],
     ) -> None:
         super().__init__(delta_record)
+        variables = list(variables)
         if not all(
             variable._delta_record is self._delta_record for variable in variables
         ):
             raise self.Error("Delta record mismatch between variables and state")
         self._variables: dict[str, Variable[T]] = {v.name: v for v in variables}
+        self._variables_by_id = list(self._variables.values())
+        self._unassigned_count = 0
+        self._empty_domain_count = 0
+        self._unassigned_by_domain_size = list[set[int]]()
+        # The ids of each bucket as a min-heap, which may still hold ids that
+        # have since left the bucket, so that ties are broken by id in O(log n).
+        self._unassigned_heaps_by_domain_size = list[list[int]]()
+        self._changed_readers = list[set[int]]()
+        self._modified_readers = list[set[int]]()
+        for variable_id, variable in enumerate(self._variables_by_id):
+            variable.id = variable_id
+            size = variable.domain_size()
+            if size == 0:
+                self._empty_domain_count += 1
+            if variable._value is None:
+                self._unassigned_count += 1
+                self._add_unassigned(variable_id, size)
+            variable._observe(self._variable_changed)
+
+    def _add_unassigned(self, variable_id: int, size: int) -> None:
+        buckets = self._unassigned_by_domain_size
+        heaps = self._unassigned_heaps_by_domain_size
+        while len(buckets) <= size:
+            buckets.append(set())
+            heaps.append([])
+        bucket, heap = buckets[size], heaps[size]
+        bucket.add(variable_id)
+        heapq.heappush(heap, variable_id)
+        if len(heap) > 2 * len(bucket):
+            heap[:] = bucket
+            heapq.heapify(heap)
+
+    def _variable_changed(
+        self, variable: Variable[T], was_assigned: bool, old_size: int
+    ) -> None:
+        size = len(variable.domain)
+        for ids in self._modified_readers:
+            ids.add(variable.id)
+        if not was_assigned:
+            self._unassigned_by_domain_size[old_size].remove(variable.id)
+            self._unassigned_count -= 1
+        if variable._value is None:
+            self._add_unassigned(variable.id, size)
+            self._unassigned_count += 1
+        if size != old_size:
+            self._empty_domain_count += (size == 0) - (old_size == 0)
+        else:
+            # Domain changes always resize the domain, so this was an assignment.
+            for ids in self._changed_readers:
+                ids.add(variable.id)
 
     @override
     def __len__(self) -> int:
@@ -36,17 +117,57 @@ class State[T](DeltaObject, Mapping[str, Variable[T]]):
         except KeyError as e:
             raise self.KeyError(f"Variable {name} not found") from e
 
+    def variable(self, id: int) -> Variable[T]:
+        return self._variables_by_id[id]
+
+    def id(self, name: str) -> int:
+        return self[name].id
+
     def assign(self, name: str, value: T) -> None:
         self[name].assign(value)
 
     def unassign(self, name: str) -> None:
         self[name].unassign()
 
-    def variables(self) -> Iterable[Variable[T]]:
-        return self.values()
+    def variables(self) -> Sequence[Variable[T]]:
+        return self._variables_by_id
 
     def unassigned_variables(self) -> Iterable[Variable[T]]:
-        return (v for v in self._variables.values() if not v.is_assigned())
+        return (v for v in self._variables_by_id if v._value is None)
+
+    def track_changed_variable_ids(self, ids: Iterable[int] = ()) -> "State.Changes":
+        """Start tracking the ids of variables assigned or unassigned, starting
+        from ids. Reverted assignments count as changes."""
+        return State.Changes(self._changed_readers, ids)
+
+    def track_modified_variable_ids(self, ids: Iterable[int] = ()) -> "State.Changes":
+        """Start tracking the ids of variables assigned, unassigned or with a
+        domain change, starting from ids. Reverted changes count as changes."""
+        return State.Changes(self._modified_readers, ids)
+
+    def unassigned_count(self) -> int:
+        return self._unassigned_count
+
+    def is_complete(self) -> bool:
+        return self._unassigned_count == 0
+
+    def smallest_unassigned_variable(self) -> Variable[T]:
+        """The unassigned variable with the fewest domain values, ties broken by id."""
+        for bucket, heap in zip(
+            self._unassigned_by_domain_size, self._unassigned_heaps_by_domain_size
+        ):
+            if bucket:
+                while heap[0] not in bucket:
+                    heapq.heappop(heap)
+                return self._variables_by_id[heap[0]]
+        raise self.Error("No unassigned variables")
+
+    def smallest_unassigned_variable_ids(self) -> Set[int]:
+        """Ids of all unassigned variables with the fewest domain values."""
+        for bucket in self._unassigned_by_domain_size:
+            if bucket:
+                return bucket
+        raise self.Error("No unassigned variables")
 
     def is_valid(self) -> bool:
-        return all(v.domain_size() > 0 for v in self._variables.values())
+        return self._empty_domain_count == 0
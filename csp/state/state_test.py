@@ -1,8 +1,9 @@
 from csp.state.state import State
 from csp.state.variable import Variable
 from csp.state.domain import Domain
-from csp.delta import DeltaRecord
+from csp.delta import DeltaRecord, CompactDeltaRecord
 import pytest
+import random
 
 
 def test_mapping():
@@ -152,3 +153,112 @@ def test_nested_maintain_state():
 
     # Outer context reverted
     assert state["a"].value() is None
+
+
+def test_variable_ids():
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, "a", Domain(delta_record, {1})),
+            Variable(delta_record, "b", Domain(delta_record, {2})),
+        ],
+    )
+    assert [state.id(name) for name in state] == [0, 1]
+    assert state.variable(state.id("b")) is state["b"]
+    assert [v.id for v in state.variables()] == [0, 1]
+
+
+@pytest.mark.parametrize("delta_record_type", [DeltaRecord, CompactDeltaRecord])
+def test_bookkeeping(delta_record_type):
+    delta_record = delta_record_type()
+    a = Variable(delta_record, "a", Domain(delta_record, {1, 2, 3}), 1)
+    b = Variable(delta_record, "b", Domain(delta_record, {1, 2, 3}))
+    c = Variable(delta_record, "c", Domain(delta_record, {1, 2}))
+    state = State(delta_record, [a, b, c])
+    assert state.unassigned_count() == 2
+    assert not state.is_complete()
+    assert state.is_valid()
+    assert state.smallest_unassigned_variable() is c
+
+    with state.maintain_state():
+        b.remove_value_from_domain(1)
+        b.remove_value_from_domain(2)
+        assert state.smallest_unassigned_variable() is b
+        c.assign(1)
+        b.assign(3)
+        assert state.is_complete()
+        c.remove_value_from_domain(1)
+        c.remove_value_from_domain(2)
+        assert not state.is_valid()
+
+    assert state.is_valid()
+    assert state.unassigned_count() == 2
+    assert state.smallest_unassigned_variable() is c
+    a.unassign()
+    assert state.unassigned_count() == 3
+    with pytest.raises(State.Error):
+        State(DeltaRecord(), []).smallest_unassigned_variable()
+
+
+def test_smallest_unassigned_variable_breaks_ties_by_id():
+    rng = random.Random(0)
+    delta_record = DeltaRecord()
+    state = State(
+        delta_record,
+        [
+            Variable(delta_record, str(i), Domain(delta_record, set(range(4))))
+            for i in range(8)
+        ],
+    )
+    checkpoints = list[int]()
+    for _ in range(2000):
+        variable = rng.choice(state.variables())
+        action = rng.randrange(4)
+        if action == 0 and checkpoints:
+            state.revert_to(checkpoints.pop())
+        elif action == 1:
+            checkpoints.append(state.checkpoint())
+        elif variable.is_assigned():
+            variable.unassign()
+        elif action == 2 and variable.domain_size() > 1:
+            variable.remove_value_from_domain(rng.choice(list(variable.domain)))
+        else:
+            variable.assign(rng.choice(list(variable.domain)))
+        unassigned = list(state.unassigned_variables())
+        if unassigned:
+            assert state.smallest_unassigned_variable() is min(
+                unassigned, key=lambda v: (v.domain_size(), v.id)
+            )
+
+
+def test_changed_variable_ids():
+    delta_record = DeltaRecord()
+    a = Variable(delta_record, "a", Domain(delta_record, {1, 2, 3}))
+    b = Variable(delta_record, "b", Domain(delta_record, {1, 2, 3}))
+    state = State(delta_record, [a, b])
+    changed = state.track_changed_variable_ids([a.id, b.id])
+    assert changed.ids() == {a.id, b.id}
+    changed.clear()
+    b.remove_value_from_domain(1)
+    assert changed.ids() == set()
+    with state.maintain_state():
+        a.assign(1)
+    assert changed.ids() == {a.id}
+
+
+def test_change_readers_are_independent():
+    delta_record = DeltaRecord()
+    a = Variable(delta_record, "a", Domain(delta_record, {1, 2, 3}))
+    b = Variable(delta_record, "b", Domain(delta_record, {1, 2, 3}))
+    state = State(delta_record, [a, b])
+    first = state.track_modified_variable_ids()
+    with state.track_modified_variable_ids() as second:
+        a.assign(1)
+        first.clear()
+        b.remove_value_from_domain(1)
+        assert first.ids() == {b.id}
+        assert second.ids() == {a.id, b.id}
+    a.unassign()
+    assert first.ids() == {a.id, b.id}
+    assert second.ids() == {a.id, b.id}
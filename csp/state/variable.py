@@ -1,30 +1,17 @@
-from csp.delta import DeltaObject, DeltaRecord, Delta
+from csp.delta import DeltaObject, DeltaRecord
 from csp.state.domain import Domain
-from typing import Optional, override
-
-
-class VariableAssign[T](Delta["Variable[T]"]):
-    def __init__(self, obj: "Variable[T]", value: Optional[T]) -> None:
-        super().__init__(obj)
-        self._value = value
-        self._previous = obj._value
-
-    @override
-    def apply(self) -> None:
-        self._object._value = self._value
-
-    @override
-    def revert(self) -> None:
-        self._object._value = self._previous
+from typing import Callable, Optional, cast, override
 
 
 class Variable[T](DeltaObject):
-    class Error(Exception): ...
+    class Error(DeltaObject.Error): ...
 
     class ValueError(Error, ValueError): ...
 
     class DomainError(Error): ...
 
+    _ASSIGN = 0
+
     def __init__(
         self,
         delta_record: DeltaRecord,
@@ -34,6 +21,7 @@ class Variable[T](DeltaObject):
     ) -> None:
         super().__init__(delta_record)
         self.name = name
+        self.id = -1
         self.domain = domain
         if self._delta_record is not self.domain._delta_record:
             raise self.Error(
@@ -42,11 +30,37 @@ class Variable[T](DeltaObject):
         if value is not None and value not in self.domain:
             raise self.ValueError(f"Value {value} not in domain {self.domain}")
         self._value: Optional[T] = value
+        self._on_change: Optional[Callable[[Variable[T], bool, int], None]] = None
+
+    def _observe(self, on_change: Callable[["Variable[T]", bool, int], None]) -> None:
+        """Call on_change(variable, was_assigned, old_domain_size) after every
+        assignment or domain size change, including reverts."""
+        self._on_change = on_change
+        self.domain._on_resize = self._domain_resized
+
+    def _domain_resized(self, size: int) -> None:
+        if self._on_change is not None:
+            self._on_change(self, self._value is not None, size)
 
     def assign(self, value: Optional[T]) -> None:
         if value is not None and value not in self.domain:
             raise self.ValueError(f"{value} not in domain {self.domain}")
-        self.apply(VariableAssign[T](self, value))
+        self._change(self._ASSIGN, value)
+
+    @override
+    def _apply_change(self, opcode: int, value: object) -> object:
+        previous = self._value
+        self._value = cast(Optional[T], value)
+        if self._on_change is not None:
+            self._on_change(self, previous is not None, len(self.domain))
+        return previous
+
+    @override
+    def _revert_change(self, opcode: int, payload: object) -> None:
+        was_assigned = self._value is not None
+        self._value = cast(Optional[T], payload)
+        if self._on_change is not None:
+            self._on_change(self, was_assigned, len(self.domain))
 
     def unassign(self) -> None:
         self.assign(None)
@@ -74,6 +74,15 @@ def test_domain_values():
     assert variable.domain_values() == {1, 2, 3}
 
 
+def test_domain_values_is_a_copy():
+    delta_record = DeltaRecord()
+    variable = Variable(delta_record, "a", Domain(delta_record, {1, 2, 3}))
+    values = variable.domain_values()
+    variable.remove_value_from_domain(2)
+    assert values == {1, 2, 3}
+    assert variable.domain == {1, 3}
+
+
 def test_add_value_to_domain():
     delta_record = DeltaRecord()
     variable = Variable(delta_record, "a", Domain(delta_record, {1, 2, 3}))